@@ -1,12 +1,15 @@
 """Chat endpoints for AI conversations about posts."""
 
-from typing import List
+import json
+from typing import Any, AsyncIterator, Dict, List
 
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from core.errors import ServiceOverloaded
 from db.async_session import get_async_session
-from schemas.chat import ChatRequest, ChatResponse, Message
+from schemas.chat import ChatRequest, ChatResponse, Message, SuggestionsResponse
 from services.chat_service import chat_service as chat_service_singleton
 from utils.logging import get_logger
 
@@ -62,11 +65,88 @@ async def send_message(
     except ValueError as e:
         logger.warning("Post not found for chat", post_id=request.post_id, user_id=request.user_id, error=str(e))
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ServiceOverloaded:
+        logger.warning("Chat request shed, Gemini queue full", post_id=request.post_id, user_id=request.user_id)
+        raise
     except Exception as e:
         logger.error("Error sending chat message", post_id=request.post_id, user_id=request.user_id, error=str(e), exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to generate response: {str(e)}")
 
 
+def _sse(event: Dict[str, Any]) -> str:
+    """Frame an event as a server-sent events message."""
+    return f"data: {json.dumps(event)}\n\n"
+
+
+@router.post("/send/stream")
+async def send_message_stream(
+    request: ChatRequest,
+) -> StreamingResponse:
+    """
+    Send a message about a post and stream the AI response as server-sent events.
+
+    Emits ``chunk`` events with partial response text as soon as Gemini produces
+    it, then a final ``done`` event containing the full ChatResponse. Failures
+    after the stream has started are reported as an ``error`` event.
+    """
+    logger.info(
+        "Streaming chat message",
+        post_id=request.post_id,
+        user_id=request.user_id,
+        message_length=len(request.message),
+    )
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async with get_async_session() as db:
+                async for event in chat_service.send_message_stream(request, db):
+                    yield _sse(event)
+        except ValueError as e:
+            logger.warning("Post not found for chat", post_id=request.post_id, user_id=request.user_id, error=str(e))
+            yield _sse({"type": "error", "status_code": status.HTTP_404_NOT_FOUND, "detail": str(e)})
+        except ServiceOverloaded as e:
+            logger.warning("Chat request shed, Gemini queue full", post_id=request.post_id, user_id=request.user_id)
+            yield _sse(
+                {"type": "error", "status_code": status.HTTP_503_SERVICE_UNAVAILABLE, "detail": str(e), "retry_after": e.retry_after}
+            )
+        except Exception as e:
+            logger.error("Error streaming chat message", post_id=request.post_id, user_id=request.user_id, error=str(e), exc_info=True)
+            yield _sse(
+                {"type": "error", "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR, "detail": f"Failed to generate response: {str(e)}"}
+            )
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.post("/prewarm/{post_id}", status_code=status.HTTP_202_ACCEPTED)
+async def prewarm_chat(post_id: str) -> Dict[str, Any]:
+    """
+    Start uploading a post's media to Gemini ahead of the first chat message.
+
+    The frontend calls this when the chat UI opens; the upload runs in the
+    background so the first message does not pay for it.
+    """
+    scheduled = chat_service.prewarm(post_id)
+    logger.info("Chat prewarm requested", post_id=post_id, scheduled=scheduled)
+    return {"post_id": post_id, "scheduled": scheduled}
+
+
+@router.get("/{chat_id}/suggestions", response_model=SuggestionsResponse)
+async def get_suggestions(chat_id: str) -> SuggestionsResponse:
+    """
+    Get Gemini-generated follow-up questions for an assistant message.
+
+    Chat responses carry the Gemini suggestions when they finish alongside the
+    reply, and fallback ones otherwise; suggestions that finish later can be
+    polled here (on the same worker) until ``ready`` is true.
+    """
+    try:
+        ready, questions = chat_service.get_suggestions(chat_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return SuggestionsResponse(id=chat_id, ready=ready, suggested_questions=questions)
+
+
 @router.get("/history/{post_id}", response_model=ChatHistoryResponse)
 async def get_chat_history(
     post_id: str,
@@ -10,6 +10,7 @@ from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
 from core.config import settings
+from services.chat_service import chat_service
 
 
 class HealthResponse(BaseModel):
@@ -20,6 +21,8 @@ class HealthResponse(BaseModel):
     models_loaded: List[str] = Field(..., description="Currently loaded models")
     gpu_available: bool = Field(..., description="Whether GPU is available")
     disk_space_mb: float = Field(..., description="Available disk space in MB")
+    gemini_in_flight: int = Field(0, description="Gemini calls currently running on this worker")
+    gemini_queue_depth: int = Field(0, description="Gemini calls waiting for a concurrency slot")
 
 
 router = APIRouter()
@@ -49,4 +52,6 @@ async def health_check():
         models_loaded=loaded_models,
         gpu_available=gpu_available,
         disk_space_mb=disk_space_mb,
+        gemini_in_flight=chat_service.in_flight,
+        gemini_queue_depth=chat_service.queue_depth,
     )
@@ -5,6 +5,8 @@ This module centralizes app creation so tests and scripts can
 instantiate an application with custom settings when needed.
 """
 
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -31,6 +33,15 @@ async def lifespan(app: FastAPI):
     from core.config import settings
 
     settings.tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    # Size the default executor used by to_thread for blocking Gemini SDK calls
+    from services.chat_service import ChatService
+
+    ChatService.configure_executor()
+
+    # Open the Gemini connection in the background; startup should not wait on the network
+    warmup_task = asyncio.create_task(ChatService.get_instance().warm_up()) if settings.gemini_warmup_on_startup else None
+
     logger.info(
         "App starting",
         available_models=settings.available_models,
@@ -44,6 +55,17 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
+    if warmup_task is not None:
+        warmup_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warmup_task
+
+    # Stop the shared media analyzers' background workers and download connections
+    from services.downloaders.base import close_http_session
+    from services.media_analyzer import MediaAnalyzerFactory
+
+    MediaAnalyzerFactory.cleanup()
+    await close_http_session()
     await database_pool.close()
     logger.info("App shutdown complete")
 
@@ -76,12 +76,26 @@ class Settings(BaseSettings):
     # Detection settings
     confidence_threshold: float = 0.5
     top_k_predictions: int = 5
+    detection_response_cache_ttl_seconds: float = 60  # Serve repeated polls for a verdicted post from memory
+    detection_response_cache_size: int = 1024  # Max cached detection responses per worker
 
     # Concurrency and retry settings (services)
     text_max_concurrency: int = 2
     image_max_concurrency: int = 1
     video_max_concurrency: int = 1
+    video_batch_size: int = 4  # Videos scored per SlowFast forward pass
+    video_precision: str = "float32"  # SlowFast inference precision on CUDA: 'float32', 'float16' or 'bfloat16'
+    image_precision: str = "float32"  # ClipBased inference precision on CUDA: 'float32', 'float16' or 'bfloat16'
+    image_batch_max_size: int = 16  # Max images per ClipBased forward pass, across concurrent requests
+    image_batch_wait_ms: float = 10  # How long a short batch waits for images from other requests
+    text_analysis_cache_ttl_seconds: float = 86400  # Reuse a text analysis for identical content under other posts
+    text_analysis_cache_size: int = 50000  # Max cached text analyses per worker
+    media_verdict_cache_ttl_seconds: float = 3600  # Reuse a media verdict for the same content (reposts, shared thumbnails)
+    media_verdict_cache_size: int = 10000  # Max cached media verdicts per worker
+    media_http_pool_size: int = 100  # Connections kept by the shared media download session
+    media_http_pool_size_per_host: int = 20
     detection_timeout_seconds: float = 120.0
+    media_analysis_budget_seconds: float = 90.0  # Report media still running after this as timed out; 0 waits for all
     detection_retry_max_attempts: int = 2
     detection_retry_backoff_base: float = 0.5
 
@@ -101,6 +115,10 @@ class Settings(BaseSettings):
     # Else -> uncertain
     fusion_ai_threshold: float = Field(default=0.2, ge=0.0, le=1.0)
     fusion_human_threshold: float = Field(default=0.4, ge=0.0, le=1.0)
+    # Fusion takes the highest modality probability, so a text probability at or above
+    # fusion_ai_threshold already fixes the verdict; optionally skip media analysis then
+    enable_media_skip_on_confident_text: bool = False
+    text_confidence_skip_threshold: float = Field(default=0.95, ge=0.0, le=1.0)
 
     # Database settings - individual components
     db_name: str = "ai_slop_extension"
@@ -125,9 +143,33 @@ class Settings(BaseSettings):
     gemini_api_key: str = ""
     gemini_max_concurrency: int = 1  # Per-worker limit; ~4 total with 4 workers
     gemini_timeout_seconds: float = 30.0  # Timeout per Gemini call
+    gemini_max_queue_depth: int = 32  # Calls allowed to wait for a slot before new ones get 503
     gemini_retry_max_attempts: int = 3  # Retry attempts for Gemini operations
     gemini_retry_backoff_base: float = 0.5  # Exponential backoff base
     gemini_max_media_files: int = 10  # Cap media parts per prompt
+    gemini_file_cache_ttl_seconds: float = 30 * 60  # Reuse File handles well within Gemini's 48h expiry
+    gemini_file_cache_size: int = 1024  # Max cached File handles per worker
+    gemini_upload_concurrency: int = 2  # Background media uploads in flight per worker, limited apart from chat calls
+    gemini_warmup_on_startup: bool = False  # Open the Gemini connection at startup (makes a real Gemini call)
+    gemini_suggestions_enabled: bool = True  # Generate tailored follow-up questions alongside each Gemini reply
+    gemini_suggestions_concurrency: int = 1  # Suggestion calls in flight per worker, limited apart from chat replies
+    gemini_suggestions_wait_seconds: float = 1.0  # How long a reply waits for its suggestions before using fallback ones
+    gemini_suggestions_cache_ttl_seconds: float = 10 * 60  # How long background suggestions stay fetchable
+    gemini_suggestions_cache_size: int = 1024  # Max cached suggestion sets per worker
+    gemini_context_cache_enabled: bool = True  # Cache per-post system instruction + media on Gemini
+    gemini_context_cache_ttl_seconds: int = 30 * 60  # Gemini context cache lifetime
+
+    # Semantic cache for chat replies (Redis)
+    redis_url: str = "redis://localhost:6379/0"
+    chat_semantic_cache_enabled: bool = False  # Requires a reachable Redis at redis_url
+    chat_semantic_cache_threshold: float = Field(default=0.85, ge=0.0, le=1.0)  # Min cosine similarity for a hit
+    chat_semantic_cache_ttl_seconds: int = 24 * 60 * 60
+    chat_semantic_cache_max_entries: int = 50  # Cached questions kept per post
+
+    # One batched Gemini call per analyzed post to pre-answer the suggested questions
+    chat_prewarm_answers_enabled: bool = False
+    user_touch_interval_seconds: float = 60  # Min gap between last_active_at writes for a chatting user
+    thread_pool_size: int = 32  # Default executor size; keep >= 2x gemini_max_concurrency
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -27,6 +27,14 @@ class RateLimitExceeded(Exception):
     pass
 
 
+class ServiceOverloaded(Exception):
+    """Raised when an upstream call queue is full and new work is shed."""
+
+    def __init__(self, message: str, retry_after: int = 5):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 def register_exception_handlers(app: FastAPI) -> None:
     """Attach standard exception handlers to the app."""
 
@@ -113,6 +121,15 @@ def register_exception_handlers(app: FastAPI) -> None:
             headers={"Retry-After": "60"},
         )
 
+    @app.exception_handler(ServiceOverloaded)
+    async def service_overloaded_handler(request: Request, exc: ServiceOverloaded):
+        """Shed load with a retryable 503 instead of queueing without bound."""
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=ErrorResponse(error="service_overloaded", message="Service is busy", detail=str(exc), status_code=503).model_dump(),
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
     @app.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
         logger.error(
@@ -5,12 +5,15 @@ Prevents double media processing across services by tracking media state.
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
 
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Processing stages in the order media moves through them
+STAGE_ORDER = ["pending", "downloaded", "uploaded", "analyzed"]
+
 
 @dataclass
 class MediaProcessingRecord:
@@ -31,6 +34,10 @@ class MediaProcessingRecord:
     model_used: Optional[str] = None
     detection_error: Optional[str] = None
 
+    def has_reached_stage(self, min_stage: str) -> bool:
+        """Check if this media has been processed to at least the given stage."""
+        return STAGE_ORDER.index(self.processing_stage) >= STAGE_ORDER.index(min_stage)
+
 
 class MediaProcessingRegistry:
     """Registry to track media processing across all services."""
@@ -54,15 +61,30 @@ class MediaProcessingRegistry:
         if media_key in self._registry:
             record = self._registry[media_key]
             old_stage = record.processing_stage
-            record.processing_stage = stage
-
-            # Update optional fields
-            for field, value in kwargs.items():
-                if hasattr(record, field):
-                    setattr(record, field, value)
+            self._apply_stage(record, stage, kwargs)
 
             logger.debug("Updated media processing stage", media_key=media_key, old_stage=old_stage, new_stage=stage)
 
+    def update_processing_stages(self, updates: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """Update several media records at once from (media_key, stage, fields) tuples."""
+        updated = 0
+        for media_key, stage, fields in updates:
+            record = self._registry.get(media_key)
+            if record is not None:
+                self._apply_stage(record, stage, fields)
+                updated += 1
+
+        logger.debug("Updated media processing stages", count=updated)
+
+    @staticmethod
+    def _apply_stage(record: MediaProcessingRecord, stage: str, fields: Dict[str, Any]) -> None:
+        record.processing_stage = stage
+
+        # Update optional fields
+        for field, value in fields.items():
+            if hasattr(record, field):
+                setattr(record, field, value)
+
     def is_already_processed(self, post_id: str, media_url: str, min_stage: str = "downloaded") -> bool:
         """Check if media has already been processed to a minimum stage."""
         media_key = f"{post_id}:{media_url}"
@@ -71,13 +93,9 @@ class MediaProcessingRegistry:
             return False
 
         record = self._registry[media_key]
-        stage_order = ["pending", "downloaded", "uploaded", "analyzed"]
 
         try:
-            current_stage_idx = stage_order.index(record.processing_stage)
-            min_stage_idx = stage_order.index(min_stage)
-
-            is_processed = current_stage_idx >= min_stage_idx
+            is_processed = record.has_reached_stage(min_stage)
 
             logger.debug(
                 "Checked media processing status",
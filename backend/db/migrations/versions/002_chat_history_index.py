@@ -0,0 +1,28 @@
+"""Add composite index for per-user chat history
+
+Revision ID: 002_chat_history_index
+Revises: 001_init_db
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "002_chat_history_index"
+down_revision: Union[str, Sequence[str], None] = "001_init_db"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves the chat history lookup (post + user, ordered by time) without a sort
+    op.create_index("ix_chat_post_user_created", "chat", ["post_id", "user_id", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_chat_post_user_created", table_name="chat")
@@ -0,0 +1,28 @@
+"""Add pre-generated chat answers to post
+
+Revision ID: 003_post_prewarmed_answers
+Revises: 002_chat_history_index
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003_post_prewarmed_answers"
+down_revision: Union[str, Sequence[str], None] = "002_chat_history_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("post", sa.Column("prewarmed_answers", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("post", "prewarmed_answers")
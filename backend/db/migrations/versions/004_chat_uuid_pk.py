@@ -0,0 +1,29 @@
+"""Store chat primary keys as native UUIDs
+
+Revision ID: 004_chat_uuid_pk
+Revises: 003_post_prewarmed_answers
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004_chat_uuid_pk"
+down_revision: Union[str, Sequence[str], None] = "003_post_prewarmed_answers"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing ids are uuid4 strings, so they cast directly; new rows use time-ordered UUIDv7
+    op.alter_column("chat", "id", type_=sa.Uuid(), existing_type=sa.String(36), postgresql_using="id::uuid")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column("chat", "id", type_=sa.String(36), existing_type=sa.Uuid(), postgresql_using="id::text")
@@ -0,0 +1,28 @@
+"""Add precomputed detection summary text to post
+
+Revision ID: 005_post_detection_summary_text
+Revises: 004_chat_uuid_pk
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "005_post_detection_summary_text"
+down_revision: Union[str, Sequence[str], None] = "004_chat_uuid_pk"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("post", sa.Column("detection_summary_text", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("post", "detection_summary_text")
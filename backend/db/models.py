@@ -4,9 +4,11 @@ import uuid
 from datetime import datetime
 from typing import Any, List, Optional
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Integer, JSON, String, Text, UniqueConstraint, func
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Integer, JSON, String, Text, UniqueConstraint, Uuid, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from utils.ids import uuid7
+
 
 class Base(DeclarativeBase):
     """Base model class with common fields."""
@@ -68,6 +70,12 @@ class Post(Base):
     # Additional metadata as JSON
     post_metadata: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
 
+    # Detection scores formatted for chat prompts, computed when the analysis is stored
+    detection_summary_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Pre-generated chat answers to the canned suggestion questions (casefolded question -> answer)
+    prewarmed_answers: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+
     # Metrics fields added by migration
     content_length: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     post_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
@@ -104,10 +112,11 @@ class Chat(Base):
 
     __tablename__ = "chat"
 
-    id: Mapped[str] = mapped_column(
-        String(36),
+    # Time-ordered UUIDv7 so new rows append to the primary key index
+    id: Mapped[uuid.UUID] = mapped_column(
+        Uuid,
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid7,
     )
 
     # Reference to the post table's post_id
@@ -45,7 +45,6 @@ class ClipBasedConfig:
         self.batch_size = int(os.getenv("CLIPBASED_BATCH_SIZE", "16"))
         self.threshold = float(os.getenv("CLIPBASED_THRESHOLD", "0.0"))  # LLR > 0 indicates synthetic
         self.device = os.getenv("CLIPBASED_DEVICE", "auto")
-        self.precision = os.getenv("CLIPBASED_PRECISION", "float32")
 
         # Image preprocessing settings
         self.image_size = int(os.getenv("CLIPBASED_IMAGE_SIZE", "224"))
@@ -2,6 +2,7 @@
 ClipBased AI-generated image detection implementation.
 """
 
+import contextlib
 import logging
 import time
 from pathlib import Path
@@ -26,7 +27,7 @@ class ClipBasedImageDetector:
     Provides a high-level interface for loading models and detecting synthetic images.
     """
 
-    def __init__(self, model_name: str = None, device: str = "auto", weights_path: Optional[str] = None):
+    def __init__(self, model_name: str = None, device: str = "auto", weights_path: Optional[str] = None, precision: str = "float32"):
         """
         Initialize the ClipBased detector.
 
@@ -34,10 +35,12 @@ class ClipBasedImageDetector:
             model_name: Name of the model to use
             device: Device to run inference on ("auto", "cuda", "cpu")
             weights_path: Path to pre-trained weights (optional)
+            precision: Inference precision on CUDA ('float32', 'float16', 'bfloat16')
         """
         self.model_name = model_name or config.default_model
         self.device = self._get_device(device)
         self.weights_path = weights_path
+        self.precision = precision
 
         # Initialize components
         self.model = None
@@ -59,6 +62,15 @@ class ClipBasedImageDetector:
 
         return torch.device(device)
 
+    def _inference_context(self) -> contextlib.ExitStack:
+        """Inference mode, plus autocast when half precision is requested on CUDA."""
+        stack = contextlib.ExitStack()
+        stack.enter_context(torch.inference_mode())
+        dtype = {"float16": torch.float16, "bfloat16": torch.bfloat16}.get(self.precision)
+        if dtype is not None and self.device.type == "cuda":
+            stack.enter_context(torch.autocast("cuda", dtype=dtype))
+        return stack
+
     def load_model(self) -> None:
         """Load the ClipBased model and preprocessor."""
         try:
@@ -116,10 +128,8 @@ class ClipBasedImageDetector:
             batch = preprocessed.unsqueeze(0).to(self.device)
 
             # Run inference
-            with torch.no_grad():
-                llr_score = self.model.get_llr_score(batch)
-                probability = self.model.predict_proba(batch)
-                prediction = self.model.predict(batch, threshold)
+            with self._inference_context():
+                llr_score, probability, prediction = self.model.score(batch, threshold)
 
             # Extract values from tensors
             llr_value = llr_score.item()
@@ -189,10 +199,8 @@ class ClipBasedImageDetector:
                 start_time = time.time()
 
                 # Run inference
-                with torch.no_grad():
-                    llr_scores = self.model.get_llr_score(batch_tensor)
-                    probabilities = self.model.predict_proba(batch_tensor)
-                    predictions = self.model.predict(batch_tensor, threshold)
+                with self._inference_context():
+                    llr_scores, probabilities, predictions = self.model.score(batch_tensor, threshold)
 
                 inference_time = time.time() - start_time
 
@@ -290,7 +298,9 @@ class ClipBasedImageDetector:
         logger.info("ClipBased detector resources cleaned up")
 
 
-def create_detector(model_name: str = None, device: str = "auto", weights_path: Optional[str] = None) -> ClipBasedImageDetector:
+def create_detector(
+    model_name: str = None, device: str = "auto", weights_path: Optional[str] = None, precision: str = "float32"
+) -> ClipBasedImageDetector:
     """
     Factory function to create a ClipBased detector.
 
@@ -298,8 +308,9 @@ def create_detector(model_name: str = None, device: str = "auto", weights_path:
         model_name: Name of the model to use
         device: Device for inference
         weights_path: Path to pre-trained weights
+        precision: Inference precision on CUDA
 
     Returns:
         Configured ClipBasedImageDetector instance
     """
-    return ClipBasedImageDetector(model_name=model_name, device=device, weights_path=weights_path)
+    return ClipBasedImageDetector(model_name=model_name, device=device, weights_path=weights_path, precision=precision)
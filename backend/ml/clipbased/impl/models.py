@@ -3,7 +3,7 @@ ClipBased model implementations based on the original repository.
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 import torch
 import torch.nn as nn
@@ -160,6 +160,18 @@ class ClipBasedDetector(nn.Module):
         """Get Log-Likelihood Ratio score (raw logits)."""
         return self.forward(x)
 
+    def score(self, x: torch.Tensor, threshold: float = 0.0) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Get LLR scores, probabilities and predictions from a single forward pass.
+
+        Equivalent to calling get_llr_score, predict_proba and predict, which each
+        run the backbone again.
+        """
+        logits = self.forward(x).float()
+        if self.config.get("num_classes", 1) == 1:
+            return logits, torch.sigmoid(logits), (logits > threshold).int()
+        return logits, torch.softmax(logits, dim=-1), torch.argmax(logits, dim=-1)
+
     def load_weights(self, weight_path: str):
         """Load pre-trained weights."""
         try:
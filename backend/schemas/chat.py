@@ -46,3 +46,11 @@ class ChatResponse(BaseModel):
     suggested_questions: List[str] = Field(default_factory=list, description="Suggested follow-up questions")
     context: Dict[str, Any] = Field(default_factory=dict, description="Additional context about the response")
     timestamp: str = Field(..., description="Response timestamp")
+
+
+class SuggestionsResponse(BaseModel):
+    """Gemini-generated follow-up questions for an assistant message."""
+
+    id: str = Field(..., description="Assistant message ID")
+    ready: bool = Field(..., description="Whether generation has finished")
+    suggested_questions: List[str] = Field(default_factory=list, description="Suggested follow-up questions")
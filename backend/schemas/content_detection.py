@@ -31,6 +31,10 @@ class ContentDetectionResponse(BaseModel):
     confidence: float = Field(..., ge=0.0, le=1.0, description="Overall confidence score (legacy)")
     explanation: str = Field(..., description="Explanation for the verdict")
     timestamp: str = Field(..., description="Analysis timestamp")
+    media_timed_out: bool = Field(
+        False,
+        description="Media analysis ran past its latency budget; the verdict is provisional and the post is re-analyzed on the next request",
+    )
 
     # Separate AI probability and confidence for each modality
     text_ai_probability: Optional[float] = Field(None, ge=0.0, le=1.0, description="Text AI probability (0.0 = human, 1.0 = AI)")
@@ -1,20 +1,36 @@
 """Chat service for Google Gemini integration with concurrency control and retries."""
 
 import asyncio
-import uuid
-from datetime import datetime, timezone
+import functools
+import hashlib
+import re
+import inspect
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import List, Optional, Tuple
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable, DefaultDict, Dict, Iterable, List, Optional, Set, Tuple
 
 import google.generativeai as genai
-from sqlalchemy import select
+from sqlalchemy import Row, bindparam, insert, lambda_stmt, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload, load_only, selectinload
 
 from core.config import settings
+from core.errors import ServiceOverloaded
+from db.async_session import get_async_session
 from db.models import Chat, Post, PostMedia, User, UserSession
 from schemas.chat import ChatRequest, ChatResponse, Message
+from services.detection_summary import build_detection_summary
 from services.gemini_on_demand_service import gemini_on_demand_service
-from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
+from services.semantic_cache_service import semantic_cache_service
+from tenacity import AsyncRetrying, retry_if_not_exception_type, stop_after_attempt, wait_exponential
+from utils.ids import uuid7
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -25,6 +41,221 @@ class Role(str, Enum):
     assistant = "assistant"
 
 
+# Stored chat role -> Gemini history role (anything else is sent as "user")
+_ROLE_MAP = {Role.assistant.value: "model"}
+
+_CHAT_MODEL = "gemini-2.5-flash-lite"
+_CHAT_GENERATION_CONFIG = {
+    "temperature": 0.6,
+    "top_p": 0.95,
+    "max_output_tokens": 512,
+}
+_MODEL_CACHE_SIZE = 128
+
+
+# Fallback follow-up questions paired with their casefolded form for the already-asked filter
+_FALLBACK_QUESTIONS = tuple(
+    (q, q.casefold())
+    for q in (
+        "What patterns suggest AI generation?",
+        "How confident is this analysis?",
+        "Could this be wrong?",
+        "What are the key indicators?",
+    )
+)
+_AI_VERDICT_QUESTION, _HUMAN_VERDICT_QUESTION = (
+    (q, q.casefold()) for q in ("How is this different from human writing?", "Why is this human-written?")
+)
+
+
+_FALLBACK_KEYS = frozenset(key for _, key in (*_FALLBACK_QUESTIONS, _AI_VERDICT_QUESTION, _HUMAN_VERDICT_QUESTION))
+# casefold() never shortens text, so a message longer than every key cannot match one
+_FALLBACK_MAX_LEN = max(len(key) for key in _FALLBACK_KEYS)
+
+
+_SUGGESTIONS_TASK = """Generate 3 short, concise follow-up questions that:
+1. Haven't been asked before in the conversation history
+2. Help the user better understand the detection results
+3. Explore different aspects of AI detection (patterns, confidence, methodology, implications)
+4. Are specific to this post's content and analysis results
+5. Are conversational and engaging
+6. Keep each question under 8 words when possible
+7. Use simple, direct language
+
+Return ONLY the 3 questions, each on a separate line, without numbers or bullet points."""
+
+
+@functools.lru_cache(maxsize=1024)
+def _suggestions_post_context(
+    content: str,
+    author: Optional[str],
+    verdict: str,
+    confidence: float,
+    explanation: Optional[str],
+    detection_summary: str,
+) -> str:
+    """Render the post-specific head of the suggestions system instruction."""
+    return f"""You are an AI assistant helping generate intelligent follow-up questions for users who want to understand AI content detection results.
+
+POST CONTENT:
+"{content}"
+
+AUTHOR: {author or "Unknown"}
+
+DETECTION ANALYSIS RESULTS:
+{detection_summary}
+
+OVERALL VERDICT: {verdict}
+OVERALL CONFIDENCE: {(confidence * 100):.1f}%
+EXPLANATION: {explanation or "No detailed explanation provided"}"""
+
+
+@functools.lru_cache(maxsize=2048)
+def _fallback_suggestions_for(verdict: str, asked: frozenset) -> Tuple[str, ...]:
+    """Top 3 fallback questions for a verdict, excluding already-asked ones (casefolded)."""
+    verdict_question = _AI_VERDICT_QUESTION if verdict == "ai_slop" else _HUMAN_VERDICT_QUESTION
+    return tuple(q for q, key in (*_FALLBACK_QUESTIONS, verdict_question) if key not in asked)[:3]
+
+
+_NUMBERED_LINE = re.compile(r"^\s*(\d+)[.)]\s*(.*)$")
+
+
+def _parse_numbered_answers(text: str, count: int) -> List[Optional[str]]:
+    """Split a "1. ... 2. ..." batch reply into per-question answers (None where missing)."""
+    answers: List[List[str]] = [[] for _ in range(count)]
+    current: Optional[int] = None
+    for line in text.splitlines():
+        match = _NUMBERED_LINE.match(line)
+        if match and 1 <= int(match.group(1)) <= count:
+            current = int(match.group(1)) - 1
+            line = match.group(2)
+        if current is not None:
+            answers[current].append(line)
+    return ["\n".join(lines).strip() or None for lines in answers]
+
+
+# Statements for the per-request lookups, built once; lambda_stmt caches their construction
+# and compiled SQL so each call only binds parameters.
+# User's relationships (sessions, analytics, chats, events) all default to selectin loading;
+# chat only needs the user row, so none of them are loaded here
+_USER_STMT = lambda_stmt(lambda: select(User).where(User.id == bindparam("user_id")).options(lazyload("*")))
+# Post.chats / Post.media default to selectin loading; callers of _POST_STMT only need the post row
+_POST_STMT = lambda_stmt(
+    lambda: select(Post).where(Post.post_id == bindparam("post_id")).options(lazyload(Post.chats), lazyload(Post.media))
+)
+_POST_EXISTS_STMT = lambda_stmt(lambda: select(Post.post_id).where(Post.post_id == bindparam("post_id")))
+_POST_MEDIA_STMT = lambda_stmt(
+    lambda: select(PostMedia.media_type, PostMedia.media_url, PostMedia.gemini_file_uri).where(PostMedia.post_id == bindparam("post_id"))
+)
+# The history endpoints only return id/role/message/created_at, so they read plain rows
+# instead of building Chat instances
+_CHAT_HISTORY_STMT = lambda_stmt(
+    lambda: (
+        select(Chat.id, Chat.role, Chat.message, Chat.created_at)
+        .where(Chat.post_id == bindparam("post_id"))
+        .order_by(Chat.created_at.asc())
+        .limit(bindparam("limit"))
+    )
+)
+_USER_CHAT_HISTORY_STMT = lambda_stmt(
+    lambda: (
+        select(Chat.id, Chat.role, Chat.message, Chat.created_at)
+        .where(Chat.post_id == bindparam("post_id"))
+        .where(Chat.user_id == bindparam("user_id"))
+        .order_by(Chat.created_at.asc())
+        .limit(bindparam("limit"))
+    )
+)
+
+
+@dataclass
+class _ChatTurn:
+    """State loaded for a single chat turn, shared by the buffered and streaming paths."""
+
+    user: User
+    post: Post
+    chat_history: List[Chat]
+    file_uris: List[str]
+    media: Dict[str, Any]
+    # The user's message, built but not yet written; it is saved together with the reply
+    user_chat: Chat
+    # Gemini follow-up suggestions generated alongside the reply (see _start_suggestions)
+    suggestions: Optional[asyncio.Task] = None
+
+
+# The system instruction only depends on stored post fields, so it is memoized on those
+# fields; any change to a score or to the post text yields a new cache key.
+
+
+@functools.lru_cache(maxsize=1024)
+def _system_instruction_text(
+    content: str,
+    author: Optional[str],
+    verdict: str,
+    confidence: float,
+    explanation: Optional[str],
+    detection_summary: str,
+    media_count: int,
+) -> str:
+    """Render the chat system instruction for a post."""
+    if not media_count:
+        return f"""You are an expert AI content detection assistant helping users understand detection results for this specific social media post.
+
+POST CONTENT:
+"{content}"
+
+AUTHOR: {author or "Unknown"}
+
+DETECTION ANALYSIS RESULTS:
+{detection_summary}
+
+OVERALL VERDICT: {verdict}
+OVERALL CONFIDENCE: {(confidence * 100):.1f}%
+EXPLANATION: {explanation or "No detailed explanation provided"}
+
+Your role:
+- Help users understand these specific AI detection results
+- Explain the reasoning behind the analysis in an accessible way
+- Answer questions about the detection methods (text analysis, image detection, video analysis)
+- Reference the actual post content when relevant
+- Be conversational and engaging, not robotic
+- Acknowledge limitations and potential for false positives/negatives
+- Provide insights based on the specific detection scores and confidence levels shown above
+
+Keep responses informative but concise (2-4 sentences typically)."""
+
+    return f"""You are an expert AI content detection assistant helping users understand detection results for this specific social media post.
+
+POST CONTENT:
+"{content}"
+
+AUTHOR: {author or "Unknown"}
+
+DETECTION ANALYSIS RESULTS:
+{detection_summary}
+
+OVERALL VERDICT: {verdict}
+OVERALL CONFIDENCE: {(confidence * 100):.1f}%
+EXPLANATION: {explanation or "No detailed explanation provided"}
+
+MULTIMEDIA CONTENT: You have access to {media_count} media files (images and/or videos) from this post. Analyze them for:
+- Visual signs of AI generation (artifacts, inconsistencies, unnatural elements)
+- For videos: motion patterns, temporal consistency, audio-visual synchronization
+- Correlation between text claims and visual/video content
+- Overall authenticity assessment combining text and multimedia evidence
+
+Your role:
+- Help users understand these specific AI detection results
+- Analyze both text and visual content for comprehensive insights
+- Explain the reasoning behind the analysis in an accessible way
+- Reference specific visual elements when relevant
+- Be conversational and engaging, not robotic
+- Acknowledge limitations and potential for false positives/negatives
+- Provide insights based on the specific detection scores and confidence levels shown above
+
+Keep responses informative but concise (2-4 sentences typically)."""
+
+
 class ChatService:
     """Service for managing chat conversations about posts using Google Gemini."""
 
@@ -36,15 +267,57 @@ class ChatService:
         # Configure Gemini API
         genai.configure(api_key=settings.gemini_api_key)
 
-        # Concurrency limiter for Gemini calls
-        self._sem = asyncio.Semaphore(settings.gemini_max_concurrency)
+        # Concurrency limiter for Gemini calls. A condition-protected counter (rather than a
+        # Semaphore) lets the limit be retuned at runtime via set_concurrency().
+        self._cond = asyncio.Condition()
+        self._active = 0
+        self._cmax = settings.gemini_max_concurrency
+        self._waiting = 0
+
+        # LRU cache of Gemini File handles (file name -> (fetched_at, file)); media is reused
+        # across every turn of a conversation, so metadata lookups are served from here.
+        self._file_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # Per-file locks so concurrent misses for the same file coalesce into one fetch
+        self._file_locks: DefaultDict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+        # In-flight speculative media uploads keyed by post_id (see prewarm())
+        self._prewarm_tasks: Dict[str, asyncio.Task] = {}
+        # Prewarm uploads are limited apart from chat calls so they never hold up a reply
+        self._upload_sem = asyncio.Semaphore(settings.gemini_upload_concurrency)
+        # Background batch-answer generations (see prewarm_answers()); held so they aren't GC'd
+        self._answer_tasks: Set[asyncio.Task] = set()
+
+        # In-flight opening-question replies keyed by (post, prompt digest, question); see _coalesce_reply()
+        self._inflight_replies: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+        # Gemini follow-up suggestions that finished after their reply, keyed by assistant chat id
+        self._suggestions: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self._suggestion_tasks: Dict[str, asyncio.Task] = {}
+        # Suggestion calls have their own limit so they run alongside replies instead of queueing behind them
+        self._suggestions_sem = asyncio.Semaphore(settings.gemini_suggestions_concurrency)
+        # The same suggestions keyed by a digest of their prompt (post context + conversation), so
+        # identical conversations, e.g. the same opening question on a post, share one Gemini call
+        self._suggestions_by_prompt: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+
+        # LRU of GenerativeModel instances keyed by a digest of their system instruction, so
+        # repeated turns on the same post reuse one model instead of rebuilding it
+        self._model_cache: "OrderedDict[str, genai.GenerativeModel]" = OrderedDict()
+
+        # Gemini context caches holding a post's system instruction + media, keyed by
+        # (post_id, system instruction, file URIs) -> (expires_at, CachedContent or None)
+        self._ctx_cache: Dict[Tuple[str, str, Tuple[str, ...]], Tuple[float, Any]] = {}
+        self._ctx_locks: DefaultDict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
     # --- Singleton support ---
     _instance: Optional["ChatService"] = None
     _instance_lock: asyncio.Lock = asyncio.Lock()
+    _sync_instance_lock: threading.Lock = threading.Lock()
 
     @classmethod
     async def get_instance_async(cls) -> "ChatService":
+        # Fast path: skip the lock once initialized; the inner check keeps creation race-free
+        if cls._instance is not None:
+            return cls._instance
         async with cls._instance_lock:
             if cls._instance is None:
                 cls._instance = ChatService()
@@ -53,40 +326,263 @@ class ChatService:
     @classmethod
     def get_instance(cls) -> "ChatService":
         # Synchronous accessor for modules that import at startup
-        if cls._instance is None:
-            cls._instance = ChatService()
+        if cls._instance is not None:
+            return cls._instance
+        with cls._sync_instance_lock:
+            if cls._instance is None:
+                cls._instance = ChatService()
         return cls._instance
 
+    @staticmethod
+    def configure_executor(loop: Optional[asyncio.AbstractEventLoop] = None) -> ThreadPoolExecutor:
+        """Size the loop's default executor for the blocking Gemini SDK calls.
+
+        Gemini File lookups run through asyncio.to_thread, which uses the default executor, so
+        that pool must be at least as large as the per-worker Gemini concurrency (plus headroom
+        for other to_thread users). Keep THREAD_POOL_SIZE coherent with
+        GEMINI_MAX_CONCURRENCY per worker; the larger of THREAD_POOL_SIZE and twice the Gemini
+        limit wins. Call once at application startup.
+        """
+        loop = loop or asyncio.get_running_loop()
+        max_workers = max(settings.gemini_max_concurrency * 2, settings.thread_pool_size)
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gemini")
+        loop.set_default_executor(executor)
+        logger.info("Default executor configured", max_workers=max_workers)
+        return executor
+
+    async def warm_up(self) -> None:
+        """
+        Open the Gemini connection before the first chat request.
+
+        The SDK shares one async client per worker, so a free count_tokens call at startup
+        pays the connect + TLS handshake up front instead of on the first user's turn.
+        """
+        if not settings.gemini_api_key:
+            return
+        try:
+            model = self._get_chat_model("Warm-up")
+            await self._with_limit_and_timeout(model.count_tokens_async, "ping")
+            logger.info("Gemini connection warmed up")
+        except Exception as e:
+            logger.warning("Gemini warm-up failed", error=str(e))
+
+    def prewarm(self, post_id: str) -> bool:
+        """
+        Upload a post's media to Gemini in the background before the first chat message.
+
+        Called when the chat UI opens so the first send_message finds gemini_file_uri already
+        populated. Returns False if a prewarm for the post is already running.
+        """
+        task = self._prewarm_tasks.get(post_id)
+        if task is not None and not task.done():
+            return False
+        task = asyncio.create_task(self._prewarm_media(post_id))
+        self._prewarm_tasks[post_id] = task
+        task.add_done_callback(lambda _: self._prewarm_tasks.pop(post_id, None))
+        return True
+
+    async def _prewarm_media(self, post_id: str) -> None:
+        try:
+            async with get_async_session() as db:
+                media = await self._get_post_media_bundle(post_id, db)
+            if not media["media_urls"] or len(media["file_uris"]) >= media["count"]:
+                return
+            # Uploads have their own limit so they neither hold a chat slot nor a pooled session
+            async with self._upload_sem:
+                file_uris = await gemini_on_demand_service.batch_ensure_gemini_uris_detached(post_id, media["media_urls"])
+            logger.info("Prewarmed chat media", post_id=post_id, total_media=media["count"], gemini_uris=len(file_uris))
+        except Exception as e:
+            logger.warning("Failed to prewarm chat media", post_id=post_id, error=str(e))
+
+    def prewarm_answers(self, post_id: str) -> None:
+        """
+        Pre-generate answers to the canned suggestion questions in one batched Gemini call.
+
+        Called once a post's analysis is stored; the answers are saved on the post so that
+        clicking a suggested question is served from the database instead of Gemini.
+        """
+        if not settings.chat_prewarm_answers_enabled:
+            return
+        task = asyncio.create_task(self._prewarm_answers(post_id))
+        self._answer_tasks.add(task)
+        task.add_done_callback(self._answer_tasks.discard)
+
+    async def _prewarm_answers(self, post_id: str) -> None:
+        try:
+            # Read what the prompt needs, then give the connection back before calling Gemini
+            async with get_async_session() as db:
+                post = await self._get_post(post_id, db)
+                if not post:
+                    return
+                media = await self._get_post_media_bundle(post_id, db)
+            file_uris = media["file_uris"][: settings.gemini_max_media_files]
+
+            verdict_question = _AI_VERDICT_QUESTION if post.verdict == "ai_slop" else _HUMAN_VERDICT_QUESTION
+            questions = [q for q, _ in (*_FALLBACK_QUESTIONS, verdict_question)]
+            numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(questions, 1))
+            prompt = (
+                "Answer each of the following questions about the post. Reply with one numbered answer "
+                f"per question, in the same order and numbering, and nothing else:\n{numbered}"
+            )
+
+            chat_session, content = await self._open_chat(post, [], prompt, file_uris)
+            response = await self._retry(
+                self._gemini_send_message,
+                chat_session,
+                content,
+                generation_config={**_CHAT_GENERATION_CONFIG, "max_output_tokens": 512 * len(questions)},
+            )
+            answers = _parse_numbered_answers(response.text, len(questions))
+            prewarmed_answers = {q.casefold(): a for q, a in zip(questions, answers) if a} or None
+
+            # Only store the answers if the analysis they were generated from is still current
+            async with get_async_session() as db:
+                result = await db.execute(
+                    update(Post)
+                    .where(Post.post_id == post_id)
+                    .where(Post.verdict.is_not_distinct_from(post.verdict))
+                    .where(Post.detection_summary_text.is_not_distinct_from(post.detection_summary_text))
+                    .values(prewarmed_answers=prewarmed_answers)
+                )
+            if not result.rowcount:
+                logger.info("Discarded stale prewarmed chat answers", post_id=post_id)
+                return
+
+            logger.info("Prewarmed chat answers", post_id=post_id, answers=sum(1 for a in answers if a))
+        except Exception as e:
+            logger.warning("Failed to prewarm chat answers", post_id=post_id, error=str(e))
+
+    async def _await_prewarm(self, post_id: str) -> None:
+        """Wait for an in-flight prewarm so a turn never uploads the same media twice."""
+        task = self._prewarm_tasks.get(post_id)
+        if task is not None:
+            # Shield so a cancelled request does not abort the shared upload
+            await asyncio.shield(task)
+
+    async def set_concurrency(self, limit: int) -> None:
+        """Change the maximum number of in-flight Gemini calls without restarting the worker."""
+        if limit < 1:
+            raise ValueError("Gemini concurrency limit must be at least 1")
+        async with self._cond:
+            self._cmax = limit
+            # Wake all waiters so they re-check the predicate against the new limit
+            self._cond.notify_all()
+        logger.info("Updated Gemini concurrency limit", limit=limit)
+
     # --- Internal helpers: retries, concurrency, history building ---
 
+    @property
+    def queue_depth(self) -> int:
+        """Number of Gemini calls waiting for a concurrency slot."""
+        return self._waiting
+
+    @property
+    def in_flight(self) -> int:
+        """Number of Gemini calls currently holding a concurrency slot."""
+        return self._active
+
+    @asynccontextmanager
+    async def _gemini_slot(self):
+        """
+        Hold one Gemini concurrency slot for the duration of the block.
+
+        Raises:
+            ServiceOverloaded: If all slots are busy and the wait queue is full
+        """
+        async with self._cond:
+            if self._active >= self._cmax:
+                # Shed load instead of letting an unbounded backlog build up behind Gemini rate limits
+                if self._waiting >= settings.gemini_max_queue_depth:
+                    raise ServiceOverloaded("Too many pending Gemini requests")
+                self._waiting += 1
+                try:
+                    await self._cond.wait_for(lambda: self._active < self._cmax)
+                finally:
+                    self._waiting -= 1
+            self._active += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._active -= 1
+                self._cond.notify(1)
+
     async def _with_limit_and_timeout(self, func, *args, **kwargs):
-        async with self._sem:
-            return await asyncio.wait_for(
-                asyncio.to_thread(func, *args, **kwargs),
-                timeout=settings.gemini_timeout_seconds,
-            )
+        async with self._gemini_slot():
+            return await self._with_timeout(func, *args, **kwargs)
+
+    async def _with_timeout(self, func, *args, **kwargs):
+        # Native async SDK methods are awaited directly; blocking ones (e.g. genai.get_file,
+        # which has no async variant) still hop to the default executor.
+        if inspect.iscoroutinefunction(func):
+            call = func(*args, **kwargs)
+        else:
+            call = asyncio.to_thread(func, *args, **kwargs)
+        return await asyncio.wait_for(call, timeout=settings.gemini_timeout_seconds)
 
     async def _retry(self, coro_fn, *args, **kwargs):
         async for attempt in AsyncRetrying(
             stop=stop_after_attempt(settings.gemini_retry_max_attempts),
             wait=wait_exponential(multiplier=settings.gemini_retry_backoff_base, min=0.5, max=8),
+            # Retrying a shed call would just re-join the queue that rejected it
+            retry=retry_if_not_exception_type(ServiceOverloaded),
             reraise=True,
         ):
             with attempt:
                 return await coro_fn(*args, **kwargs)
 
-    async def _gemini_send_message(self, chat_session, content):
-        return await self._with_limit_and_timeout(chat_session.send_message, content)
+    async def _gemini_send_message(self, chat_session, content, **kwargs):
+        return await self._with_limit_and_timeout(chat_session.send_message_async, content, **kwargs)
+
+    async def _stream_gemini_message(self, chat_session, content) -> AsyncIterator[str]:
+        # Hold one concurrency slot for the whole stream; released on completion or error
+        async with self._gemini_slot():
+            response = await asyncio.wait_for(
+                chat_session.send_message_async(content, stream=True),
+                timeout=settings.gemini_timeout_seconds,
+            )
+            chunks = aiter(response)
+            while True:
+                chunk = await asyncio.wait_for(anext(chunks, None), timeout=settings.gemini_timeout_seconds)
+                if chunk is None:
+                    break
+                if chunk.text:
+                    yield chunk.text
+
+    def _get_cached_file(self, file_name: str) -> Optional[Any]:
+        entry = self._file_cache.get(file_name)
+        if entry is None:
+            return None
+        fetched_at, file = entry
+        if time.monotonic() - fetched_at > settings.gemini_file_cache_ttl_seconds:
+            del self._file_cache[file_name]
+            return None
+        self._file_cache.move_to_end(file_name)
+        return file
 
     async def _gemini_get_file(self, file_name: str):
-        return await self._with_limit_and_timeout(genai.get_file, file_name)
+        file = self._get_cached_file(file_name)
+        if file is not None:
+            return file
+
+        async with self._file_locks[file_name]:
+            # Another coroutine may have fetched it while we waited on the lock
+            file = self._get_cached_file(file_name)
+            if file is not None:
+                return file
+
+            file = await self._with_limit_and_timeout(genai.get_file, file_name)
+            self._file_cache[file_name] = (time.monotonic(), file)
+            self._file_cache.move_to_end(file_name)
+            while len(self._file_cache) > settings.gemini_file_cache_size:
+                evicted, _ = self._file_cache.popitem(last=False)
+                self._file_locks.pop(evicted, None)
+            return file
 
     def _to_gemini_history(self, chats: List[Chat]) -> List[dict]:
-        history = []
-        for chat in chats:
-            role = "model" if chat.role == Role.assistant.value else "user"
-            history.append({"role": role, "parts": [chat.message]})
-        return history
+        """Convert all but the last (current, unanswered) message into Gemini chat history."""
+        # islice avoids copying the history just to drop its final element
+        return [{"role": _ROLE_MAP.get(chat.role, "user"), "parts": [chat.message]} for chat in islice(chats, max(len(chats) - 1, 0))]
 
     async def send_message(
         self,
@@ -103,26 +599,174 @@ class ChatService:
         Returns:
             Chat response with AI-generated reply
         """
+        turn = await self._prepare_turn(request, db)
+        self._start_suggestions(turn)
+        try:
+            cached_reply, embedding = await self._lookup_cached_reply(turn, request.message)
+            if cached_reply is not None:
+                # Don't hold a reply served without Gemini back for its suggestions
+                return await self._complete_turn(turn, cached_reply, db, suggestions_wait=0)
+
+            # Generate AI response (multimodal if images available)
+            async def generate() -> str:
+                if turn.file_uris:
+                    # Cap media parts to control latency/cost
+                    capped_uris = turn.file_uris[: settings.gemini_max_media_files]
+                    return await self._generate_multimodal_response(turn.post, request.message, turn.chat_history, capped_uris)
+                return await self._generate_response(turn.post, request.message, turn.chat_history)
+
+            # Nothing is written for this turn until the reply is known, so a failed reply leaves no half-written conversation
+            response_text = await self._coalesce_reply(turn, request.message, generate)
+
+            await self._store_semantic_cache(turn, embedding, response_text)
+            return await self._complete_turn(turn, response_text, db)
+        except BaseException:
+            self._cancel_suggestions(turn)
+            raise
+
+    async def send_message_stream(
+        self,
+        request: ChatRequest,
+        db: AsyncSession,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Send a message about a post and stream the AI response as it is generated.
+
+        Yields ``{"type": "chunk", "text": ...}`` events while Gemini generates the
+        reply, followed by a single ``{"type": "done", ...}`` event carrying the
+        full ChatResponse once the assistant message has been persisted.
+
+        Args:
+            request: Chat request with post ID, message, and user ID
+            db: Database session
+        """
+        turn = await self._prepare_turn(request, db)
+        self._start_suggestions(turn)
+        try:
+            cached_reply, embedding = await self._lookup_cached_reply(turn, request.message)
+            if cached_reply is not None:
+                yield {"type": "chunk", "text": cached_reply}
+                response = await self._complete_turn(turn, cached_reply, db, suggestions_wait=0)
+                yield {"type": "done", **response.model_dump()}
+                return
+
+            # A failed or abandoned (client disconnected) stream writes nothing for this turn
+            chunks: List[str] = []
+            capped_uris = turn.file_uris[: settings.gemini_max_media_files]
+            chat_session, content = await self._open_chat(turn.post, turn.chat_history, request.message, capped_uris)
+            async for text in self._stream_gemini_message(chat_session, content):
+                chunks.append(text)
+                yield {"type": "chunk", "text": text}
+
+            # Persist the assistant message only once the full reply is known
+            response_text = "".join(chunks)
+            await self._store_semantic_cache(turn, embedding, response_text)
+            response = await self._complete_turn(turn, response_text, db)
+            yield {"type": "done", **response.model_dump()}
+        except BaseException:
+            self._cancel_suggestions(turn)
+            raise
+
+    async def _coalesce_reply(self, turn: "_ChatTurn", user_message: str, generate: Callable[[], Awaitable[str]]) -> str:
+        """
+        Share one Gemini call between identical opening questions that arrive concurrently.
+
+        Only opening questions are coalesced: they carry no per-user history, so identical
+        (post, prompt, question) requests get identical prompts. Later turns always generate.
+        """
+        if len(turn.chat_history) > 1:
+            return await generate()
+
+        key = (turn.post.post_id, self._semantic_context_key(turn), user_message.strip().casefold())
+        leader = self._inflight_replies.get(key)
+        if leader is not None:
+            logger.info("Coalesced chat reply with in-flight request", post_id=turn.post.post_id)
+            # Shield so one follower's cancellation does not cancel the shared call
+            return await asyncio.shield(leader)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # Mark the result as retrieved so an error with no followers is not reported as unhandled
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight_replies[key] = future
+        try:
+            response_text = await generate()
+        except BaseException as e:
+            if isinstance(e, Exception):
+                future.set_exception(e)
+            else:
+                future.cancel()
+            raise
+        else:
+            future.set_result(response_text)
+            return response_text
+        finally:
+            del self._inflight_replies[key]
+
+    def _semantic_context_key(self, turn: "_ChatTurn") -> str:
+        # Replies are only shared while the post's analysis and media (i.e. the prompt) are unchanged
+        media_count = len(turn.file_uris[: settings.gemini_max_media_files])
+        system_instruction = self._build_system_instruction(turn.post, media_count=media_count)
+        return hashlib.blake2b(system_instruction.encode(), digest_size=16).hexdigest()
+
+    async def _lookup_cached_reply(self, turn: "_ChatTurn", user_message: str) -> Tuple[Optional[str], Optional[Any]]:
+        """Find a reply without calling Gemini; returns (reply, embedding to store a generated reply under)."""
+        answers = turn.post.prewarmed_answers
+        if answers:
+            answer = answers.get(user_message.strip().casefold())
+            if answer:
+                logger.info("Using prewarmed answer", post_id=turn.post.post_id)
+                return answer, None
+        return await self._lookup_semantic_cache(turn, user_message)
+
+    async def _lookup_semantic_cache(self, turn: "_ChatTurn", user_message: str) -> Tuple[Optional[str], Optional[Any]]:
+        """Look up a cached reply to a similar question; returns (reply, embedding to store the new reply under)."""
+        # Only opening questions are free of per-user conversation context, so only they share replies
+        if not settings.chat_semantic_cache_enabled or len(turn.chat_history) > 1:
+            return None, None
+        embedding = await semantic_cache_service.embed(user_message)
+        if embedding is None:
+            return None, None
+        cached_reply = await semantic_cache_service.lookup(turn.post.post_id, self._semantic_context_key(turn), embedding)
+        return cached_reply, embedding
+
+    async def _store_semantic_cache(self, turn: "_ChatTurn", embedding: Optional[Any], response_text: str) -> None:
+        if embedding is not None and response_text:
+            await semantic_cache_service.store(turn.post.post_id, self._semantic_context_key(turn), embedding, response_text)
+
+    async def _prepare_turn(self, request: ChatRequest, db: AsyncSession) -> "_ChatTurn":
+        """
+        Load the post, user and history for a chat turn.
+
+        The turn's transaction is committed before returning, so the session holds no
+        pooled connection while Gemini generates the reply (which can take seconds).
+        The user's message is only written by _complete_turn, together with the reply.
+        """
         # Validate message
         if not request.message or not request.message.strip():
             raise ValueError("Message must not be empty")
 
-        # Get or create user
-        user = await self._get_or_create_user(request.user_id, db)
-
-        # Get post from database
-        post = await self._get_post(request.post_id, db)
+        # Upsert the user and load the post concurrently; both must settle before the turn's
+        # session is used again, so a failure in one is only raised once the other is done
+        results = await asyncio.gather(
+            self._get_or_create_user(request.user_id, db),
+            self._load_post_for_turn(request.post_id, request.user_id),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        user, post = results
         if not post:
             raise ValueError(f"Post with ID {request.post_id} not found")
 
-        # Get user-specific chat history
-        chat_history = await self._get_user_chat_history(post.post_id, user.id, db)
+        chat_history = sorted(post.chats, key=lambda chat: chat.created_at)[:20]
+        media = self._build_media_bundle((m.media_type, m.media_url, m.gemini_file_uri) for m in post.media)
 
         # Ensure media Gemini URIs, preferring stored URIs first
-        file_uris: List[str] = await self._get_post_gemini_file_uris(post.post_id, db)
+        file_uris: List[str] = list(media["file_uris"])
         if not file_uris:
             if not chat_history:
-                media_urls = await self._get_all_media_urls_for_post(post.post_id, db)
+                media_urls = media["media_urls"]
                 if media_urls:
                     file_uris = await gemini_on_demand_service.batch_ensure_gemini_uris(post.post_id, media_urls, db)
                     logger.info(
@@ -140,38 +784,49 @@ class ChatService:
                         file_uris = chat.file_uris
                         break
 
-        # Save user message with file references
-        await self._save_message(post.post_id, user.id, "user", request.message, file_uris, db)
+        # Build the user message with its file references; it is saved together with the assistant reply
+        user_chat = self._new_message(post.post_id, user.id, "user", request.message, file_uris)
 
-        # Update chat history to include the new message
-        chat_history = await self._get_user_chat_history(post.post_id, user.id, db)
+        # Update chat history to include the new message (no need to re-query the rows we already have)
+        chat_history = [*chat_history, user_chat]
 
-        # Generate AI response (multimodal if images available)
-        if file_uris:
-            # Cap media parts to control latency/cost
-            capped_uris = file_uris[: settings.gemini_max_media_files]
-            response_text = await self._generate_multimodal_response(post, request.message, chat_history, capped_uris)
-        else:
-            response_text = await self._generate_response(post, request.message, chat_history)
+        # Commit the user upsert and return the connection to the pool before any Gemini work
+        await db.commit()
+
+        return _ChatTurn(user=user, post=post, chat_history=chat_history, file_uris=file_uris, media=media, user_chat=user_chat)
+
+    async def _complete_turn(
+        self, turn: "_ChatTurn", response_text: str, db: AsyncSession, suggestions_wait: Optional[float] = None
+    ) -> ChatResponse:
+        """
+        Save the assistant reply and build the chat response for a turn.
+
+        The turn's Gemini suggestions are waited for up to ``suggestions_wait`` seconds
+        (``gemini_suggestions_wait_seconds`` by default); if they are not ready the
+        response carries the fallback questions and the Gemini ones stay fetchable
+        from get_suggestions() once they finish.
+        """
+        post = turn.post
+        file_uris = turn.file_uris
 
-        # Save AI response
-        assistant_chat = await self._save_message(post.post_id, user.id, "assistant", response_text, [], db)
+        # Save the user message and AI response in one short transaction
+        assistant_chat = self._new_message(post.post_id, turn.user.id, "assistant", response_text, [])
+        await self._save_messages([turn.user_chat, assistant_chat], db)
 
-        # Generate suggested questions using Gemini
-        suggested_questions = await self._generate_gemini_suggestions(post, chat_history)
+        if suggestions_wait is None:
+            suggestions_wait = settings.gemini_suggestions_wait_seconds
+        suggested_questions = await self._collect_suggestions(turn, str(assistant_chat.id), suggestions_wait)
 
-        # Count media types in file URIs (rough estimation based on typical naming)
+        # Derive media sources from the media rows loaded for this turn
         media_sources = []
         if file_uris:
-            # Check if we have media based on database info
-            image_urls, video_urls = await self._get_post_media_urls(post.post_id, db)
-            if image_urls:
+            if turn.media["image_urls"]:
                 media_sources.append("Image analysis")
-            if video_urls:
+            if turn.media["video_urls"]:
                 media_sources.append("Video analysis")
 
         return ChatResponse(
-            id=assistant_chat.id,
+            id=str(assistant_chat.id),
             message=response_text,
             suggested_questions=suggested_questions,
             context={
@@ -186,6 +841,67 @@ class ChatService:
             timestamp=assistant_chat.created_at.isoformat(),
         )
 
+    def _start_suggestions(self, turn: "_ChatTurn") -> None:
+        """Start generating Gemini suggestions; they need only the post and the history up to this message."""
+        if settings.gemini_suggestions_enabled:
+            turn.suggestions = asyncio.create_task(self._generate_gemini_suggestions(turn.post, turn.chat_history))
+
+    def _cancel_suggestions(self, turn: "_ChatTurn") -> None:
+        if turn.suggestions is not None:
+            turn.suggestions.cancel()
+
+    async def _collect_suggestions(self, turn: "_ChatTurn", chat_id: str, timeout: float) -> List[str]:
+        """Return the turn's Gemini suggestions if ready within ``timeout``, otherwise the fallback ones."""
+        task = turn.suggestions
+        if task is not None and not task.done() and timeout > 0:
+            await asyncio.wait({task}, timeout=timeout)
+        if task is None or task.cancelled():
+            return self._generate_fallback_suggestions(turn.post, turn.chat_history)
+        if not task.done():
+            # Let it finish in the background so get_suggestions() can serve it
+            self._schedule_suggestions(chat_id, task)
+            return self._generate_fallback_suggestions(turn.post, turn.chat_history)
+        self._store_suggestions(chat_id, task.result())
+        return task.result()
+
+    def _schedule_suggestions(self, chat_id: str, questions: Awaitable[List[str]]) -> None:
+        task = asyncio.create_task(self._cache_suggestions(chat_id, questions))
+        self._suggestion_tasks[chat_id] = task
+        task.add_done_callback(lambda _: self._suggestion_tasks.pop(chat_id, None))
+
+    async def _cache_suggestions(self, chat_id: str, pending: Awaitable[List[str]]) -> None:
+        self._store_suggestions(chat_id, await pending)
+
+    def _store_suggestions(self, chat_id: str, questions: List[str]) -> None:
+        self._suggestions[chat_id] = (time.monotonic(), questions)
+        self._suggestions.move_to_end(chat_id)
+        while len(self._suggestions) > settings.gemini_suggestions_cache_size:
+            self._suggestions.popitem(last=False)
+
+    def get_suggestions(self, chat_id: str) -> Tuple[bool, List[str]]:
+        """
+        Get Gemini-generated follow-up questions for an assistant message.
+
+        Chat responses already carry the suggestions when they are ready in time; this
+        serves ones that finished after their reply was sent. Results are kept per
+        worker, so a poll routed to another worker finds nothing.
+
+        Returns:
+            (ready, questions); ready is False while generation is still running
+
+        Raises:
+            ValueError: If no suggestions are cached or pending for the message
+        """
+        entry = self._suggestions.get(chat_id)
+        if entry is not None:
+            stored_at, questions = entry
+            if time.monotonic() - stored_at <= settings.gemini_suggestions_cache_ttl_seconds:
+                return True, questions
+            del self._suggestions[chat_id]
+        if chat_id in self._suggestion_tasks:
+            return False, []
+        raise ValueError(f"No suggestions found for message {chat_id}")
+
     async def get_chat_history(
         self,
         post_id: str,
@@ -202,16 +918,15 @@ class ChatService:
             List of chat messages
         """
         # Get post from database
-        post = await self._get_post(post_id, db)
-        if not post:
+        if not await self._post_exists(post_id, db):
             raise ValueError(f"Post with ID {post_id} not found")
 
         # Get chat history
-        chats = await self._get_chat_history(post.post_id, db)
+        chats = await self._get_chat_history(post_id, db)
 
         return [
             Message(
-                id=chat.id,
+                id=str(chat.id),
                 role=chat.role,
                 message=chat.message,
                 created_at=chat.created_at.isoformat(),
@@ -237,8 +952,7 @@ class ChatService:
             List of chat messages for this specific user
         """
         # Get post from database
-        post = await self._get_post(post_id, db)
-        if not post:
+        if not await self._post_exists(post_id, db):
             raise ValueError(f"Post with ID {post_id} not found")
 
         # Get user (readonly - no creation for history retrieval)
@@ -248,11 +962,11 @@ class ChatService:
             return []
 
         # Get user-specific chat history
-        chats = await self._get_user_chat_history(post.post_id, user.id, db)
+        chats = await self._get_user_chat_history(post_id, user.id, db)
 
         return [
             Message(
-                id=chat.id,
+                id=str(chat.id),
                 role=chat.role,
                 message=chat.message,
                 created_at=chat.created_at.isoformat(),
@@ -261,105 +975,268 @@ class ChatService:
         ]
 
     async def _get_or_create_user(self, user_id: str, db: AsyncSession) -> User:
-        """Get or create user by ID."""
-        result = await db.execute(select(User).where(User.id == user_id))
+        """
+        Get or create user by ID.
+
+        The row is only flushed; it is committed with the rest of the chat turn.
+        """
+        result = await db.execute(_USER_STMT, {"user_id": user_id})
         user = result.scalar_one_or_none()
+        now = datetime.now(timezone.utc)
 
         if not user:
             user = User(
                 id=user_id,
-                last_active_at=datetime.now(timezone.utc),
+                last_active_at=now,
             )
             db.add(user)
         else:
-            # Update last active timestamp
-            user.last_active_at = datetime.now(timezone.utc)
-
-        await db.commit()
-        await db.refresh(user)
+            # Update last active timestamp, at most once per interval so an active chat
+            # doesn't rewrite (and lock) the user row on every message
+            last_active_at = user.last_active_at
+            if last_active_at.tzinfo is None:
+                last_active_at = last_active_at.replace(tzinfo=timezone.utc)
+            if (now - last_active_at).total_seconds() >= settings.user_touch_interval_seconds:
+                user.last_active_at = now
+
+        # A no-op unless the user is new or was touched
+        await db.flush()
         return user
 
     async def _get_user_readonly(self, user_id: str, db: AsyncSession) -> Optional[User]:
         """Get user without creating or updating it (for history retrieval)."""
-        result = await db.execute(select(User).where(User.id == user_id))
+        result = await db.execute(_USER_STMT, {"user_id": user_id})
         return result.scalar_one_or_none()
 
-    async def _get_user_chat_history(self, post_id: str, user_id: str, db: AsyncSession, limit: int = 20) -> List[Chat]:
-        """Get chat history for a specific user and post."""
-        result = await db.execute(
-            select(Chat).where(Chat.post_id == post_id).where(Chat.user_id == user_id).order_by(Chat.created_at.asc()).limit(limit)
-        )
-        return result.scalars().all()
-
-    async def _get_post_image_urls(self, post_id: str, db: AsyncSession) -> List[str]:
-        """Get image URLs from post media table."""
-        result = await db.execute(select(PostMedia.media_url).where(PostMedia.post_id == post_id).where(PostMedia.media_type == "image"))
-        return [url for (url,) in result.fetchall()]
-
-    async def _get_post_video_urls(self, post_id: str, db: AsyncSession) -> List[str]:
-        """Get video URLs from post media table."""
-        result = await db.execute(select(PostMedia.media_url).where(PostMedia.post_id == post_id).where(PostMedia.media_type == "video"))
-        return [url for (url,) in result.fetchall()]
-
-    async def _get_post_media_urls(self, post_id: str, db: AsyncSession) -> Tuple[List[str], List[str]]:
-        """Get both image and video URLs from post media table."""
-        image_urls = await self._get_post_image_urls(post_id, db)
-        video_urls = await self._get_post_video_urls(post_id, db)
-        return image_urls, video_urls
-
-    async def _get_all_media_urls_for_post(self, post_id: str, db: AsyncSession) -> List[str]:
-        """Get all media URLs for a post (both images and videos)."""
-        result = await db.execute(select(PostMedia.media_url).where(PostMedia.post_id == post_id))
-        return [url for (url,) in result.fetchall()]
-
-    async def _get_post_gemini_file_uris(self, post_id: str, db: AsyncSession) -> List[str]:
-        """Get pre-uploaded Gemini file URIs from post media table."""
-        result = await db.execute(
-            select(PostMedia.gemini_file_uri).where(PostMedia.post_id == post_id).where(PostMedia.gemini_file_uri.isnot(None))
-        )
-        return [uri for (uri,) in result.fetchall() if uri]
-
-    async def _get_post_media_count(self, post_id: str, db: AsyncSession) -> int:
-        """Get count of media files for a post."""
-        from sqlalchemy import func
-
-        result = await db.execute(select(func.count(PostMedia.id)).where(PostMedia.post_id == post_id))
-        return result.scalar() or 0
+    async def _get_user_chat_history(self, post_id: str, user_id: str, db: AsyncSession, limit: int = 20) -> List[Row]:
+        """Get chat history (id, role, message, created_at rows) for a specific user and post."""
+        result = await db.execute(_USER_CHAT_HISTORY_STMT, {"post_id": post_id, "user_id": user_id, "limit": limit})
+        return result.all()
+
+    async def _get_post_media_bundle(self, post_id: str, db: AsyncSession) -> Dict[str, Any]:
+        """Get image URLs, video URLs, and stored Gemini file URIs for a post in a single query."""
+        result = await db.execute(_POST_MEDIA_STMT, {"post_id": post_id})
+        return self._build_media_bundle(result.all())
+
+    @staticmethod
+    def _build_media_bundle(rows: Iterable[Tuple[str, str, Optional[str]]]) -> Dict[str, Any]:
+        """Split (media_type, media_url, gemini_file_uri) rows into the URL lists used by a chat turn."""
+        media_urls: List[str] = []
+        image_urls: List[str] = []
+        video_urls: List[str] = []
+        file_uris: List[str] = []
+        for media_type, media_url, gemini_file_uri in rows:
+            media_urls.append(media_url)
+            if media_type == "image":
+                image_urls.append(media_url)
+            elif media_type == "video":
+                video_urls.append(media_url)
+            if gemini_file_uri:
+                file_uris.append(gemini_file_uri)
+
+        return {
+            "media_urls": media_urls,
+            "image_urls": image_urls,
+            "video_urls": video_urls,
+            "file_uris": file_uris,
+            "count": len(media_urls),
+        }
 
     async def _get_post(self, post_id: str, db: AsyncSession) -> Optional[Post]:
-        """Get post by Facebook post ID."""
-        result = await db.execute(select(Post).where(Post.post_id == post_id))
+        """Get post by Facebook post ID (without its chats or media)."""
+        result = await db.execute(_POST_STMT, {"post_id": post_id})
         return result.scalar_one_or_none()
 
-    async def _get_chat_history(self, post_id: str, db: AsyncSession, limit: int = 20) -> List[Chat]:
-        """Get chat history for a post."""
-        result = await db.execute(select(Chat).where(Chat.post_id == post_id).order_by(Chat.created_at.asc()).limit(limit))
-        return result.scalars().all()
+    async def _post_exists(self, post_id: str, db: AsyncSession) -> bool:
+        """Check a post exists, reading only its key rather than the full (content-sized) row."""
+        result = await db.execute(_POST_EXISTS_STMT, {"post_id": post_id})
+        return result.scalar_one_or_none() is not None
+
+    async def _load_post_for_turn(self, post_id: str, user_id: str) -> Optional[Post]:
+        """Load a post for a chat turn on its own session so it can overlap the user upsert."""
+        # Let an in-flight prewarm store its Gemini URIs before the media rows are read
+        await self._await_prewarm(post_id)
+        async with get_async_session() as db:
+            return await self._get_post_for_turn(post_id, user_id, db)
+
+    async def _get_post_for_turn(self, post_id: str, user_id: str, db: AsyncSession) -> Optional[Post]:
+        """Get a post with its media and one user's chat history (prompt columns only) eagerly loaded."""
+        # Built per call because the chat loader's user filter can't take a bindparam (the selectin
+        # query doesn't see the execute() parameters); lambda_stmt still caches the construction and
+        # tracks post_id / user_id as bound values
+        stmt = lambda_stmt(
+            lambda: (
+                select(Post)
+                .where(Post.post_id == post_id)
+                .options(
+                    selectinload(Post.media),
+                    # Only this user's chats, without hydrating Chat.post / Chat.user for each row
+                    selectinload(Post.chats.and_(Chat.user_id == user_id)).options(
+                        load_only(Chat.role, Chat.message, Chat.file_uris, Chat.created_at),
+                        lazyload(Chat.post),
+                        lazyload(Chat.user),
+                    ),
+                )
+            )
+        )
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
 
-    async def _save_message(
-        self,
-        post_id: str,
-        user_id: str,
-        role: str,
-        message: str,
-        file_uris: List[str],
-        db: AsyncSession,
-    ) -> Chat:
-        """Save a chat message to database with user and file references."""
-        chat = Chat(
-            id=str(uuid.uuid4()),
+    async def _get_chat_history(self, post_id: str, db: AsyncSession, limit: int = 20) -> List[Row]:
+        """Get chat history (id, role, message, created_at rows) for a post."""
+        result = await db.execute(_CHAT_HISTORY_STMT, {"post_id": post_id, "limit": limit})
+        return result.all()
+
+    @staticmethod
+    def _new_message(post_id: str, user_id: str, role: str, message: str, file_uris: List[str]) -> Chat:
+        """
+        Build an unsaved chat message with user and file references.
+
+        The id and timestamps are assigned here rather than by the database, so a user
+        message saved in the same transaction as its reply still sorts before it
+        (now() is fixed for the whole transaction).
+        """
+        now = datetime.now(timezone.utc)
+        return Chat(
+            id=uuid7(),
             post_id=post_id,
             user_id=user_id,
             role=role,
             message=message,
             file_uris=file_uris if file_uris else None,
+            created_at=now,
+            updated_at=now,
         )
 
-        db.add(chat)
+    async def _save_messages(self, chats: List[Chat], db: AsyncSession) -> None:
+        """Insert chat messages in a single batched INSERT and commit them."""
+        await db.execute(
+            insert(Chat),
+            [
+                {
+                    "id": chat.id,
+                    "post_id": chat.post_id,
+                    "user_id": chat.user_id,
+                    "role": chat.role,
+                    "message": chat.message,
+                    "file_uris": chat.file_uris,
+                    "created_at": chat.created_at,
+                    "updated_at": chat.updated_at,
+                }
+                for chat in chats
+            ],
+        )
         await db.commit()
-        await db.refresh(chat)
 
-        return chat
+    def _start_chat_session(self, post: Post, chat_history: List[Chat], media_count: int = 0):
+        """Create a Gemini chat session seeded with the post context and prior turns."""
+        model = self._get_chat_model(self._build_system_instruction(post, media_count=media_count))
+        # Build history excluding the just-saved current message
+        history = self._to_gemini_history(chat_history)
+        return model.start_chat(history=history)
+
+    def _get_chat_model(self, system_instruction: str) -> genai.GenerativeModel:
+        """Get a cached chat model for a system instruction, building it on a miss."""
+        key = hashlib.blake2b(system_instruction.encode(), digest_size=16).hexdigest()
+        model = self._model_cache.get(key)
+        if model is not None:
+            self._model_cache.move_to_end(key)
+            return model
+
+        model = genai.GenerativeModel(_CHAT_MODEL, system_instruction=system_instruction, generation_config=_CHAT_GENERATION_CONFIG)
+        self._model_cache[key] = model
+        while len(self._model_cache) > _MODEL_CACHE_SIZE:
+            self._model_cache.popitem(last=False)
+        return model
+
+    async def _open_chat(self, post: Post, chat_history: List[Chat], user_message: str, file_uris: List[str]) -> Tuple[Any, Any]:
+        """Start a Gemini chat for a turn and build the content to send, using a context cache when possible."""
+        if not file_uris:
+            return self._start_chat_session(post, chat_history), user_message
+
+        cached = await self._get_context_cache(post, file_uris)
+        if cached is not None:
+            # System instruction and media are already in the cache; only the question is sent
+            model = genai.GenerativeModel.from_cached_content(cached, generation_config=_CHAT_GENERATION_CONFIG)
+            chat_session = model.start_chat(history=self._to_gemini_history(chat_history))
+            return chat_session, f"User question: {user_message}"
+
+        chat_session = self._start_chat_session(post, chat_history, media_count=len(file_uris))
+        return chat_session, await self._build_multimodal_prompt(user_message, file_uris)
+
+    async def _get_context_cache(self, post: Post, file_uris: List[str]) -> Optional[Any]:
+        """
+        Get or create a Gemini context cache for a post's system instruction and media.
+
+        Lets the per-post prefix be billed once per TTL window instead of every turn.
+        Gemini rejects caches below its minimum token count, so failures are remembered
+        for the TTL as well and the turn falls back to sending the full prompt.
+        """
+        if not settings.gemini_context_cache_enabled:
+            return None
+
+        system_instruction = self._build_system_instruction(post, media_count=len(file_uris))
+        key = (post.post_id, system_instruction, tuple(file_uris))
+        entry = self._ctx_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        async with self._ctx_locks[post.post_id]:
+            entry = self._ctx_cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+            files = await self._load_media_files(file_uris)
+            if not files:
+                return None
+
+            ttl = settings.gemini_context_cache_ttl_seconds
+            try:
+                cached = await self._with_limit_and_timeout(
+                    genai.caching.CachedContent.create,
+                    model=f"models/{_CHAT_MODEL}",
+                    system_instruction=system_instruction,
+                    contents=[{"role": "user", "parts": files}],
+                    ttl=timedelta(seconds=ttl),
+                )
+                logger.info("Created Gemini context cache", post_id=post.post_id, cache_name=cached.name, media_count=len(files))
+            except Exception as e:
+                logger.info("Gemini context cache unavailable, sending full prompt", post_id=post.post_id, error=str(e))
+                cached = None
+
+            now = time.monotonic()
+            for stale in [k for k, (expires_at, _) in self._ctx_cache.items() if expires_at <= now]:
+                del self._ctx_cache[stale]
+            # Expire locally a minute before Gemini does so a turn never references a dead cache
+            self._ctx_cache[key] = (now + max(ttl - 60, 0), cached)
+            return cached
+
+    async def _load_media_files(self, file_uris: List[str]) -> List[Any]:
+        """Resolve Gemini File handles for media URIs, skipping any that fail to load."""
+        # Resolve all file handles concurrently (still bounded by the Gemini slot limit)
+        file_names = [
+            uri.split("/files/")[-1] if uri.startswith("https://generativelanguage.googleapis.com/v1beta/files/") else uri
+            for uri in file_uris
+        ]
+        results = await asyncio.gather(
+            *(self._retry(self._gemini_get_file, file_name) for file_name in file_names),
+            return_exceptions=True,
+        )
+        files: List[Any] = []
+        for uri, file_name, file in zip(file_uris, file_names, results):
+            if isinstance(file, Exception):
+                logger.warning("Failed to load media file for multimodal prompt", uri=uri, error=str(file))
+                continue
+            files.append(file)
+            logger.info("Successfully loaded media file for multimodal prompt", uri=uri, file_name=file_name)
+        return files
+
+    async def _build_multimodal_prompt(self, user_message: str, file_uris: List[str]) -> List[Any]:
+        """Resolve media file handles and combine them with the user's question."""
+        # Add images first, then the current user message
+        prompt_parts: List[Any] = await self._load_media_files(file_uris)
+        prompt_parts.append(f"User question: {user_message}")
+        return prompt_parts
 
     async def _generate_response(
         self,
@@ -369,53 +1246,14 @@ class ChatService:
     ) -> str:
         """Generate AI response using Gemini with comprehensive context."""
         try:
-            # Build comprehensive detection results summary
-            detection_summary = self._build_detection_summary(post)
-
-            # Create system instruction with post content and detection results
-            system_instruction = f"""You are an expert AI content detection assistant helping users understand detection results for this specific social media post.
-
-POST CONTENT:
-"{post.content}"
-
-AUTHOR: {post.author or "Unknown"}
-
-DETECTION ANALYSIS RESULTS:
-{detection_summary}
-
-OVERALL VERDICT: {post.verdict}
-OVERALL CONFIDENCE: {(post.confidence * 100):.1f}%
-EXPLANATION: {post.explanation or "No detailed explanation provided"}
-
-Your role:
-- Help users understand these specific AI detection results
-- Explain the reasoning behind the analysis in an accessible way
-- Answer questions about the detection methods (text analysis, image detection, video analysis)
-- Reference the actual post content when relevant
-- Be conversational and engaging, not robotic
-- Acknowledge limitations and potential for false positives/negatives
-- Provide insights based on the specific detection scores and confidence levels shown above
-
-Keep responses informative but concise (2-4 sentences typically)."""
-
-            # Initialize model with the specific post context
-            model = genai.GenerativeModel(
-                "gemini-2.5-flash-lite",
-                system_instruction=system_instruction,
-                generation_config={
-                    "temperature": 0.6,
-                    "top_p": 0.95,
-                    "max_output_tokens": 512,
-                },
-            )
-            # Build history excluding the just-saved current message
-            history = self._to_gemini_history(chat_history[:-1])
-            chat_session = model.start_chat(history=history)
+            chat_session = self._start_chat_session(post, chat_history)
 
             # Send the current user message and get response (with retries/timeout/concurrency)
             response = await self._retry(self._gemini_send_message, chat_session, user_message)
             return response.text
 
+        except ServiceOverloaded:
+            raise
         except Exception as e:
             logger.error(
                 "Error generating Gemini response",
@@ -429,81 +1267,14 @@ Keep responses informative but concise (2-4 sentences typically)."""
     async def _generate_multimodal_response(self, post: Post, user_message: str, chat_history: List[Chat], file_uris: List[str]) -> str:
         """Generate AI response using Gemini with text, images, and videos."""
         try:
-            # Build comprehensive detection results summary
-            detection_summary = self._build_detection_summary(post)
-
-            # Create system instruction with post content and image context
-            system_instruction = f"""You are an expert AI content detection assistant helping users understand detection results for this specific social media post.
-
-POST CONTENT:
-"{post.content}"
-
-AUTHOR: {post.author or "Unknown"}
-
-DETECTION ANALYSIS RESULTS:
-{detection_summary}
-
-OVERALL VERDICT: {post.verdict}
-OVERALL CONFIDENCE: {(post.confidence * 100):.1f}%
-EXPLANATION: {post.explanation or "No detailed explanation provided"}
-
-MULTIMEDIA CONTENT: You have access to {len(file_uris)} media files (images and/or videos) from this post. Analyze them for:
-- Visual signs of AI generation (artifacts, inconsistencies, unnatural elements)
-- For videos: motion patterns, temporal consistency, audio-visual synchronization
-- Correlation between text claims and visual/video content
-- Overall authenticity assessment combining text and multimedia evidence
-
-Your role:
-- Help users understand these specific AI detection results
-- Analyze both text and visual content for comprehensive insights
-- Explain the reasoning behind the analysis in an accessible way
-- Reference specific visual elements when relevant
-- Be conversational and engaging, not robotic
-- Acknowledge limitations and potential for false positives/negatives
-- Provide insights based on the specific detection scores and confidence levels shown above
-
-Keep responses informative but concise (2-4 sentences typically)."""
-
-            # Initialize model with multimodal capability
-            model = genai.GenerativeModel(
-                "gemini-2.5-flash-lite",
-                system_instruction=system_instruction,
-                generation_config={
-                    "temperature": 0.6,
-                    "top_p": 0.95,
-                    "max_output_tokens": 512,
-                },
-            )
-
-            # Build history excluding the current message
-            history = self._to_gemini_history(chat_history[:-1])
-            chat_session = model.start_chat(history=history)
-
-            # Create multimodal prompt with images
-            prompt_parts = []
-
-            # Add images first
-            for uri in file_uris:
-                try:
-                    # Extract file name from URI if needed
-                    if uri.startswith("https://generativelanguage.googleapis.com/v1beta/files/"):
-                        file_name = uri.split("/files/")[-1]
-                    else:
-                        file_name = uri
-
-                    file = await self._retry(self._gemini_get_file, file_name)
-                    prompt_parts.append(file)
-                    logger.info("Successfully loaded media file for multimodal prompt", uri=uri, file_name=file_name)
-                except Exception as e:
-                    logger.warning("Failed to load media file for multimodal prompt", uri=uri, error=str(e))
-
-            # Add current user message
-            prompt_parts.append(f"User question: {user_message}")
+            chat_session, content = await self._open_chat(post, chat_history, user_message, file_uris)
 
             # Generate response with multimodal content
-            response = await self._retry(self._gemini_send_message, chat_session, prompt_parts)
+            response = await self._retry(self._gemini_send_message, chat_session, content)
             return response.text
 
+        except ServiceOverloaded:
+            raise
         except Exception as e:
             logger.error(
                 "Error generating multimodal Gemini response",
@@ -517,35 +1288,20 @@ Keep responses informative but concise (2-4 sentences typically)."""
 
     def _build_detection_summary(self, post: Post) -> str:
         """Build a comprehensive summary of all detection results."""
-        summary_parts = []
-
-        # Text detection results
-        if post.text_ai_probability is not None:
-            text_status = "AI-generated" if post.text_ai_probability > 0.5 else "Human-written"
-            summary_parts.append(
-                f"Text Analysis: {text_status} (probability: {post.text_ai_probability:.3f}, confidence: {post.text_confidence or 0:.3f})"
-            )
-
-        # Image detection results
-        if post.image_ai_probability is not None:
-            image_status = "AI-generated" if post.image_ai_probability > 0.5 else "Human-created"
-            summary_parts.append(
-                f"Image Analysis: {image_status} (probability: {post.image_ai_probability:.3f}, confidence: {post.image_confidence or 0:.3f})"
-            )
-
-        # Video detection results
-        if post.video_ai_probability is not None:
-            video_status = "AI-generated" if post.video_ai_probability > 0.5 else "Human-created"
-            summary_parts.append(
-                f"Video Analysis: {video_status} (probability: {post.video_ai_probability:.3f}, confidence: {post.video_confidence or 0:.3f})"
-            )
-
-        # Add metadata if available
-        if post.post_metadata:
-            metadata_summary = ", ".join([f"{k}: {v}" for k, v in post.post_metadata.items()])
-            summary_parts.append(f"Additional Metadata: {metadata_summary}")
-
-        return "\n".join(summary_parts) if summary_parts else "No detailed detection results available"
+        # Stored with the analysis; computed on the fly for posts analyzed before the column existed
+        return post.detection_summary_text or build_detection_summary(post)
+
+    def _build_system_instruction(self, post: Post, media_count: int = 0) -> str:
+        """Build the per-post chat system instruction (multimodal variant when media_count > 0)."""
+        return _system_instruction_text(
+            post.content,
+            post.author,
+            post.verdict,
+            post.confidence,
+            post.explanation,
+            self._build_detection_summary(post),
+            media_count,
+        )
 
     async def _generate_gemini_suggestions(self, post: Post, chat_history: List[Chat]) -> List[str]:
         """Generate intelligent question suggestions using Gemini AI."""
@@ -554,40 +1310,24 @@ Keep responses informative but concise (2-4 sentences typically)."""
             detection_summary = self._build_detection_summary(post)
 
             # Create conversation history summary
-            conversation_summary = ""
             if chat_history:
-                conversation_summary = "\n\nCONVERSATION HISTORY:\n"
-                for chat in chat_history:
-                    conversation_summary += f"{chat.role.upper()}: {chat.message}\n"
+                conversation_summary = "\n\nCONVERSATION HISTORY:\n" + "".join(
+                    f"{chat.role.upper()}: {chat.message}\n" for chat in chat_history
+                )
             else:
                 conversation_summary = "\n\nCONVERSATION HISTORY: No previous conversation"
 
-            # Create system instruction for generating suggestions
-            system_instruction = f"""You are an AI assistant helping generate intelligent follow-up questions for users who want to understand AI content detection results.
-
-POST CONTENT:
-"{post.content}"
-
-AUTHOR: {post.author or "Unknown"}
-
-DETECTION ANALYSIS RESULTS:
-{detection_summary}
-
-OVERALL VERDICT: {post.verdict}
-OVERALL CONFIDENCE: {(post.confidence * 100):.1f}%
-EXPLANATION: {post.explanation or "No detailed explanation provided"}
-{conversation_summary}
-
-Generate 3 short, concise follow-up questions that:
-1. Haven't been asked before in the conversation history
-2. Help the user better understand the detection results
-3. Explore different aspects of AI detection (patterns, confidence, methodology, implications)
-4. Are specific to this post's content and analysis results
-5. Are conversational and engaging
-6. Keep each question under 8 words when possible
-7. Use simple, direct language
+            # Create system instruction for generating suggestions (post context is cached per post)
+            post_context = _suggestions_post_context(
+                post.content, post.author, post.verdict, post.confidence, post.explanation, detection_summary
+            )
+            system_instruction = f"{post_context}\n{conversation_summary}\n\n{_SUGGESTIONS_TASK}"
 
-Return ONLY the 3 questions, each on a separate line, without numbers or bullet points."""
+            prompt_key = hashlib.blake2b(system_instruction.encode(), digest_size=16).hexdigest()
+            entry = self._suggestions_by_prompt.get(prompt_key)
+            if entry is not None and time.monotonic() - entry[0] <= settings.gemini_suggestions_cache_ttl_seconds:
+                self._suggestions_by_prompt.move_to_end(prompt_key)
+                return list(entry[1])
 
             # Initialize model
             model = genai.GenerativeModel(
@@ -600,12 +1340,13 @@ Return ONLY the 3 questions, each on a separate line, without numbers or bullet
                 },
             )
 
-            # Generate suggestions with concurrency limit, timeout, and retries
-            response = await self._retry(
-                self._with_limit_and_timeout,
-                model.generate_content,
-                "Generate 3 intelligent follow-up questions based on the context above.",
-            )
+            # Generate suggestions with their own concurrency limit, timeout, and retries
+            async with self._suggestions_sem:
+                response = await self._retry(
+                    self._with_timeout,
+                    model.generate_content_async,
+                    "Generate 3 intelligent follow-up questions based on the context above.",
+                )
 
             # Parse response into individual questions
             questions = [q.strip() for q in response.text.strip().split("\n") if q.strip()]
@@ -622,7 +1363,11 @@ Return ONLY the 3 questions, each on a separate line, without numbers or bullet
                 ]
                 questions.extend(fallback_questions[len(questions) : 3])
 
-            return questions
+            self._suggestions_by_prompt[prompt_key] = (time.monotonic(), questions)
+            self._suggestions_by_prompt.move_to_end(prompt_key)
+            while len(self._suggestions_by_prompt) > settings.gemini_suggestions_cache_size:
+                self._suggestions_by_prompt.popitem(last=False)
+            return list(questions)
 
         except Exception as e:
             logger.error(
@@ -636,24 +1381,17 @@ Return ONLY the 3 questions, each on a separate line, without numbers or bullet
 
     def _generate_fallback_suggestions(self, post: Post, chat_history: List[Chat]) -> List[str]:
         """Generate fallback suggestions when Gemini fails."""
-        questions = [
-            "What patterns suggest AI generation?",
-            "How confident is this analysis?",
-            "Could this be wrong?",
-            "What are the key indicators?",
-        ]
-
-        if post.verdict == "ai_slop":
-            questions.append("How is this different from human writing?")
-        else:
-            questions.append("Why is this human-written?")
-
-        # Filter out questions that have already been asked
-        asked_questions = {chat.message.lower() for chat in chat_history if chat.role == "user"}
-        available_questions = [q for q in questions if q.lower() not in asked_questions]
-
-        # Return top 3 questions
-        return available_questions[:3]
+        if not chat_history:
+            return list(_fallback_suggestions_for(post.verdict, frozenset()))
+
+        # Only messages matching a candidate question affect the result, which keeps the cache key small;
+        # messages longer than any candidate can't match, so they are never casefolded
+        asked_questions = frozenset(
+            key
+            for key in (chat.message.casefold() for chat in chat_history if chat.role == "user" and len(chat.message) <= _FALLBACK_MAX_LEN)
+            if key in _FALLBACK_KEYS
+        )
+        return list(_fallback_suggestions_for(post.verdict, asked_questions))
 
     def _generate_suggested_questions(self, post: Post, chat_history: List[Chat]) -> List[str]:
         """Generate suggested follow-up questions (legacy method, kept for compatibility)."""
@@ -1,19 +1,25 @@
 """Improved content AI detection service using unified media processing."""
 
 import asyncio
-from datetime import datetime
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload, selectinload
 
 from core.media_registry import media_registry
 from schemas.content_detection import ContentDetectionRequest, ContentDetectionResponse
-from schemas.text_detection import DetectRequest
+from schemas.text_detection import DetectRequest, DetectResponse
+from services.detection_summary import build_detection_summary
 from services.text_detection_service import TextDetectionService
 from services.unified_media_service import UnifiedMediaService
 from services.media_analyzer import MediaType
 from utils.logging import get_logger
 from core.config import settings
+from db.models import Post
 
 logger = get_logger(__name__)
 
@@ -25,6 +31,49 @@ class ContentDetectionService:
         """Initialize the content detection service."""
         self.text_service = TextDetectionService.get_instance()
         self.media_service = UnifiedMediaService(max_workers=4)
+        # Responses for already-verdicted posts: post_id -> (stored_at, response), oldest first
+        self._response_cache: "OrderedDict[str, Tuple[float, ContentDetectionResponse]]" = OrderedDict()
+
+    def get_cached_response(self, post_id: str) -> Optional[ContentDetectionResponse]:
+        """
+        Get a recently served cached response for a post without touching the database.
+
+        Args:
+            post_id: Facebook post ID
+
+        Returns:
+            Copy of the cached response stamped with the current time if still fresh, None otherwise
+        """
+        entry = self._response_cache.get(post_id)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > settings.detection_response_cache_ttl_seconds:
+            del self._response_cache[post_id]
+            return None
+        self._response_cache.move_to_end(post_id)
+        return response.model_copy(update={"timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds")})
+
+    def cache_response(self, response: ContentDetectionResponse) -> None:
+        """
+        Remember a cached response so repeated polls for the post skip the database.
+
+        Args:
+            response: Response built from a post that already has a verdict
+        """
+        self._response_cache[response.post_id] = (time.monotonic(), response)
+        self._response_cache.move_to_end(response.post_id)
+        while len(self._response_cache) > settings.detection_response_cache_size:
+            self._response_cache.popitem(last=False)
+
+    def invalidate_cached_response(self, post_id: str) -> None:
+        """
+        Drop the cached response for a post whose results changed.
+
+        Args:
+            post_id: Facebook post ID
+        """
+        self._response_cache.pop(post_id, None)
 
     async def detect(
         self,
@@ -41,9 +90,17 @@ class ContentDetectionService:
         Returns:
             Detection response with aggregated verdict and detailed analysis
         """
+        cached_response = self.get_cached_response(request.post_id)
+        if cached_response:
+            return cached_response
+
+        # Load the post with its media in one round-trip; serves both the cache check and media lookup
+        post = await self._load_post(request.post_id, db)
+
         # Check for cached results first
-        cached_response = await self._check_cached_results(request.post_id, db)
+        cached_response = self._check_cached_results(request.post_id, post)
         if cached_response:
+            self.cache_response(cached_response)
             return cached_response
 
         logger.info(
@@ -54,65 +111,173 @@ class ContentDetectionService:
             content_length=len(request.content) if request.content else 0,
         )
 
-        # Get media information from database
-        media_info = await self._get_post_media_info(request.post_id, db)
-
-        # Run all analyses in parallel
-        analysis_tasks = []
-
-        # Text analysis
-        analysis_tasks.append(self._analyze_text(request, db))
+        # Get media information from the loaded post
+        media_info = self._get_post_media_info(request.post_id, post)
 
-        # Image analysis using unified service
-        if request.image_urls:
-            analysis_tasks.append(
-                self.media_service.analyze_media_batch(request.image_urls, MediaType.IMAGE, request.post_id, media_info, db)
+        image_urls = request.image_urls or []
+        # Use database-sourced URLs (supports yt-dlp synthetic video URLs)
+        video_urls = self._get_video_urls(post) if request.video_urls or request.has_videos else []
+
+        text_result: Optional[DetectResponse] = None
+        if settings.enable_media_skip_on_confident_text and (image_urls or video_urls):
+            # Score text first so media work is never started when text settles the verdict
+            text_result = await self._analyze_text(request, db)
+            if self._text_decides_verdict(text_result):
+                logger.info("Skipping media analysis for confident AI text verdict", post_id=request.post_id)
+                image_urls, video_urls = [], []
+
+        # Run the remaining analyses in parallel; a modality without media gets no task
+        started_at = asyncio.get_running_loop().time()
+        text_task = asyncio.create_task(self._analyze_text(request, db)) if text_result is None else None
+        media_tasks: Dict[MediaType, Tuple[asyncio.Task, List[str]]] = {}
+        if image_urls:
+            media_tasks[MediaType.IMAGE] = (
+                asyncio.create_task(self.media_service.analyze_media_batch(image_urls, MediaType.IMAGE, request.post_id, media_info, db)),
+                image_urls,
+            )
+        if video_urls:
+            media_tasks[MediaType.VIDEO] = (
+                asyncio.create_task(self.media_service.analyze_media_batch(video_urls, MediaType.VIDEO, request.post_id, media_info, db)),
+                video_urls,
             )
-        else:
-            analysis_tasks.append(self._create_empty_media_result())
 
-        # Video analysis using unified service
-        # Use database-sourced URLs (supports yt-dlp synthetic video URLs)
-        if request.video_urls or request.has_videos:
-            video_urls = await self._get_video_urls_from_db(request.post_id, db)
-            if video_urls:
-                analysis_tasks.append(self.media_service.analyze_media_batch(video_urls, MediaType.VIDEO, request.post_id, media_info, db))
-            else:
-                analysis_tasks.append(self._create_empty_media_result())
-        else:
-            analysis_tasks.append(self._create_empty_media_result())
+        try:
+            if text_task is not None:
+                text_result = await text_task
+            media_results = await self._collect_media_results(request.post_id, media_tasks, media_info, started_at)
+        finally:
+            for task, _ in media_tasks.values():
+                task.cancel()
+
+        image_results, image_ai_prob, image_conf = media_results.get(MediaType.IMAGE, ([], None, None))
+        video_results, video_ai_prob, video_conf = media_results.get(MediaType.VIDEO, ([], None, None))
 
-        # Execute all analyses concurrently
-        results = await asyncio.gather(*analysis_tasks)
-        text_result = results[0]
-        image_results, image_ai_prob, image_conf = results[1]
-        video_results, video_ai_prob, video_conf = results[2]
+        media_timed_out = any(item.get("status") == "timeout" for item in (*image_results, *video_results))
 
-        # Update database with analysis results
-        await self._update_post_with_results(request.post_id, text_result, image_ai_prob, image_conf, video_ai_prob, video_conf, db)
+        # Update database with analysis results. A verdict missing timed-out media is only
+        # provisional, so the post is left pending to be re-analyzed on the next request.
+        # Text-only posts skip the write: the text service has already committed the text
+        # verdict, and chat builds the detection summary on the fly while it is unset
+        if media_timed_out:
+            await self._mark_post_pending(request.post_id, db)
+        elif image_ai_prob is not None or video_ai_prob is not None:
+            await self._update_post_with_results(request.post_id, text_result, image_ai_prob, image_conf, video_ai_prob, video_conf, db)
 
         # Create and return aggregated response
         return self._create_aggregated_response(
-            request.post_id, text_result, image_results, video_results, image_ai_prob, image_conf, video_ai_prob, video_conf
+            request.post_id,
+            text_result,
+            image_results,
+            video_results,
+            image_ai_prob,
+            image_conf,
+            video_ai_prob,
+            video_conf,
+            media_timed_out=media_timed_out,
         )
 
-    async def _check_cached_results(self, post_id: str, db: AsyncSession) -> Optional[ContentDetectionResponse]:
+    def _text_decides_verdict(self, text_result: DetectResponse) -> bool:
         """
-        Check for cached detection results.
+        Check whether the text result alone settles the overall verdict.
+
+        Fusion picks the modality with the highest AI probability, so once the text
+        probability reaches ``fusion_ai_threshold`` the verdict is ``ai_slop`` whatever
+        the media scores. Media is skipped only when the text analysis is also confident
+        enough that the text-only confidence can stand in for the overall one.
+
+        Args:
+            text_result: Text analysis result
+
+        Returns:
+            True if media analysis can be skipped
+        """
+        return (
+            text_result.text_ai_probability is not None
+            and text_result.text_ai_probability >= settings.fusion_ai_threshold
+            and (text_result.text_confidence or text_result.confidence) >= settings.text_confidence_skip_threshold
+        )
+
+    async def _collect_media_results(
+        self,
+        post_id: str,
+        media_tasks: Dict[MediaType, Tuple[asyncio.Task, List[str]]],
+        media_info: Dict[str, Any],
+        started_at: float,
+    ) -> Dict[MediaType, Tuple[List[Dict[str, Any]], Optional[float], Optional[float]]]:
+        """
+        Wait for media analyses within the request's latency budget.
+
+        Analyses still running when ``media_analysis_budget_seconds`` (measured from
+        ``started_at``) runs out are cancelled and their URLs reported as timed out,
+        so one slow modality cannot hold the whole response.
+
+        The deadline is per media type rather than per URL: each modality is one
+        batched ``analyze_media_batch`` call (which dedups URLs and shares model
+        batches), and fusion needs every modality's aggregate, so there are no
+        per-URL results to consume with ``as_completed``. Skipping media on a
+        confident text verdict is handled before the tasks start (see
+        ``_text_decides_verdict``).
+
+        Args:
+            post_id: Facebook post ID
+            media_tasks: Running analysis task and its URLs, per media type
+            media_info: Database media information
+            started_at: Event loop time the analyses were started at
+
+        Returns:
+            (results, ai_probability, confidence) per media type
+        """
+        if not media_tasks:
+            return {}
+
+        timeout = None
+        if settings.media_analysis_budget_seconds > 0:
+            timeout = max(settings.media_analysis_budget_seconds - (asyncio.get_running_loop().time() - started_at), 0)
+        await asyncio.wait([task for task, _ in media_tasks.values()], timeout=timeout)
+
+        media_results = {}
+        for media_type, (task, urls) in media_tasks.items():
+            if task.done():
+                media_results[media_type] = task.result()
+                continue
+            logger.warning("Media analysis exceeded latency budget", post_id=post_id, media_type=media_type.value, count=len(urls))
+            timed_out = [
+                {
+                    "url": url,
+                    "status": "timeout",
+                    "error": "Analysis exceeded the latency budget",
+                    "media_id": media_info.get(url, {}).get("media_id"),
+                }
+                for url in urls
+            ]
+            media_results[media_type] = (timed_out, None, None)
+        return media_results
+
+    async def _load_post(self, post_id: str, db: AsyncSession) -> Optional[Post]:
+        """
+        Load a post together with its media records.
 
         Args:
             post_id: Facebook post ID
             db: Database session
 
         Returns:
-            Cached response if available, None otherwise
+            Post with media loaded, or None if it does not exist yet
         """
-        from sqlalchemy import select
-        from db.models import Post
+        result = await db.execute(select(Post).options(selectinload(Post.media), lazyload(Post.chats)).where(Post.post_id == post_id))
+        return result.scalar_one_or_none()
 
-        result = await db.execute(select(Post).where(Post.post_id == post_id))
-        post = result.scalar_one_or_none()
+    def _check_cached_results(self, post_id: str, post: Optional[Post]) -> Optional[ContentDetectionResponse]:
+        """
+        Check for cached detection results.
+
+        Args:
+            post_id: Facebook post ID
+            post: Post loaded for this request, if any
 
+        Returns:
+            Cached response if available, None otherwise
+        """
         # Return cached results if post is fully processed
         if post and post.verdict != "pending":
             logger.info(
@@ -136,30 +301,24 @@ class ContentDetectionService:
                 image_analysis=[],  # Could retrieve from post_media if needed
                 video_analysis=[],  # Could retrieve from post_media if needed
                 debug_info={"from_cache": True},
-                timestamp=datetime.now().isoformat(),
+                timestamp=datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
             )
 
         return None
 
-    async def _get_post_media_info(self, post_id: str, db: AsyncSession) -> Dict[str, Any]:
+    def _get_post_media_info(self, post_id: str, post: Optional[Post]) -> Dict[str, Any]:
         """
-        Get media information from database for the post.
+        Get media information for the post.
 
         Args:
             post_id: Facebook post ID
-            db: Database session
+            post: Post loaded with its media, if any
 
         Returns:
             Dictionary mapping URLs to media information
         """
-        from sqlalchemy import select
-        from db.models import PostMedia
-
-        result = await db.execute(select(PostMedia).where(PostMedia.post_id == post_id))
-        media_records = result.scalars().all()
-
         media_info = {}
-        for media in media_records:
+        for media in post.media if post else []:
             media_info[media.media_url] = {
                 "media_id": media.id,
                 "storage_path": media.storage_path,
@@ -173,22 +332,16 @@ class ContentDetectionService:
 
         return media_info
 
-    async def _get_video_urls_from_db(self, post_id: str, db: AsyncSession) -> List[str]:
-        """Get video URLs from database for analysis (includes yt-dlp synthetic URLs)."""
-        from sqlalchemy import select
-        from db.models import PostMedia
-
-        result = await db.execute(select(PostMedia).where(PostMedia.post_id == post_id, PostMedia.media_type == "video"))
-        media_records = result.scalars().all()
-
+    def _get_video_urls(self, post: Optional[Post]) -> List[str]:
+        """Get stored video URLs for analysis (includes yt-dlp synthetic URLs)."""
         video_urls: List[str] = []
-        for media in media_records:
-            if media.media_url:
+        for media in post.media if post else []:
+            if media.media_type == "video" and media.media_url:
                 video_urls.append(media.media_url)
 
         return video_urls
 
-    async def _analyze_text(self, request: ContentDetectionRequest, db: AsyncSession):
+    async def _analyze_text(self, request: ContentDetectionRequest, db: AsyncSession) -> DetectResponse:
         """
         Analyze text content for AI generation.
 
@@ -200,22 +353,14 @@ class ContentDetectionService:
             Text analysis result
         """
         text_request = DetectRequest(post_id=request.post_id, content=request.content, author=request.author, metadata=request.metadata)
-        return await self.text_service.detect(text_request, db)
-
-    async def _create_empty_media_result(self):
-        """
-        Create empty result for missing media type.
-
-        Returns:
-            Tuple of (empty_list, None, None)
-        """
-        await asyncio.sleep(0)  # Yield to event loop
-        return [], None, None
+        # detect() only gets here when the loaded post has no verdict, so the text
+        # service's own stored-verdict lookup would always miss
+        return await self.text_service.detect(text_request, db, use_cache=False)
 
     async def _update_post_with_results(
         self,
         post_id: str,
-        text_result: Any,
+        text_result: DetectResponse,
         image_ai_probability: Optional[float],
         image_confidence: Optional[float],
         video_ai_probability: Optional[float],
@@ -234,25 +379,26 @@ class ContentDetectionService:
             video_confidence: Average confidence for videos
             db: Database session
         """
-        from sqlalchemy import select
-        from db.models import Post
-
-        result = await db.execute(select(Post).where(Post.post_id == post_id))
-        post = result.scalar_one_or_none()
+        # Usually already in the session's identity map from _load_post or the text service
+        post = await db.get(Post, post_id)
 
         if post:
             # Update with all analysis results
             post.verdict = text_result.verdict
             post.confidence = text_result.confidence
             post.explanation = text_result.explanation
-            post.text_ai_probability = getattr(text_result, "text_ai_probability", None)
-            post.text_confidence = getattr(text_result, "text_confidence", None)
+            post.text_ai_probability = text_result.text_ai_probability
+            post.text_confidence = text_result.text_confidence
             post.image_ai_probability = image_ai_probability
             post.image_confidence = image_confidence
             post.video_ai_probability = video_ai_probability
             post.video_confidence = video_confidence
+            post.detection_summary_text = build_detection_summary(post)
+            # Answers generated for a previous analysis no longer match the verdict
+            post.prewarmed_answers = None
 
             await db.commit()
+            self.invalidate_cached_response(post_id)
 
             logger.info(
                 "Updated post with all analysis results",
@@ -265,16 +411,36 @@ class ContentDetectionService:
         else:
             logger.warning("Post not found for updating results", post_id=post_id)
 
+    async def _mark_post_pending(self, post_id: str, db: AsyncSession) -> None:
+        """
+        Leave a post pending after its media analysis timed out.
+
+        The text service has already committed the text verdict; resetting it keeps the
+        provisional result out of the stored and cached verdicts so the next request for
+        the post analyzes it again (completed media is then served from the verdict cache).
+
+        Args:
+            post_id: Facebook post ID
+            db: Database session
+        """
+        post = await db.get(Post, post_id)
+        if post:
+            post.verdict = "pending"
+            await db.commit()
+        self.invalidate_cached_response(post_id)
+        logger.info("Left post pending after media analysis timed out", post_id=post_id)
+
     def _create_aggregated_response(
         self,
         post_id: str,
-        text_result: Any,
+        text_result: DetectResponse,
         image_results: List[Dict[str, Any]],
         video_results: List[Dict[str, Any]],
         image_ai_probability: Optional[float] = None,
         image_confidence: Optional[float] = None,
         video_ai_probability: Optional[float] = None,
         video_confidence: Optional[float] = None,
+        media_timed_out: bool = False,
     ) -> ContentDetectionResponse:
         """
         Create aggregated response from all modality analyses.
@@ -288,6 +454,7 @@ class ContentDetectionService:
             image_confidence: Average confidence for images
             video_ai_probability: Average AI probability for videos
             video_confidence: Average confidence for videos
+            media_timed_out: Whether any media analysis ran past the latency budget
 
         Returns:
             Aggregated detection response
@@ -298,37 +465,35 @@ class ContentDetectionService:
         )
 
         # Count successful analyses
-        successful_images = len([r for r in image_results if r.get("status") == "success"])
-        successful_videos = len([r for r in video_results if r.get("status") == "success"])
-
-        # Build explanation
-        explanations = []
-        if text_result.explanation:
-            explanations.append(text_result.explanation)
-
-        if image_results:
-            if successful_images > 0:
-                explanations.append(f"Analyzed {successful_images} images")
-            failed_images = len(image_results) - successful_images
-            if failed_images > 0:
-                explanations.append(f"{failed_images} images failed analysis")
-
-        if video_results:
-            if successful_videos > 0:
-                explanations.append(f"Analyzed {successful_videos} videos")
-            failed_videos = len(video_results) - successful_videos
-            if failed_videos > 0:
-                explanations.append(f"{failed_videos} videos failed analysis")
+        successful_images = sum(r.get("status") == "success" for r in image_results)
+        successful_videos = sum(r.get("status") == "success" for r in video_results)
+
+        failed_images = len(image_results) - successful_images
+        failed_videos = len(video_results) - successful_videos
+
+        # Build explanation from the non-empty parts
+        explanation = " | ".join(
+            part
+            for part in (
+                text_result.explanation,
+                successful_images and f"Analyzed {successful_images} images",
+                failed_images and f"{failed_images} images failed analysis",
+                successful_videos and f"Analyzed {successful_videos} videos",
+                failed_videos and f"{failed_videos} videos failed analysis",
+            )
+            if part
+        )
 
         # Create comprehensive response
         return ContentDetectionResponse(
             post_id=post_id,
             verdict=overall_verdict,
             confidence=overall_confidence,
-            explanation=" | ".join(explanations) if explanations else "Analysis complete",
-            timestamp=datetime.utcnow().isoformat(),
-            text_ai_probability=getattr(text_result, "text_ai_probability", None),
-            text_confidence=getattr(text_result, "text_confidence", None),
+            explanation=explanation or "Analysis complete",
+            timestamp=datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            media_timed_out=media_timed_out,
+            text_ai_probability=text_result.text_ai_probability,
+            text_confidence=text_result.text_confidence,
             image_ai_probability=image_ai_probability,
             image_confidence=image_confidence,
             video_ai_probability=video_ai_probability,
@@ -349,7 +514,7 @@ class ContentDetectionService:
 
     def _calculate_overall_verdict(
         self,
-        text_result: Any,
+        text_result: DetectResponse,
         image_ai_prob: Optional[float],
         image_conf: Optional[float],
         video_ai_prob: Optional[float],
@@ -371,12 +536,12 @@ class ContentDetectionService:
         # Collect candidates as (modality, probability, confidence)
         candidates: List[Tuple[str, float, Optional[float]]] = []
 
-        if hasattr(text_result, "text_ai_probability") and text_result.text_ai_probability is not None:
+        if text_result.text_ai_probability is not None:
             candidates.append(
                 (
                     "text",
                     float(text_result.text_ai_probability),
-                    float(getattr(text_result, "text_confidence", None) or text_result.confidence),
+                    float(text_result.text_confidence or text_result.confidence),
                 )
             )
 
@@ -0,0 +1,66 @@
+"""Plain-text summary of a post's detection scores, shared by detection and chat."""
+
+import functools
+import json
+from typing import Optional
+
+from db.models import Post
+
+# The summary only depends on stored post fields, so it is memoized on those fields;
+# any change to a score or to the metadata yields a new cache key.
+
+
+@functools.lru_cache(maxsize=1024)
+def _detection_summary_for(
+    text_ai_probability: Optional[float],
+    text_confidence: Optional[float],
+    image_ai_probability: Optional[float],
+    image_confidence: Optional[float],
+    video_ai_probability: Optional[float],
+    video_confidence: Optional[float],
+    metadata_json: str,
+) -> str:
+    """Format the per-modality detection scores for inclusion in prompts."""
+    summary_parts = []
+
+    # Text detection results
+    if text_ai_probability is not None:
+        text_status = "AI-generated" if text_ai_probability > 0.5 else "Human-written"
+        summary_parts.append(
+            f"Text Analysis: {text_status} (probability: {text_ai_probability:.3f}, confidence: {text_confidence or 0:.3f})"
+        )
+
+    # Image detection results
+    if image_ai_probability is not None:
+        image_status = "AI-generated" if image_ai_probability > 0.5 else "Human-created"
+        summary_parts.append(
+            f"Image Analysis: {image_status} (probability: {image_ai_probability:.3f}, confidence: {image_confidence or 0:.3f})"
+        )
+
+    # Video detection results
+    if video_ai_probability is not None:
+        video_status = "AI-generated" if video_ai_probability > 0.5 else "Human-created"
+        summary_parts.append(
+            f"Video Analysis: {video_status} (probability: {video_ai_probability:.3f}, confidence: {video_confidence or 0:.3f})"
+        )
+
+    # Add metadata if available
+    if metadata_json:
+        summary_parts.append(f"Additional Metadata: {metadata_json}")
+
+    return "\n".join(summary_parts) if summary_parts else "No detailed detection results available"
+
+
+def build_detection_summary(post: Post) -> str:
+    """Format a post's detection scores and metadata for chat prompts."""
+    # One C-level dump instead of a per-item f-string join; the JSON string also serves as the cache key.
+    metadata_json = json.dumps(post.post_metadata, ensure_ascii=False, separators=(", ", ": "), default=str) if post.post_metadata else ""
+    return _detection_summary_for(
+        post.text_ai_probability,
+        post.text_confidence,
+        post.image_ai_probability,
+        post.image_confidence,
+        post.video_ai_probability,
+        post.video_confidence,
+        metadata_json,
+    )
@@ -1,11 +1,89 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
 
+import aiofiles
+import aiohttp
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.config import settings
+
+# Bytes read from the response per write, bounding memory per concurrent download
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+_http_session: Optional[aiohttp.ClientSession] = None
+_http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared HTTP session for media downloads, creating it on first use.
+
+    Reusing one connection pool keeps CDN connections alive across downloads instead
+    of paying a TCP/TLS handshake per file. The session is bound to the running loop.
+    """
+    global _http_session, _http_session_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=settings.media_http_pool_size,
+            limit_per_host=settings.media_http_pool_size_per_host,
+            ttl_dns_cache=300,
+        )
+        _http_session = aiohttp.ClientSession(connector=connector)
+        _http_session_loop = loop
+    return _http_session
+
+
+def ensure_media_dir(post_id: str) -> Path:
+    """Return a post's media folder, creating it if it does not exist."""
+    post_folder = settings.tmp_dir / post_id / "media"
+    post_folder.mkdir(parents=True, exist_ok=True)
+    return post_folder
+
+
+def media_file_extension(media_url: str, default: str) -> str:
+    """Return the extension of the URL's path (query and fragment ignored), or ``default``."""
+    extension = os.path.splitext(urlsplit(media_url).path)[1]
+    return extension if 1 < len(extension) <= 5 else default
+
+
+async def stream_response_to_file(resp: aiohttp.ClientResponse, local_path: Path) -> Tuple[int, str]:
+    """Write a response body to disk chunk by chunk, returning its size and SHA-256 hash.
+
+    The body goes to a ``.part`` file that replaces ``local_path`` only once it is complete,
+    so a download that fails mid-stream never leaves a truncated media file behind.
+    """
+    part_path = local_path.with_name(local_path.name + ".part")
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        async with aiofiles.open(part_path, "wb") as f:
+            async for chunk in resp.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                digest.update(chunk)
+                await f.write(chunk)
+        os.replace(part_path, local_path)
+    except BaseException:
+        # Also on cancellation; unlink synchronously so it cannot be interrupted
+        part_path.unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+async def close_http_session() -> None:
+    """Close the shared HTTP session, if one was opened."""
+    global _http_session, _http_session_loop
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+    _http_session_loop = None
+
 
 @dataclass
 class DownloadResult:
@@ -1,40 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import io
+import uuid
 from pathlib import Path
 from typing import Optional
 
+import aiohttp
 from PIL import Image
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.config import settings
-from services.downloaders.base import DownloadResult, Downloader
+from services.downloaders.base import DownloadResult, Downloader, ensure_media_dir, get_http_session, media_file_extension
+from utils.content_deduplication import deduplication_service
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+_MAX_IMAGE_BYTES = 10 * 1024 * 1024
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+
 
 class ImageDownloader(Downloader):
     async def download(self, *, post_id: str, url: str, db: AsyncSession, context: Optional[dict] = None) -> DownloadResult:
         try:
             # Check registry/DB for existing local file handled by pipeline; here we only download
-            import asyncio
-            from ml.clipbased.impl.utils import download_image_from_url
-            from utils.content_deduplication import deduplication_service
-
             logger.info("Downloading image", url=url[:100] + "..." if len(url) > 100 else url)
 
-            pil_image = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: download_image_from_url(url, max_size=10 * 1024 * 1024, timeout=30)
-            )
-
-            # Convert/validate
-            if pil_image.mode in ("RGBA", "LA", "P"):
-                rgb_img = Image.new("RGB", pil_image.size, (255, 255, 255))
-                if pil_image.mode == "P":
-                    pil_image = pil_image.convert("RGBA")
-                rgb_img.paste(pil_image, mask=pil_image.split()[-1] if pil_image.mode in ("RGBA", "LA") else None)
-                pil_image = rgb_img
+            content = await self._fetch(url)
+            pil_image = await asyncio.to_thread(self._decode_rgb, content)
 
             max_size = 4096
             if pil_image.width > max_size or pil_image.height > max_size:
@@ -47,12 +42,10 @@ class ImageDownloader(Downloader):
 
             content_hash = await deduplication_service.calculate_content_hash(data)
 
-            # Persist to local storage
-            post_dir = settings.tmp_dir / post_id / "media"
-            post_dir.mkdir(parents=True, exist_ok=True)
+            # Persist to local storage off the event loop (tmp_dir is GCS Fuse-backed)
             # Reuse path generation from content_detection_service._get_local_file_path style
-            local_path = self._get_local_file_path(post_id, url, "image")
-            local_path.write_bytes(data)
+            local_path = await asyncio.to_thread(self._get_local_file_path, post_id, url, "image")
+            await asyncio.to_thread(local_path.write_bytes, data)
 
             logger.info("Image saved locally", path=str(local_path), size_bytes=len(data))
             return DownloadResult(
@@ -65,22 +58,40 @@ class ImageDownloader(Downloader):
             logger.error("Image download failed", url=url[:100], error=str(e), exc_info=True)
             return DownloadResult(local_path=None, mime_type=None)
 
-    def _get_local_file_path(self, post_id: str, media_url: str, media_type: str) -> Path:
-        import hashlib
-        import uuid
+    async def _fetch(self, url: str) -> bytes:
+        """Download an image over the shared connection pool, enforcing the size limit."""
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with get_http_session().get(url, headers=_HEADERS, timeout=timeout) as resp:
+            resp.raise_for_status()
+            if resp.content_length and resp.content_length > _MAX_IMAGE_BYTES:
+                raise ValueError(f"Image too large: {resp.content_length} bytes (max: {_MAX_IMAGE_BYTES})")
+
+            chunks = []
+            size = 0
+            async for chunk in resp.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > _MAX_IMAGE_BYTES:
+                    raise ValueError(f"Image too large: {size} bytes (max: {_MAX_IMAGE_BYTES})")
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _decode_rgb(content: bytes) -> Image.Image:
+        """Decode image bytes to RGB, flattening any transparency onto white."""
+        image = Image.open(io.BytesIO(content))
+        if image.mode == "P":
+            image = image.convert("RGBA")
+        if image.mode in ("RGBA", "LA"):
+            rgb_img = Image.new("RGB", image.size, (255, 255, 255))
+            rgb_img.paste(image, mask=image.split()[-1])
+            return rgb_img
+        return image.convert("RGB")
 
-        post_folder = settings.tmp_dir / post_id / "media"
-        post_folder.mkdir(parents=True, exist_ok=True)
+    def _get_local_file_path(self, post_id: str, media_url: str, media_type: str) -> Path:
+        post_folder = ensure_media_dir(post_id)
 
         url_hash = hashlib.md5(media_url.encode()).hexdigest()[:8]
         unique_id = str(uuid.uuid4())[:8]
-        extension = ".jpg"
-        if "." in media_url.split("/")[-1]:
-            try:
-                url_ext = "." + media_url.split(".")[-1].split("?")[0]
-                if len(url_ext) <= 5:
-                    extension = url_ext
-            except (ValueError, IndexError):
-                pass
+        extension = media_file_extension(media_url, ".jpg")
         filename = f"{url_hash}_{unique_id}{extension}"
         return post_folder / filename
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import uuid
 from pathlib import Path
 from typing import Optional
 
@@ -7,8 +10,16 @@ import aiohttp
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
-from services.downloaders.base import DownloadResult, Downloader
+from services.downloaders.base import (
+    DownloadResult,
+    Downloader,
+    ensure_media_dir,
+    get_http_session,
+    media_file_extension,
+    stream_response_to_file,
+)
 from services.ytdlp_video_service import YtDlpVideoService
+from utils.content_deduplication import deduplication_service
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -20,8 +31,6 @@ class VideoDownloader(Downloader):
 
     async def download(self, *, post_id: str, url: str, db: AsyncSession, context: Optional[dict] = None) -> DownloadResult:
         try:
-            from utils.content_deduplication import deduplication_service
-
             # Explicit yt-dlp directive item
             if url.startswith("yt-dlp://"):
                 post_url = (context or {}).get("post_url") if context else None
@@ -30,7 +39,7 @@ class VideoDownloader(Downloader):
                     return DownloadResult(local_path=None, mime_type=None)
                 video_path = await self.ytdlp.download_with_retry(post_url, post_id)
                 if video_path and video_path.exists():
-                    content_hash = await deduplication_service.calculate_content_hash(video_path.read_bytes())
+                    content_hash = await deduplication_service.calculate_file_hash(video_path)
                     return DownloadResult(local_path=video_path, mime_type="video/mp4", content_hash=content_hash)
                 return DownloadResult(local_path=None, mime_type=None)
 
@@ -39,7 +48,7 @@ class VideoDownloader(Downloader):
                 filename = url.split("/")[-1]
                 local_path = settings.tmp_dir / post_id / "media" / filename
                 if local_path.exists():
-                    content_hash = await deduplication_service.calculate_content_hash(local_path.read_bytes())
+                    content_hash = await deduplication_service.calculate_file_hash(local_path)
                     return DownloadResult(
                         local_path=local_path,
                         mime_type="video/mp4",
@@ -59,29 +68,27 @@ class VideoDownloader(Downloader):
                     "Referer": "https://www.facebook.com/",
                 }
                 timeout = aiohttp.ClientTimeout(total=120)
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.get(url, headers=headers) as resp:
-                        if resp.status in (200, 206):
-                            data = await resp.read()
-                            ctype = resp.headers.get("content-type", "").lower()
-                            if len(data) >= 1024 and ctype.startswith("video/"):
-                                mime_type = ctype or "video/mp4"
-                                local_path = self._get_local_file_path(post_id, url, "video")
-                                local_path.write_bytes(data)
-                                content_hash = await deduplication_service.calculate_content_hash(data)
-                                return DownloadResult(
-                                    local_path=local_path,
-                                    mime_type=mime_type,
-                                    content_hash=content_hash,
-                                    normalized_url=deduplication_service.normalize_facebook_url(url),
-                                )
+                async with get_http_session().get(url, headers=headers, timeout=timeout) as resp:
+                    ctype = resp.headers.get("content-type", "").lower()
+                    if resp.status in (200, 206) and ctype.startswith("video/"):
+                        mime_type = ctype or "video/mp4"
+                        local_path = await asyncio.to_thread(self._get_local_file_path, post_id, url, "video")
+                        size, content_hash = await stream_response_to_file(resp, local_path)
+                        if size >= 1024:
+                            return DownloadResult(
+                                local_path=local_path,
+                                mime_type=mime_type,
+                                content_hash=content_hash,
+                                normalized_url=deduplication_service.normalize_facebook_url(url),
+                            )
+                        await asyncio.to_thread(local_path.unlink, missing_ok=True)
 
             # Fallback to yt-dlp using post URL if provided
             post_url = (context or {}).get("post_url") if context else None
             if post_url:
                 video_path = await self.ytdlp.download_with_retry(post_url, post_id)
                 if video_path and video_path.exists():
-                    content_hash = await deduplication_service.calculate_content_hash(video_path.read_bytes())
+                    content_hash = await deduplication_service.calculate_file_hash(video_path)
                     return DownloadResult(local_path=video_path, mime_type="video/mp4", content_hash=content_hash)
 
             return DownloadResult(local_path=None, mime_type=None)
@@ -90,21 +97,10 @@ class VideoDownloader(Downloader):
             return DownloadResult(local_path=None, mime_type=None)
 
     def _get_local_file_path(self, post_id: str, media_url: str, media_type: str) -> Path:
-        import hashlib
-        import uuid
-
-        post_folder = settings.tmp_dir / post_id / "media"
-        post_folder.mkdir(parents=True, exist_ok=True)
+        post_folder = ensure_media_dir(post_id)
 
         url_hash = hashlib.md5(media_url.encode()).hexdigest()[:8]
         unique_id = str(uuid.uuid4())[:8]
-        extension = ".mp4"
-        if "." in media_url.split("/")[-1]:
-            try:
-                url_ext = "." + media_url.split(".")[-1].split("?")[0]
-                if len(url_ext) <= 5:
-                    extension = url_ext
-            except (ValueError, IndexError):
-                pass
+        extension = media_file_extension(media_url, ".mp4")
         filename = f"{url_hash}_{unique_id}{extension}"
         return post_folder / filename
@@ -3,6 +3,7 @@ from typing import List, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db.async_session import get_async_session
 from services.gemini_recovery_service import gemini_recovery_service
 from utils.logging import get_logger
 
@@ -86,6 +87,60 @@ class GeminiOnDemandService:
 
         return uris
 
+    async def batch_ensure_gemini_uris_detached(self, post_id: str, media_urls: List[str]) -> List[str]:
+        """
+        Ensure Gemini URIs exist for multiple media files without holding a session during uploads.
+
+        Stored URIs and storage paths are read in one short session and the new URIs are written in
+        another, so slow uploads never pin a pooled database connection.
+        """
+        from db.models import PostMedia
+
+        async with get_async_session() as db:
+            result = await db.execute(
+                select(PostMedia.media_url, PostMedia.gemini_file_uri, PostMedia.storage_path, PostMedia.media_type)
+                .where(PostMedia.post_id == post_id)
+                .where(PostMedia.media_url.in_(media_urls))
+            )
+            rows = {media_url: (gemini_uri, storage_path, media_type) for media_url, gemini_uri, storage_path, media_type in result.all()}
+
+        uris = []
+        uploaded = {}
+        for url in media_urls:
+            if url not in rows:
+                logger.warning("Media not found in database", post_id=post_id, media_url=url)
+                continue
+            gemini_uri, storage_path, media_type = rows[url]
+            if not gemini_uri and storage_path:
+                try:
+                    mime_type = self._get_mime_type_from_media_type(media_type)
+                    display_name = f"{media_type}_{post_id}_{hash(url) % 10000}"
+                    gemini_uri = await gemini_recovery_service._upload_to_gemini_from_storage(storage_path, mime_type, display_name)
+                except Exception as e:
+                    logger.error("Error in on-demand Gemini upload", post_id=post_id, media_url=url, error=str(e))
+                    gemini_uri = None
+                if gemini_uri:
+                    uploaded[url] = gemini_uri
+            elif not gemini_uri:
+                logger.warning("No storage path available for on-demand upload", post_id=post_id, media_url=url)
+            if gemini_uri:
+                uris.append(gemini_uri)
+
+        if uploaded:
+            async with get_async_session() as db:
+                for url, gemini_uri in uploaded.items():
+                    await db.execute(
+                        PostMedia.__table__.update()
+                        .where(PostMedia.post_id == post_id)
+                        .where(PostMedia.media_url == url)
+                        .values(gemini_file_uri=gemini_uri)
+                    )
+                await db.commit()
+
+        logger.info("Batch on-demand Gemini upload completed", post_id=post_id, requested_count=len(media_urls), successful_count=len(uris))
+
+        return uris
+
     def _get_mime_type_from_media_type(self, media_type: str) -> str:
         """Convert media type to MIME type."""
         type_mapping = {"image": "image/jpeg", "video": "video/mp4"}
@@ -52,7 +52,7 @@ class ImageDetectionService:
                 # Try ClipBased first
                 from ml.clipbased import ClipBasedImageDetector
 
-                return ClipBasedImageDetector(), "clipbased"
+                return ClipBasedImageDetector(precision=settings.image_precision), "clipbased"
             elif model_name == "ssp":
                 # Try SSP detector
                 try:
@@ -65,7 +65,7 @@ class ImageDetectionService:
                     )
                     from ml.clipbased import ClipBasedImageDetector
 
-                    return ClipBasedImageDetector(), "clipbased"
+                    return ClipBasedImageDetector(precision=settings.image_precision), "clipbased"
             else:
                 raise ValueError(f"Unknown model: {model_name}")
         except ImportError as e:
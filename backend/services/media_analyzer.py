@@ -1,11 +1,15 @@
 """Unified media analyzer architecture for image and video detection."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from enum import Enum
+from urllib.parse import urlparse
 
+from core.config import settings
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -71,6 +75,7 @@ class MediaFile:
     media_type: MediaType = MediaType.IMAGE
     media_id: Optional[str] = None
     post_id: Optional[str] = None
+    content_hash: Optional[str] = None
 
     @property
     def has_local_file(self) -> bool:
@@ -104,6 +109,21 @@ class MediaAnalyzer(ABC):
         """
         pass
 
+    async def analyze_batch(self, media_files: List[MediaFile]) -> List[AnalysisResult]:
+        """
+        Analyze several media files, returning results in the same order.
+
+        Analyzers whose model can score a stacked batch override this; the default
+        analyzes each file in turn.
+
+        Args:
+            media_files: Media files to analyze
+
+        Returns:
+            One analysis result per media file
+        """
+        return [await self.analyze(media_file) for media_file in media_files]
+
     @abstractmethod
     def get_supported_formats(self) -> List[str]:
         """
@@ -144,6 +164,81 @@ class MediaAnalyzer(ABC):
         self._detector = None
 
 
+class ImageBatcher:
+    """
+    Coalesce image detections from concurrent requests into shared forward passes.
+
+    Callers queue image paths and await their own results; a single worker task
+    drains the queue into batches of up to ``image_batch_max_size``, waiting up to
+    ``image_batch_wait_ms`` for more images when the queue runs short, and scores
+    each batch with one ``detect_batch`` call in a worker thread. The worker starts
+    on first use and is bound to the event loop that started it.
+    """
+
+    def __init__(self, detect_batch: Callable[[List[str]], List[Dict[str, Any]]]):
+        self._detect_batch = detect_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def detect(self, image_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Score images, sharing forward passes with any other queued images.
+
+        Args:
+            image_paths: Paths of the images to score
+
+        Returns:
+            One detection result per image, in input order; failed images carry an ``error`` key
+        """
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(self._queue))
+
+        futures = []
+        for image_path in image_paths:
+            future = loop.create_future()
+            self._queue.put_nowait((image_path, future))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """Worker loop: collect a batch, score it, resolve each caller's future."""
+        batch: List[Tuple[str, asyncio.Future]] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                max_size = max(settings.image_batch_max_size, 1)
+                if queue.qsize() + 1 < max_size and settings.image_batch_wait_ms > 0:
+                    # Give other in-flight requests a moment to add their images
+                    await asyncio.sleep(settings.image_batch_wait_ms / 1000)
+                while len(batch) < max_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                try:
+                    results = await asyncio.to_thread(self._detect_batch, [image_path for image_path, _ in batch])
+                except Exception as e:
+                    logger.error("Error analyzing image batch", count=len(batch), error=str(e), exc_info=True)
+                    results = [{"error": str(e)}] * len(batch)
+
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+        except asyncio.CancelledError:
+            # Never leave a caller waiting on a stopped worker
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for _, future in batch:
+                future.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Cancel the worker task; queued callers are cancelled with it."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+
 class ImageAnalyzer(MediaAnalyzer):
     """Analyzer for image AI detection using ClipBased."""
 
@@ -164,7 +259,8 @@ class ImageAnalyzer(MediaAnalyzer):
         try:
             from ml.clipbased import ClipBasedImageDetector
 
-            self._detector = ClipBasedImageDetector()
+            self._detector = ClipBasedImageDetector(precision=settings.image_precision)
+            self._batcher = ImageBatcher(self._detector.detect_batch)
             logger.info("Initialized ClipBased image detector")
         except ImportError as e:
             logger.error("Failed to import ClipBased detector", error=str(e))
@@ -186,29 +282,67 @@ class ImageAnalyzer(MediaAnalyzer):
             )
 
         try:
-            import time
-
             start_time = time.time()
 
-            # Run ClipBased detection
-            detection_result = self._detector.detect_image(str(media_file.local_path))
+            # Run ClipBased detection in a worker thread so the event loop keeps serving requests
+            detection_result = await asyncio.to_thread(self._detector.detect_image, str(media_file.local_path))
 
             processing_time = time.time() - start_time
 
-            return AnalysisResult(
-                is_ai_generated=detection_result.get("is_ai_generated", False),
-                ai_probability=detection_result.get("probability", 0.5),
-                confidence=detection_result.get("confidence", 0.0),
-                model_used=detection_result.get("model_used", "clipbased"),
-                processing_time=processing_time,
-                llr_score=detection_result.get("llr_score"),
-                metadata=detection_result.get("metadata", {}),
-            )
+            return self._to_analysis_result(detection_result, processing_time)
 
         except Exception as e:
             logger.error("Error analyzing image", file=str(media_file.local_path), error=str(e), exc_info=True)
             return AnalysisResult(is_ai_generated=None, ai_probability=None, confidence=0.0, model_used=self.model_name, error=str(e))
 
+    async def analyze_batch(self, media_files: List[MediaFile]) -> List[AnalysisResult]:
+        """
+        Analyze several images with batched ClipBased forward passes.
+
+        Images go through the shared ``ImageBatcher``, so a post's images share forward
+        passes with each other and with images from concurrent requests. Images in a
+        batch that fails (e.g. one unreadable file) are retried individually, so a bad
+        image only fails itself.
+
+        Args:
+            media_files: Image files information
+
+        Returns:
+            One analysis result per image, in input order
+        """
+        results: List[Optional[AnalysisResult]] = [None] * len(media_files)
+        local = [i for i, media_file in enumerate(media_files) if media_file.has_local_file]
+
+        if local:
+            try:
+                detection_results = await self._batcher.detect([str(media_files[i].local_path) for i in local])
+            except Exception as e:
+                logger.error("Error analyzing image batch", count=len(local), error=str(e), exc_info=True)
+                detection_results = [{"error": str(e)}] * len(local)
+
+            for i, detection_result in zip(local, detection_results):
+                if "error" not in detection_result:
+                    results[i] = self._to_analysis_result(detection_result, detection_result.get("processing_time"))
+
+        # Missing files report their own error; failed batches fall back to per-image analysis
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = await self.analyze(media_files[i])
+
+        return results
+
+    def _to_analysis_result(self, detection_result: Dict[str, Any], processing_time: Optional[float]) -> AnalysisResult:
+        """Convert a ClipBased detection result into an AnalysisResult."""
+        return AnalysisResult(
+            is_ai_generated=detection_result.get("is_ai_generated", False),
+            ai_probability=detection_result.get("probability", 0.5),
+            confidence=detection_result.get("confidence", 0.0),
+            model_used=detection_result.get("model_used", "clipbased"),
+            processing_time=processing_time,
+            llr_score=detection_result.get("llr_score"),
+            metadata=detection_result.get("metadata", {}),
+        )
+
     def get_supported_formats(self) -> List[str]:
         """Get supported image formats."""
         return [".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".webp"]
@@ -232,6 +366,11 @@ class ImageAnalyzer(MediaAnalyzer):
 
         return True
 
+    def cleanup(self):
+        """Stop the batching worker and release the detector."""
+        self._batcher.stop()
+        super().cleanup()
+
 
 class VideoAnalyzer(MediaAnalyzer):
     """Analyzer for video AI detection using SlowFast."""
@@ -253,7 +392,7 @@ class VideoAnalyzer(MediaAnalyzer):
         try:
             from ml.slowfast import AIVideoDetector, VideoPreprocessor
 
-            self._detector = AIVideoDetector(model_name=self.model_name, device=self.device)
+            self._detector = AIVideoDetector(model_name=self.model_name, device=self.device, precision=settings.video_precision)
             self._preprocessor = VideoPreprocessor()
             logger.info("Initialized SlowFast video detector", model=self.model_name)
         except ImportError as e:
@@ -276,32 +415,104 @@ class VideoAnalyzer(MediaAnalyzer):
             )
 
         try:
-            import time
-
             start_time = time.time()
 
-            # Preprocess video
-            slowfast_input, _ = self._preprocessor.process_video(media_file.local_path)
-
-            # Run SlowFast detection
-            raw_result = self._detector.predict(slowfast_input)
+            # Preprocess video and run SlowFast detection in worker threads so the event loop keeps serving requests
+            slowfast_input, _ = await asyncio.to_thread(self._preprocessor.process_video, media_file.local_path)
+            raw_result = await asyncio.to_thread(self._detector.predict, slowfast_input)
 
             processing_time = time.time() - start_time
 
-            return AnalysisResult(
-                is_ai_generated=raw_result.get("is_ai_generated", False),
-                ai_probability=raw_result.get("ai_probability", 0.5),
-                confidence=raw_result.get("confidence", 0.0),
-                model_used=raw_result.get("model_used", self.model_name),
-                processing_time=processing_time,
-                predictions=raw_result.get("predictions"),
-                metadata=raw_result.get("metadata", {}),
-            )
+            return self._to_analysis_result(raw_result, processing_time)
 
         except Exception as e:
             logger.error("Error analyzing video", file=str(media_file.local_path), error=str(e), exc_info=True)
             return AnalysisResult(is_ai_generated=None, ai_probability=None, confidence=0.0, model_used=self.model_name, error=str(e))
 
+    async def analyze_batch(self, media_files: List[MediaFile]) -> List[AnalysisResult]:
+        """
+        Analyze several videos, decoding them concurrently and batching SlowFast inference.
+
+        Frame extraction dominates wall time, so every video is decoded in its own
+        worker thread; the decoded clips are then scored ``video_batch_size`` at a
+        time in one forward pass each.
+
+        Args:
+            media_files: Video files information
+
+        Returns:
+            One analysis result per video, in input order
+        """
+        results: List[Optional[AnalysisResult]] = [None] * len(media_files)
+        local = [i for i, media_file in enumerate(media_files) if media_file.has_local_file]
+
+        decoded = await asyncio.gather(*(self._decode(media_files[i].local_path) for i in local), return_exceptions=True)
+
+        ready: List[Tuple[int, List[Any], float]] = []
+        for i, outcome in zip(local, decoded):
+            # gather() hands back a cancelled decode as a result; propagate it instead of
+            # reporting the video as failed
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                logger.error("Error analyzing video", file=str(media_files[i].local_path), error=str(outcome))
+                results[i] = AnalysisResult(
+                    is_ai_generated=None, ai_probability=None, confidence=0.0, model_used=self.model_name, error=str(outcome)
+                )
+            else:
+                ready.append((i, *outcome))
+
+        batch_size = max(settings.video_batch_size, 1)
+        for start in range(0, len(ready), batch_size):
+            chunk = ready[start : start + batch_size]
+            start_time = time.time()
+            try:
+                raw_results = await asyncio.to_thread(self._detector.predict_batch, [slowfast_input for _, slowfast_input, _ in chunk])
+            except Exception as e:
+                # Fall back to scoring this chunk's clips one at a time
+                logger.warning("Batched video inference failed, scoring individually", count=len(chunk), error=str(e))
+                continue
+            inference_time = (time.time() - start_time) / len(chunk)
+            for (i, _, decode_time), raw_result in zip(chunk, raw_results):
+                results[i] = self._to_analysis_result(raw_result, decode_time + inference_time)
+
+        for i, slowfast_input, decode_time in ready:
+            if results[i] is None:
+                start_time = time.time()
+                try:
+                    raw_result = await asyncio.to_thread(self._detector.predict, slowfast_input)
+                    results[i] = self._to_analysis_result(raw_result, decode_time + time.time() - start_time)
+                except Exception as e:
+                    logger.error("Error analyzing video", file=str(media_files[i].local_path), error=str(e), exc_info=True)
+                    results[i] = AnalysisResult(
+                        is_ai_generated=None, ai_probability=None, confidence=0.0, model_used=self.model_name, error=str(e)
+                    )
+
+        # Missing files report their own error
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = await self.analyze(media_files[i])
+
+        return results
+
+    async def _decode(self, video_path: Path) -> Tuple[List[Any], float]:
+        """Decode and preprocess a video in a worker thread, returning (slowfast_input, seconds taken)."""
+        start_time = time.time()
+        slowfast_input, _ = await asyncio.to_thread(self._preprocessor.process_video, video_path)
+        return slowfast_input, time.time() - start_time
+
+    def _to_analysis_result(self, raw_result: Dict[str, Any], processing_time: float) -> AnalysisResult:
+        """Convert a SlowFast detection result into an AnalysisResult."""
+        return AnalysisResult(
+            is_ai_generated=raw_result.get("is_ai_generated", False),
+            ai_probability=raw_result.get("ai_probability", 0.5),
+            confidence=raw_result.get("confidence", 0.0),
+            model_used=raw_result.get("model_used", self.model_name),
+            processing_time=processing_time,
+            predictions=raw_result.get("predictions"),
+            metadata=raw_result.get("metadata", {}),
+        )
+
     def get_supported_formats(self) -> List[str]:
         """Get supported video formats."""
         return [".mp4", ".avi", ".mov", ".webm", ".mkv", ".flv"]
@@ -329,10 +540,13 @@ class VideoAnalyzer(MediaAnalyzer):
 class MediaAnalyzerFactory:
     """Factory for creating media analyzers."""
 
-    @staticmethod
-    def create_analyzer(media_type: MediaType, model_name: Optional[str] = None) -> MediaAnalyzer:
+    # Analyzers load model weights on construction, so one is kept per (type, model) for the process
+    _analyzers: Dict[Tuple[MediaType, str], MediaAnalyzer] = {}
+
+    @classmethod
+    def create_analyzer(cls, media_type: MediaType, model_name: Optional[str] = None) -> MediaAnalyzer:
         """
-        Create appropriate analyzer for media type.
+        Get the shared analyzer for a media type, creating it on first use.
 
         Args:
             media_type: Type of media (IMAGE or VIDEO)
@@ -342,12 +556,27 @@ class MediaAnalyzerFactory:
             Configured media analyzer
         """
         if media_type == MediaType.IMAGE:
-            return ImageAnalyzer(model_name or "clipbased")
+            key = (media_type, model_name or "clipbased")
+            analyzer_class = ImageAnalyzer
         elif media_type == MediaType.VIDEO:
-            return VideoAnalyzer(model_name or "slowfast_r50")
+            key = (media_type, model_name or "slowfast_r50")
+            analyzer_class = VideoAnalyzer
         else:
             raise ValueError(f"Unsupported media type: {media_type}")
 
+        analyzer = cls._analyzers.get(key)
+        if analyzer is None:
+            analyzer = analyzer_class(key[1])
+            cls._analyzers[key] = analyzer
+        return analyzer
+
+    @classmethod
+    def cleanup(cls) -> None:
+        """Release every shared analyzer (called at application shutdown)."""
+        for analyzer in cls._analyzers.values():
+            analyzer.cleanup()
+        cls._analyzers.clear()
+
     @staticmethod
     def create_from_url(url: str, model_name: Optional[str] = None) -> MediaAnalyzer:
         """
@@ -361,8 +590,6 @@ class MediaAnalyzerFactory:
             Appropriate media analyzer
         """
         # Extract extension from URL
-        from urllib.parse import urlparse
-
         path = urlparse(url).path
         extension = Path(path).suffix.lower()
 
@@ -12,6 +12,7 @@ from services.downloaders.image_downloader import ImageDownloader
 from services.downloaders.video_downloader import VideoDownloader
 from services.gemini_uploader import GeminiUploader
 from services.media_repo import MediaRepo
+from utils.content_deduplication import deduplication_service
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -51,8 +52,6 @@ class MediaPipeline:
         # Optional: find duplicate content by URL mapping for reuse
         duplicates: Dict[str, str] = {}
         try:
-            from utils.content_deduplication import deduplication_service
-
             all_urls = [item.url for item in items]
             duplicates = await deduplication_service.find_duplicate_content(post_id, all_urls, db)
             if duplicates:
@@ -64,14 +63,14 @@ class MediaPipeline:
             url = item.url
             media_type = item.media_type
             try:
-                # Registry: already processed?
-                if media_registry.is_already_processed(post_id, url, "downloaded"):
-                    existing = media_registry.get_processed_media_info(post_id, url)
-                    if existing and existing.storage_path:
+                # Registry: already processed? (one lookup serves every stage check)
+                existing = media_registry.get_processed_media_info(post_id, url)
+                if existing and existing.has_reached_stage("downloaded"):
+                    if existing.storage_path:
                         storage_path = existing.storage_path
                         gemini_uri = None
                         # Ensure Gemini existing
-                        if media_registry.is_already_processed(post_id, url, "uploaded") and existing.gemini_uri:
+                        if existing.has_reached_stage("uploaded") and existing.gemini_uri:
                             gemini_uri = existing.gemini_uri
                         else:
                             gemini_uri = await self._ensure_gemini(post_id, url, Path(storage_path), media_type, db, index)
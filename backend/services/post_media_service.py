@@ -8,6 +8,7 @@ from sqlalchemy.dialects.postgresql import insert
 from db.models import Post
 from schemas.content_detection import ContentDetectionRequest, ContentDetectionResponse
 from services.media_pipeline import MediaPipeline, MediaItem
+from services.media_repo import MediaRepo
 from utils.logging import get_logger
 
 
@@ -54,6 +55,8 @@ class PostMediaService:
                 content=stmt.excluded.content,
                 author=stmt.excluded.author,
                 post_metadata=stmt.excluded.post_metadata,
+                # Metadata feeds the stored chat detection summary; rebuilt on the next analysis
+                detection_summary_text=None,
                 updated_at=stmt.excluded.updated_at,
             ),
         )
@@ -70,8 +73,6 @@ class PostMediaService:
 
         # Always process media if we have URLs or if post has videos
         if incoming_urls or request.has_videos:
-            from services.media_repo import MediaRepo
-
             repo = MediaRepo()
 
             items = [MediaItem(url=u, media_type="image") for u in (request.image_urls or [])]
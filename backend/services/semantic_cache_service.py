@@ -0,0 +1,89 @@
+"""Redis-backed semantic cache for chat replies to near-duplicate questions."""
+
+import asyncio
+import json
+from typing import List, Optional
+
+import google.generativeai as genai
+import numpy as np
+import redis.asyncio as redis
+
+from core.config import settings
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_EMBEDDING_MODEL = "models/text-embedding-004"
+
+
+class SemanticCacheService:
+    """
+    Cache chat replies per post and answer questions that embed close to a cached one.
+
+    Entries live in one Redis list per (post, context) key, so a lookup is a single
+    LRANGE plus a cosine scan over at most ``chat_semantic_cache_max_entries`` vectors.
+    Redis or embedding failures are treated as cache misses and never fail a chat.
+    """
+
+    def __init__(self):
+        self._redis: Optional[redis.Redis] = None
+
+    def _client(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+        return self._redis
+
+    @staticmethod
+    def _key(post_id: str, context_key: str) -> str:
+        return f"chat:semcache:{post_id}:{context_key}"
+
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed a question as a unit vector, or None if embedding fails."""
+        try:
+            result = await asyncio.wait_for(
+                genai.embed_content_async(model=_EMBEDDING_MODEL, content=text, task_type="semantic_similarity"),
+                timeout=settings.gemini_timeout_seconds,
+            )
+        except Exception as e:
+            logger.warning("Failed to embed chat question for semantic cache", error=str(e))
+            return None
+        vector = np.asarray(result["embedding"], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    async def lookup(self, post_id: str, context_key: str, embedding: np.ndarray) -> Optional[str]:
+        """Return the cached reply whose question is most similar, if above the threshold."""
+        try:
+            raw_entries: List[str] = await self._client().lrange(self._key(post_id, context_key), 0, -1)
+        except Exception as e:
+            logger.warning("Semantic cache lookup failed", post_id=post_id, error=str(e))
+            return None
+        if not raw_entries:
+            return None
+
+        entries = [json.loads(raw) for raw in raw_entries]
+        vectors = np.asarray([entry["vec"] for entry in entries], dtype=np.float32)
+        scores = vectors @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < settings.chat_semantic_cache_threshold:
+            return None
+
+        logger.info("Semantic cache hit", post_id=post_id, similarity=float(scores[best]))
+        return entries[best]["response"]
+
+    async def store(self, post_id: str, context_key: str, embedding: np.ndarray, response: str) -> None:
+        """Cache a reply for a question, keeping the newest entries per post."""
+        key = self._key(post_id, context_key)
+        entry = json.dumps({"vec": embedding.tolist(), "response": response})
+        try:
+            async with self._client().pipeline(transaction=False) as pipe:
+                pipe.lpush(key, entry)
+                pipe.ltrim(key, 0, settings.chat_semantic_cache_max_entries - 1)
+                pipe.expire(key, settings.chat_semantic_cache_ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Semantic cache store failed", post_id=post_id, error=str(e))
+
+
+# Global instance
+semantic_cache_service = SemanticCacheService()
@@ -1,8 +1,13 @@
 """Text content AI detection service with singleton, concurrency limits, and retries."""
 
 import asyncio
+import hashlib
+import os
+import random
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -23,6 +28,8 @@ class TextDetectionService:
         """Initialize the text detection service."""
         self.request_counter = 0
         self._sem = asyncio.Semaphore(settings.text_max_concurrency)
+        # Analyses by normalized content hash: key -> (stored_at, analysis), oldest first
+        self._analysis_cache: "OrderedDict[str, Tuple[float, Tuple[str, float, str, float, float]]]" = OrderedDict()
         self.ai_indicators = [
             "it is important to note",
             "in conclusion",
@@ -59,6 +66,7 @@ class TextDetectionService:
         self,
         request: DetectRequest,
         db: AsyncSession,
+        use_cache: bool = True,
     ) -> DetectResponse:
         """
         Detect if text content is AI-generated.
@@ -66,6 +74,8 @@ class TextDetectionService:
         Args:
             request: Detection request with content and post ID
             db: Database session
+            use_cache: Return the post's stored verdict if it has one; callers that
+                have already checked the post pass False to skip the lookup
 
         Returns:
             Detection response with verdict and confidence
@@ -73,29 +83,64 @@ class TextDetectionService:
         self.request_counter += 1
 
         # Check for existing complete results
-        cached_result = await self._get_cached_result(request.post_id, db)
-        if cached_result:
-            logger.info("Returning cached result", post_id=request.post_id)
-            return self._create_response_from_post(cached_result, from_cache=True)
-
-        # Perform detection with concurrency limit + retry
-        async def _run_analysis():
-            return self._analyze_content(request.content)
-
-        async for attempt in AsyncRetrying(
-            stop=stop_after_attempt(settings.detection_retry_max_attempts),
-            wait=wait_exponential(multiplier=settings.detection_retry_backoff_base, min=0.5, max=6),
-            reraise=True,
-        ):
-            with attempt:
-                async with self._sem:
-                    verdict, confidence, explanation, ai_probability, analysis_confidence = await _run_analysis()
+        if use_cache:
+            cached_result = await self._get_cached_result(request.post_id, db)
+            if cached_result:
+                logger.info("Returning cached result", post_id=request.post_id)
+                return self._create_response_from_post(cached_result, from_cache=True)
+
+        # Reposted or copy-pasted content reuses the analysis of its first occurrence
+        content_key = self._content_key(request.content)
+        analysis = self._get_cached_analysis(content_key)
+        if analysis is None:
+            # Perform detection with concurrency limit + retry
+            async def _run_analysis():
+                return self._analyze_content(request.content)
+
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(settings.detection_retry_max_attempts),
+                wait=wait_exponential(multiplier=settings.detection_retry_backoff_base, min=0.5, max=6),
+                reraise=True,
+            ):
+                with attempt:
+                    async with self._sem:
+                        analysis = await _run_analysis()
+            self._cache_analysis(content_key, analysis)
+        verdict, confidence, explanation, ai_probability, analysis_confidence = analysis
 
         # Save to database
         post = await self._save_to_database(request, verdict, confidence, explanation, ai_probability, analysis_confidence, db)
 
         return self._create_response_from_post(post, from_cache=False)
 
+    @staticmethod
+    def _content_key(content: str) -> str:
+        # Analysis is case-insensitive, so case and surrounding whitespace do not change it
+        return hashlib.blake2b(content.strip().lower().encode(), digest_size=16).hexdigest()
+
+    def _get_cached_analysis(self, content_key: str) -> Optional[Tuple[str, float, str, float, float]]:
+        """Get a recent analysis of the same content, if any."""
+        if self._is_testing_mode():
+            return None
+        entry = self._analysis_cache.get(content_key)
+        if entry is None:
+            return None
+        stored_at, analysis = entry
+        if time.monotonic() - stored_at > settings.text_analysis_cache_ttl_seconds:
+            del self._analysis_cache[content_key]
+            return None
+        self._analysis_cache.move_to_end(content_key)
+        return analysis
+
+    def _cache_analysis(self, content_key: str, analysis: Tuple[str, float, str, float, float]) -> None:
+        """Remember an analysis so identical content under another post skips detection."""
+        if self._is_testing_mode():
+            return
+        self._analysis_cache[content_key] = (time.monotonic(), analysis)
+        self._analysis_cache.move_to_end(content_key)
+        while len(self._analysis_cache) > settings.text_analysis_cache_size:
+            self._analysis_cache.popitem(last=False)
+
     async def _get_cached_result(self, post_id: str, db: AsyncSession) -> Optional[Post]:
         """Get cached result from database."""
         result = await db.execute(select(Post).where(Post.post_id == post_id))
@@ -172,8 +217,6 @@ class TextDetectionService:
 
     def _random_detection(self, content: str) -> tuple[str, float, str, float, float]:
         """Random detection for testing."""
-        import random
-
         is_ai_slop = random.random() > 0.5
 
         # Legacy confidence for backward compatibility
@@ -216,8 +259,6 @@ class TextDetectionService:
     def _is_testing_mode(self) -> bool:
         """Check if running in testing mode."""
         # You can configure this via environment variable
-        import os
-
         return os.getenv("DETECTION_MODE", "real").lower() == "testing"
 
     async def _save_to_database(
@@ -1,6 +1,11 @@
 """Unified media processing service for consistent image and video handling."""
 
 import asyncio
+import hashlib
+import os
+import time
+import uuid
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor
@@ -9,11 +14,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
 from core.media_registry import media_registry
+from services.downloaders.base import media_file_extension
 from services.media_analyzer import MediaAnalyzer, MediaAnalyzerFactory, MediaFile, MediaType, AnalysisResult
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# File extensions accepted by the URL-hash fallback, per media type
+_HASH_INDEX_EXTENSIONS = {
+    "image": frozenset({".jpg", ".jpeg", ".png", ".bmp", ".webp"}),
+    "video": frozenset({".mp4", ".avi", ".mov", ".webm"}),
+}
+
 
 class UnifiedMediaService:
     """Unified service for processing both images and videos consistently."""
@@ -28,6 +40,8 @@ class UnifiedMediaService:
         self.max_workers = max_workers
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
         self._semaphore = asyncio.Semaphore(max_workers)
+        # Verdicts by media URL and by content hash: key -> (stored_at, result), oldest first
+        self._verdict_cache: "OrderedDict[str, Tuple[float, AnalysisResult]]" = OrderedDict()
 
     async def analyze_media_batch(
         self, media_urls: List[str], media_type: MediaType, post_id: str, media_info: Dict[str, Any], db: AsyncSession
@@ -51,23 +65,31 @@ class UnifiedMediaService:
         media_type_str = media_type.value
         logger.info(f"Starting unified {media_type_str} analysis", post_id=post_id, count=len(media_urls))
 
-        # Create analyzer for this media type
+        # Shared analyzer for this media type; model weights stay loaded between requests
         analyzer = MediaAnalyzerFactory.create_analyzer(media_type)
 
-        # Prepare media files for processing
-        media_files = await self._prepare_media_files(media_urls, media_type, post_id, media_info, db)
-
-        # Process media files in parallel batches
-        results = []
-        batch_size = min(self.max_workers, len(media_files))
+        # Prepare each distinct URL once; posts often repeat a URL (e.g. thumbnail and full size).
+        # _format_results maps the results back onto every occurrence
+        unique_urls = list(dict.fromkeys(media_urls))
 
-        for i in range(0, len(media_files), batch_size):
-            batch = media_files[i : i + batch_size]
-            batch_results = await asyncio.gather(*[self._analyze_single_media(media_file, analyzer, post_id) for media_file in batch])
-            results.extend(batch_results)
+        # Reuse verdicts for media already scored before downloading or locating any file
+        cached_verdicts = self._get_cached_verdicts(unique_urls, media_type, media_info)
+        media_files = await self._prepare_media_files(
+            [url for url in unique_urls if url not in cached_verdicts], media_type, post_id, media_info, db
+        )
+        media_files.extend(
+            MediaFile(
+                url=url,
+                media_type=media_type,
+                post_id=post_id,
+                media_id=media_info.get(url, {}).get("media_id"),
+                content_hash=media_info.get(url, {}).get("content_hash"),
+            )
+            for url in cached_verdicts
+        )
 
-        # Clean up analyzer
-        analyzer.cleanup()
+        # Analyze all media files in one call so batch-capable models score them together
+        results = await self._analyze_media_files(media_files, analyzer, post_id, cached_verdicts)
 
         # Format results for API response
         formatted_results = self._format_results(results, media_urls, media_info)
@@ -79,7 +101,7 @@ class UnifiedMediaService:
             f"Completed unified {media_type_str} analysis",
             post_id=post_id,
             total=len(media_urls),
-            successful=len([r for r in formatted_results if r.get("status") == "success"]),
+            successful=sum(r.get("status") == "success" for r in formatted_results),
             avg_ai_probability=round(ai_probability, 3) if ai_probability else None,
             avg_confidence=round(confidence, 3) if confidence else None,
         )
@@ -102,43 +124,91 @@ class UnifiedMediaService:
         Returns:
             List of prepared MediaFile objects
         """
+        # List the post's media dir once for the URL-hash fallback instead of globbing it per URL
+        loop = asyncio.get_running_loop()
+        hash_index = await loop.run_in_executor(self._executor, self._build_hash_index, post_id, media_type.value)
+
+        # Resolve all files concurrently; each lookup is a few stats on the (GCS Fuse-backed) tmp dir
+        prepared = await asyncio.gather(
+            *(self._prepare_media_file(url, media_type, post_id, media_info, hash_index) for url in media_urls), return_exceptions=True
+        )
+
+        # A URL that fails to resolve is analyzed as unavailable instead of failing the batch
         media_files = []
+        for url, media_file in zip(media_urls, prepared):
+            if isinstance(media_file, Exception):
+                logger.warning("Failed to prepare media file", post_id=post_id, url=url[:50], error=str(media_file))
+                media_file = MediaFile(
+                    url=url, media_type=media_type, post_id=post_id, content_hash=media_info.get(url, {}).get("content_hash")
+                )
+            media_files.append(media_file)
+        return media_files
 
-        for url in media_urls:
-            media_file = MediaFile(url=url, media_type=media_type, post_id=post_id)
+    async def _prepare_media_file(
+        self, url: str, media_type: MediaType, post_id: str, media_info: Dict[str, Any], hash_index: Dict[str, Path]
+    ) -> MediaFile:
+        """
+        Prepare a single media file for processing.
 
-            # Check registry for existing processing
-            if media_registry.is_already_processed(post_id, url, "downloaded"):
-                registry_record = media_registry.get_processed_media_info(post_id, url)
-                if registry_record and registry_record.local_path:
-                    media_file.local_path = registry_record.local_path
-                    logger.debug("Using registry cached file", url=url[:50], local_path=str(registry_record.local_path))
+        Args:
+            url: Media URL
+            media_type: Type of media
+            post_id: Facebook post ID
+            media_info: Database media information
+            hash_index: Downloaded files of this media type keyed by URL hash
 
-            # If not in registry, check database
-            if not media_file.local_path:
-                db_record = media_info.get(url, {})
-                media_file.media_id = db_record.get("media_id")
-                media_file.storage_path = db_record.get("storage_path")
-                media_file.storage_type = db_record.get("storage_type")
+        Returns:
+            Prepared MediaFile object
+        """
+        media_file = MediaFile(url=url, media_type=media_type, post_id=post_id, content_hash=media_info.get(url, {}).get("content_hash"))
+
+        # Check registry for existing processing (one lookup serves both checks)
+        registry_record = media_registry.get_processed_media_info(post_id, url)
+        if registry_record and registry_record.has_reached_stage("downloaded"):
+            if registry_record.local_path:
+                media_file.local_path = registry_record.local_path
+                logger.debug("Using registry cached file", url=url[:50], local_path=str(registry_record.local_path))
+
+        # If not in registry, check database
+        if not media_file.local_path:
+            db_record = media_info.get(url, {})
+            media_file.media_id = db_record.get("media_id")
+            media_file.storage_path = db_record.get("storage_path")
+            media_file.storage_type = db_record.get("storage_type")
+
+            # Try to get local file from storage path
+            local_path = await self._get_local_file(media_file, url, hash_index)
+            if local_path:
+                media_file.local_path = local_path
+
+        return media_file
+
+    async def _get_local_file(self, media_file: MediaFile, url: str, hash_index: Dict[str, Path]) -> Optional[Path]:
+        """
+        Get local file for analysis without blocking the event loop.
 
-                # Try to get local file from storage path
-                local_path = await self._get_local_file(media_file, post_id, url, media_type.value)
-                if local_path:
-                    media_file.local_path = local_path
+        The filesystem checks run on the service's executor, which also bounds how
+        many lookups hit the storage mount at once.
 
-            media_files.append(media_file)
+        Args:
+            media_file: Media file information
+            url: Media URL
+            hash_index: Downloaded files of this media type keyed by URL hash
 
-        return media_files
+        Returns:
+            Path to local file or None if not available
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._find_local_file, media_file, url, hash_index)
 
-    async def _get_local_file(self, media_file: MediaFile, post_id: str, url: str, media_type_str: str) -> Optional[Path]:
+    def _find_local_file(self, media_file: MediaFile, url: str, hash_index: Dict[str, Path]) -> Optional[Path]:
         """
         Get or download local file for analysis.
 
         Args:
             media_file: Media file information
-            post_id: Facebook post ID
             url: Media URL
-            media_type_str: Media type string ('image' or 'video')
+            hash_index: Downloaded files of this media type keyed by URL hash
 
         Returns:
             Path to local file or None if not available
@@ -163,45 +233,49 @@ class UnifiedMediaService:
                 return local_path
 
         # Fallback: try to find by URL hash
-        local_path = self._find_local_file_by_hash(post_id, url, media_type_str)
-        if local_path and local_path.exists():
-            return local_path
+        return self._find_local_file_by_hash(url, hash_index)
 
-        return None
-
-    def _find_local_file_by_hash(self, post_id: str, url: str, media_type_str: str) -> Optional[Path]:
+    def _build_hash_index(self, post_id: str, media_type_str: str) -> Dict[str, Path]:
         """
-        Find local file by URL hash.
+        Index a post's downloaded files of one media type by URL hash.
+
+        Downloaders name files ``{md5(url)[:8]}_{uuid}{ext}``, so one directory
+        listing resolves every URL in a batch.
 
         Args:
             post_id: Facebook post ID
-            url: Media URL
             media_type_str: Media type string
 
         Returns:
-            Path to local file or None
+            Dictionary mapping URL hash to local file path
         """
-        import hashlib
+        extensions = _HASH_INDEX_EXTENSIONS.get(media_type_str, frozenset())
+        post_media_dir = settings.tmp_dir / post_id / "media"
+
+        hash_index: Dict[str, Path] = {}
+        try:
+            with os.scandir(post_media_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions:
+                        hash_index.setdefault(entry.name[:8], Path(entry.path))
+        except FileNotFoundError:
+            pass
 
-        # Generate URL hash
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+        return hash_index
 
-        # Look in post media directory
-        post_media_dir = settings.tmp_dir / post_id / "media"
+    def _find_local_file_by_hash(self, url: str, hash_index: Dict[str, Path]) -> Optional[Path]:
+        """
+        Find local file by URL hash.
 
-        if post_media_dir.exists():
-            # Find files matching the hash
-            for file_path in post_media_dir.glob(f"*{url_hash}*"):
-                if file_path.is_file():
-                    # Check if it's the right type
-                    if media_type_str == "image":
-                        if file_path.suffix.lower() in [".jpg", ".jpeg", ".png", ".bmp", ".webp"]:
-                            return file_path
-                    elif media_type_str == "video":
-                        if file_path.suffix.lower() in [".mp4", ".avi", ".mov", ".webm"]:
-                            return file_path
+        Args:
+            url: Media URL
+            hash_index: Downloaded files of this media type keyed by URL hash
 
-        return None
+        Returns:
+            Path to local file or None
+        """
+        # MD5 matches the downloaders' file naming; it is not used for security
+        return hash_index.get(hashlib.md5(url.encode()).hexdigest()[:8])
 
     def _get_local_file_path(self, post_id: str, media_url: str, media_type: str) -> Path:
         """
@@ -215,9 +289,6 @@ class UnifiedMediaService:
         Returns:
             Path object for local file storage
         """
-        import hashlib
-        import uuid
-
         # Create post-specific media folder
         post_folder = settings.tmp_dir / post_id / "media"
         post_folder.mkdir(parents=True, exist_ok=True)
@@ -227,33 +298,148 @@ class UnifiedMediaService:
         unique_id = str(uuid.uuid4())[:8]
 
         # Determine file extension
-        extension = ".jpg" if media_type == "image" else ".mp4"
-        if "." in media_url.split("/")[-1]:
-            try:
-                url_ext = "." + media_url.split(".")[-1].split("?")[0]
-                if len(url_ext) <= 5:
-                    extension = url_ext
-            except (ValueError, IndexError):
-                pass
+        extension = media_file_extension(media_url, ".jpg" if media_type == "image" else ".mp4")
 
         filename = f"{url_hash}_{unique_id}{extension}"
         return post_folder / filename
 
-    async def _analyze_single_media(self, media_file: MediaFile, analyzer: MediaAnalyzer, post_id: str) -> Dict[str, Any]:
+    async def _analyze_media_files(
+        self, media_files: List[MediaFile], analyzer: MediaAnalyzer, post_id: str, cached_verdicts: Dict[str, AnalysisResult]
+    ) -> List[Dict[str, Any]]:
         """
-        Analyze a single media file.
+        Analyze media files with a single batched analyzer call.
 
         Args:
-            media_file: Media file to analyze
+            media_files: Media files to analyze
             analyzer: Media analyzer to use
             post_id: Facebook post ID
+            cached_verdicts: Verdicts already known for some of the files, by URL
+
+        Returns:
+            Analysis result dictionaries, one per media file
+        """
+        analysis_results: Dict[int, AnalysisResult] = {
+            id(media_file): cached_verdicts[media_file.url] for media_file in media_files if media_file.url in cached_verdicts
+        }
+        to_analyze = [media_file for media_file in media_files if id(media_file) not in analysis_results and media_file.has_local_file]
+
+        if to_analyze:
+            try:
+                # Run analysis with semaphore to limit concurrency
+                async with self._semaphore:
+                    batch_results = await analyzer.analyze_batch(to_analyze)
+                for media_file, result in zip(to_analyze, batch_results):
+                    analysis_results[id(media_file)] = result
+                    self._cache_verdict(media_file.media_type, media_file.url, media_file.content_hash, result)
+            except Exception as e:
+                logger.error("Error analyzing media batch", post_id=post_id, count=len(to_analyze), error=str(e), exc_info=True)
+                return [
+                    {"url": media_file.url, "status": "error", "error": str(e), "media_id": media_file.media_id}
+                    for media_file in media_files
+                ]
+
+        # Collect registry updates and apply them in one call after formatting
+        registry_updates: List[Tuple[str, str, Dict[str, Any]]] = []
+        results = [
+            self._record_analysis(media_file, analysis_results.get(id(media_file)), post_id, registry_updates) for media_file in media_files
+        ]
+        media_registry.update_processing_stages(registry_updates)
+        return results
+
+    def _get_cached_verdicts(self, urls: List[str], media_type: MediaType, media_info: Dict[str, Any]) -> Dict[str, AnalysisResult]:
+        """
+        Get recent verdicts for media URLs, before any file is prepared.
+
+        Each URL is looked up directly first, then by the content hash stored for it, so
+        the same content under a new URL (reposts, shared thumbnails) is also reused.
+
+        Args:
+            urls: Media URLs to look up
+            media_type: Type of media
+            media_info: Database media information
+
+        Returns:
+            Cached analysis results by URL, for the URLs that have a fresh one
+        """
+        verdicts = {}
+        for url in urls:
+            content_hash = media_info.get(url, {}).get("content_hash")
+            url_key = f"{media_type.value}:url:{url}"
+            result = self._get_cached_verdict(url_key)
+            if result is None and content_hash:
+                hash_key = f"{media_type.value}:hash:{content_hash}"
+                result = self._get_cached_verdict(hash_key)
+                if result is not None:
+                    # Let the next request for this URL hit on the first lookup (same expiry)
+                    self._verdict_cache[url_key] = self._verdict_cache[hash_key]
+            if result is not None:
+                verdicts[url] = result
+        return verdicts
+
+    def _get_cached_verdict(self, key: str) -> Optional[AnalysisResult]:
+        """
+        Get a recent verdict from the cache.
+
+        Args:
+            key: Verdict cache key
+
+        Returns:
+            Cached analysis result if still fresh, None otherwise
+        """
+        entry = self._verdict_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > settings.media_verdict_cache_ttl_seconds:
+            del self._verdict_cache[key]
+            return None
+        self._verdict_cache.move_to_end(key)
+        return result
+
+    def _cache_verdict(self, media_type: MediaType, url: str, content_hash: Optional[str], result: AnalysisResult) -> None:
+        """
+        Remember a successful verdict under its URL and content hash so the same media is not scored again.
+
+        Args:
+            media_type: Type of media
+            url: Media URL
+            content_hash: Media content hash, if known
+            result: Its analysis result
+        """
+        if result.error is not None:
+            return
+        keys = [f"{media_type.value}:url:{url}"]
+        if content_hash:
+            keys.append(f"{media_type.value}:hash:{content_hash}")
+        now = time.monotonic()
+        for key in keys:
+            self._verdict_cache[key] = (now, result)
+            self._verdict_cache.move_to_end(key)
+        while len(self._verdict_cache) > settings.media_verdict_cache_size:
+            self._verdict_cache.popitem(last=False)
+
+    def _record_analysis(
+        self,
+        media_file: MediaFile,
+        result: Optional[AnalysisResult],
+        post_id: str,
+        registry_updates: List[Tuple[str, str, Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Format a media file's analysis and queue its registry update.
+
+        Args:
+            media_file: Analyzed media file
+            result: Analysis result, or None if the file was not available
+            post_id: Facebook post ID
+            registry_updates: (media_key, stage, fields) updates to apply to the registry
 
         Returns:
             Analysis result dictionary
         """
         try:
             # Check if file is available
-            if not media_file.has_local_file:
+            if result is None:
                 logger.warning("Local file not available for analysis", url=media_file.url[:50])
                 return {
                     "url": media_file.url,
@@ -262,20 +448,19 @@ class UnifiedMediaService:
                     "media_id": media_file.media_id,
                 }
 
-            # Run analysis with semaphore to limit concurrency
-            async with self._semaphore:
-                result = await analyzer.analyze(media_file)
-
-            # Update registry with analysis results
-            media_key = f"{post_id}:{media_file.url}"
-            media_registry.update_processing_stage(
-                media_key,
-                "analyzed",
-                detection_result={
-                    "ai_probability": result.ai_probability,
-                    "confidence": result.confidence,
-                    "model_used": result.model_used,
-                },
+            # Queue registry update with analysis results
+            registry_updates.append(
+                (
+                    f"{post_id}:{media_file.url}",
+                    "analyzed",
+                    {
+                        "detection_result": {
+                            "ai_probability": result.ai_probability,
+                            "confidence": result.confidence,
+                            "model_used": result.model_used,
+                        }
+                    },
+                )
             )
 
             # Return formatted result
@@ -283,7 +468,7 @@ class UnifiedMediaService:
                 "url": media_file.url,
                 "status": "success",
                 "media_id": media_file.media_id,
-                "local_file": str(media_file.local_path),
+                "local_file": str(media_file.local_path) if media_file.local_path else None,
                 **result.to_dict(),
             }
 
@@ -334,16 +519,19 @@ class UnifiedMediaService:
         Returns:
             Tuple of (average_ai_probability, average_confidence)
         """
-        successful_results = [r for r in results if r.get("status") == "success" and r.get("ai_probability") is not None]
-
-        if not successful_results:
+        # Filter and accumulate in one pass over the results
+        total_probability = total_confidence = 0.0
+        count = 0
+        for r in results:
+            if r.get("status") == "success" and (probability := r.get("ai_probability")) is not None:
+                total_probability += probability
+                total_confidence += r.get("confidence", 0.0)
+                count += 1
+
+        if not count:
             return None, None
 
-        # Calculate averages
-        avg_ai_prob = sum(r["ai_probability"] for r in successful_results) / len(successful_results)
-        avg_confidence = sum(r.get("confidence", 0.0) for r in successful_results) / len(successful_results)
-
-        return avg_ai_prob, avg_confidence
+        return total_probability / count, total_confidence / count
 
     def cleanup(self):
         """Clean up resources."""
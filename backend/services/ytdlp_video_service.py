@@ -11,6 +11,7 @@ from typing import Dict, List, Optional
 import yt_dlp
 
 from core.config import settings
+from services.downloaders.base import get_http_session, stream_response_to_file
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -195,8 +196,6 @@ class YtDlpVideoService:
             Path to downloaded video or None
         """
         try:
-            import aiohttp
-
             output_dir = self.base_output_dir / post_id / "media"
             output_dir.mkdir(parents=True, exist_ok=True)
             output_path = output_dir / f"video_{video_index}.mp4"
@@ -205,17 +204,15 @@ class YtDlpVideoService:
 
             headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36", "Referer": "https://www.facebook.com/"}
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        content = await response.read()
-
-                        with open(output_path, "wb") as f:
-                            f.write(content)
+            async with get_http_session().get(url, headers=headers) as response:
+                if response.status == 200:
+                    # Stream to disk so a large video is never held in memory whole
+                    size, _ = await stream_response_to_file(response, output_path)
 
-                        if output_path.stat().st_size > 0:
-                            logger.info("Direct download successful", path=str(output_path))
-                            return output_path
+                    if size > 0:
+                        logger.info("Direct download successful", path=str(output_path))
+                        return output_path
+                    output_path.unlink(missing_ok=True)
 
             return None
 
@@ -1,9 +1,12 @@
+import asyncio
 import io
 
 import pytest
 from fastapi.testclient import TestClient
 
+from core.config import settings
 from main import app
+from services.chat_service import ChatService
 
 
 @pytest.fixture(scope="module")
@@ -59,3 +62,32 @@ def test_removed_image_url_endpoint_returns_404(client: TestClient):
 def test_removed_video_url_endpoint_returns_404(client: TestClient):
     res = client.post("/api/v1/video/detect-url", json={"video_url": "http://example.com/a.mp4"})
     assert res.status_code == 404
+
+
+def test_startup_skips_gemini_warm_up_by_default(monkeypatch):
+    calls = []
+
+    async def warm_up(self):
+        calls.append(self)
+
+    monkeypatch.setattr(ChatService, "warm_up", warm_up)
+    with TestClient(app):
+        pass
+    assert calls == []
+
+
+def test_shutdown_cancels_a_pending_gemini_warm_up(monkeypatch):
+    cancelled = []
+
+    async def warm_up(self):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    monkeypatch.setattr(settings, "gemini_warmup_on_startup", True)
+    monkeypatch.setattr(ChatService, "warm_up", warm_up)
+    with TestClient(app):
+        pass
+    assert cancelled == [True]
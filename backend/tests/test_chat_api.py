@@ -0,0 +1,123 @@
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.v1.endpoints.chat as chat_endpoints
+from core.errors import ServiceOverloaded
+from main import app
+
+
+class _FakeChatService:
+    def __init__(self):
+        self.events = []
+        self.error = None
+        self.prewarmed = []
+        self.suggestions = {}
+
+    async def send_message(self, request, db):
+        raise self.error
+
+    async def send_message_stream(self, request, db):
+        for event in self.events:
+            yield event
+        if self.error is not None:
+            raise self.error
+
+    def prewarm(self, post_id):
+        scheduled = post_id not in self.prewarmed
+        self.prewarmed.append(post_id)
+        return scheduled
+
+    def get_suggestions(self, chat_id):
+        if chat_id not in self.suggestions:
+            raise ValueError(f"No suggestions found for message {chat_id}")
+        return self.suggestions[chat_id]
+
+
+@asynccontextmanager
+async def _no_session():
+    yield None
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def fake_service(monkeypatch):
+    fake = _FakeChatService()
+    monkeypatch.setattr(chat_endpoints, "chat_service", fake)
+    monkeypatch.setattr(chat_endpoints, "get_async_session", _no_session)
+    return fake
+
+
+def _events(res):
+    return [json.loads(line[len("data: ") :]) for line in res.text.splitlines() if line.startswith("data: ")]
+
+
+_MESSAGE = {"post_id": "p1", "user_id": "0b8f2c3e-6d1a-4f5b-9c7e-2a4d6e8f0a1b", "message": "Is this AI?"}
+
+
+def test_stream_emits_chunks_then_done(client: TestClient, fake_service):
+    fake_service.events = [{"type": "chunk", "text": "Prob"}, {"type": "chunk", "text": "ably"}, {"type": "done", "response": {}}]
+
+    res = client.post("/api/v1/chat/send/stream", json=_MESSAGE)
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/event-stream")
+    assert [event["type"] for event in _events(res)] == ["chunk", "chunk", "done"]
+
+
+def test_stream_reports_missing_post_as_error_event(client: TestClient, fake_service):
+    fake_service.error = ValueError("Post p1 not found")
+
+    events = _events(client.post("/api/v1/chat/send/stream", json=_MESSAGE))
+
+    assert events == [{"type": "error", "status_code": 404, "detail": "Post p1 not found"}]
+
+
+def test_stream_reports_overload_as_retryable_error_event(client: TestClient, fake_service):
+    fake_service.events = [{"type": "chunk", "text": "Prob"}]
+    fake_service.error = ServiceOverloaded("Too many pending Gemini requests", retry_after=7)
+
+    events = _events(client.post("/api/v1/chat/send/stream", json=_MESSAGE))
+
+    assert events[0]["type"] == "chunk"
+    assert events[-1] == {"type": "error", "status_code": 503, "detail": "Too many pending Gemini requests", "retry_after": 7}
+
+
+def test_send_sheds_load_with_503(client: TestClient, fake_service):
+    fake_service.error = ServiceOverloaded("Too many pending Gemini requests", retry_after=7)
+
+    res = client.post("/api/v1/chat/send", json=_MESSAGE)
+
+    assert res.status_code == 503
+    assert res.headers["retry-after"] == "7"
+
+
+def test_prewarm_is_accepted_once_per_post(client: TestClient, fake_service):
+    first = client.post("/api/v1/chat/prewarm/p1")
+    second = client.post("/api/v1/chat/prewarm/p1")
+
+    assert first.status_code == 202
+    assert first.json() == {"post_id": "p1", "scheduled": True}
+    assert second.json() == {"post_id": "p1", "scheduled": False}
+
+
+def test_suggestions_poll_until_ready(client: TestClient, fake_service):
+    fake_service.suggestions["c1"] = (False, [])
+    pending = client.get("/api/v1/chat/c1/suggestions")
+    fake_service.suggestions["c1"] = (True, ["Why?"])
+    ready = client.get("/api/v1/chat/c1/suggestions")
+
+    assert pending.json() == {"id": "c1", "ready": False, "suggested_questions": []}
+    assert ready.json() == {"id": "c1", "ready": True, "suggested_questions": ["Why?"]}
+
+
+def test_suggestions_for_unknown_message_return_404(client: TestClient, fake_service):
+    res = client.get("/api/v1/chat/unknown/suggestions")
+    assert res.status_code == 404
@@ -0,0 +1,251 @@
+"""Tests for the chat service's Gemini load shedding, prewarming and follow-up suggestions."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from core.config import settings
+from core.errors import ServiceOverloaded
+from db.models import Post, User
+from schemas.chat import ChatRequest
+from services import chat_service
+from services.chat_service import ChatService, _ChatTurn
+
+_USER_ID = "0b8f2c3e-6d1a-4f5b-9c7e-2a4d6e8f0a1b"
+_GEMINI_QUESTIONS = ["Why?", "How?", "Since when?"]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "gemini_api_key", settings.gemini_api_key or "test-key")
+    svc = ChatService()
+
+    async def save_messages(chats, db):
+        return None
+
+    monkeypatch.setattr(svc, "_save_messages", save_messages)
+    return svc
+
+
+def _turn(service: ChatService) -> _ChatTurn:
+    post = Post(post_id="p1", content="hi", verdict="ai_slop", confidence=0.9, explanation="text")
+    user_chat = service._new_message("p1", _USER_ID, "user", "Is this AI?", [])
+    media = service._build_media_bundle([])
+    return _ChatTurn(user=User(id=_USER_ID), post=post, chat_history=[user_chat], file_uris=[], media=media, user_chat=user_chat)
+
+
+def _use_suggestions(service, monkeypatch, delay: float = 0):
+    calls = []
+
+    async def generate(post, chat_history):
+        calls.append(post.post_id)
+        await asyncio.sleep(delay)
+        return list(_GEMINI_QUESTIONS)
+
+    monkeypatch.setattr(service, "_generate_gemini_suggestions", generate)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_reply_carries_suggestions_generated_alongside_it(service, monkeypatch):
+    calls = _use_suggestions(service, monkeypatch)
+    turn = _turn(service)
+
+    service._start_suggestions(turn)
+    response = await service._complete_turn(turn, "Probably.", None)
+
+    assert calls == ["p1"]
+    assert response.suggested_questions == _GEMINI_QUESTIONS
+    assert service.get_suggestions(response.id) == (True, _GEMINI_QUESTIONS)
+
+
+@pytest.mark.asyncio
+async def test_slow_suggestions_fall_back_and_stay_fetchable(service, monkeypatch):
+    monkeypatch.setattr(settings, "gemini_suggestions_wait_seconds", 0.01)
+    _use_suggestions(service, monkeypatch, delay=0.05)
+    turn = _turn(service)
+
+    service._start_suggestions(turn)
+    response = await service._complete_turn(turn, "Probably.", None)
+
+    assert response.suggested_questions == service._generate_fallback_suggestions(turn.post, turn.chat_history)
+    assert service.get_suggestions(response.id) == (False, [])
+    await asyncio.gather(*service._suggestion_tasks.values())
+    assert service.get_suggestions(response.id) == (True, _GEMINI_QUESTIONS)
+
+
+@pytest.mark.asyncio
+async def test_suggestions_can_be_disabled(service, monkeypatch):
+    monkeypatch.setattr(settings, "gemini_suggestions_enabled", False)
+    calls = _use_suggestions(service, monkeypatch)
+    turn = _turn(service)
+
+    service._start_suggestions(turn)
+    response = await service._complete_turn(turn, "Probably.", None)
+
+    assert calls == []
+    assert response.suggested_questions == service._generate_fallback_suggestions(turn.post, turn.chat_history)
+    with pytest.raises(ValueError):
+        service.get_suggestions(response.id)
+
+
+@pytest.mark.asyncio
+async def test_failed_reply_cancels_its_suggestions(service, monkeypatch):
+    _use_suggestions(service, monkeypatch, delay=10)
+    turn = _turn(service)
+
+    async def prepare_turn(request, db):
+        return turn
+
+    async def lookup_cached_reply(turn, message):
+        return None, None
+
+    async def coalesce_reply(turn, message, generate):
+        raise RuntimeError("Gemini unavailable")
+
+    monkeypatch.setattr(service, "_prepare_turn", prepare_turn)
+    monkeypatch.setattr(service, "_lookup_cached_reply", lookup_cached_reply)
+    monkeypatch.setattr(service, "_coalesce_reply", coalesce_reply)
+
+    with pytest.raises(RuntimeError):
+        await service.send_message(ChatRequest(post_id="p1", user_id=_USER_ID, message="Is this AI?"), None)
+
+    await asyncio.sleep(0)
+    assert turn.suggestions.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_gemini_slot_sheds_load_when_queue_is_full(service, monkeypatch):
+    monkeypatch.setattr(settings, "gemini_max_queue_depth", 1)
+    service._cmax = 1
+    release = asyncio.Event()
+
+    async def hold_slot():
+        async with service._gemini_slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold_slot())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(hold_slot())
+    await asyncio.sleep(0)
+    assert service._active == 1 and service._waiting == 1
+
+    with pytest.raises(ServiceOverloaded):
+        async with service._gemini_slot():
+            pass
+
+    release.set()
+    await asyncio.gather(holder, waiter)
+    assert service._active == 0 and service._waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_gemini_slot_frees_capacity_after_shedding(service, monkeypatch):
+    monkeypatch.setattr(settings, "gemini_max_queue_depth", 0)
+    service._cmax = 1
+
+    async with service._gemini_slot():
+        with pytest.raises(ServiceOverloaded):
+            async with service._gemini_slot():
+                pass
+
+    async with service._gemini_slot():
+        assert service._active == 1
+
+
+@pytest.mark.asyncio
+async def test_prewarm_uploads_outside_the_chat_slot_and_session(service, monkeypatch):
+    sessions = []
+    uploads = []
+
+    @asynccontextmanager
+    async def get_async_session():
+        sessions.append("open")
+        yield None
+        sessions.append("closed")
+
+    async def get_post_media_bundle(post_id, db):
+        return service._build_media_bundle([("image", "http://cdn/a.jpg", None)])
+
+    async def upload(post_id, media_urls):
+        uploads.append((post_id, media_urls, list(sessions), service._active))
+        return ["files/a"]
+
+    monkeypatch.setattr(chat_service, "get_async_session", get_async_session)
+    monkeypatch.setattr(service, "_get_post_media_bundle", get_post_media_bundle)
+    monkeypatch.setattr(chat_service.gemini_on_demand_service, "batch_ensure_gemini_uris_detached", upload)
+
+    assert service.prewarm("p1")
+    await service._await_prewarm("p1")
+
+    assert uploads == [("p1", ["http://cdn/a.jpg"], ["open", "closed"], 0)]
+
+
+class _AnswerSession:
+    def __init__(self, rowcount: int):
+        self.rowcount = rowcount
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(rowcount=self.rowcount)
+
+
+def _use_answer_prewarm(service, monkeypatch, rowcount: int):
+    sessions = []
+    db = _AnswerSession(rowcount)
+    post = Post(post_id="p1", content="hi", verdict="ai_slop", detection_summary_text="summary")
+
+    @asynccontextmanager
+    async def get_async_session():
+        sessions.append("open")
+        yield db
+        sessions.append("closed")
+
+    async def get_post(post_id, db):
+        return post
+
+    async def get_post_media_bundle(post_id, db):
+        return service._build_media_bundle([])
+
+    async def open_chat(post, chat_history, user_message, file_uris):
+        return None, user_message
+
+    async def send_message(chat_session, content, generation_config):
+        sessions.append("gemini")
+        return SimpleNamespace(text="1. Because.\n2. Recently.\n3. Yes.\n4. Yes.")
+
+    monkeypatch.setattr(chat_service, "get_async_session", get_async_session)
+    monkeypatch.setattr(service, "_get_post", get_post)
+    monkeypatch.setattr(service, "_get_post_media_bundle", get_post_media_bundle)
+    monkeypatch.setattr(service, "_open_chat", open_chat)
+    monkeypatch.setattr(service, "_gemini_send_message", send_message)
+    return sessions, db
+
+
+@pytest.mark.asyncio
+async def test_answer_prewarm_calls_gemini_between_sessions(service, monkeypatch):
+    sessions, db = _use_answer_prewarm(service, monkeypatch, rowcount=1)
+
+    await service._prewarm_answers("p1")
+
+    assert sessions == ["open", "closed", "gemini", "open", "closed"]
+    (statement,) = db.statements
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE post SET prewarmed_answers=")
+    assert "post.verdict IS NOT DISTINCT FROM" in sql
+    assert "post.detection_summary_text IS NOT DISTINCT FROM" in sql
+
+
+@pytest.mark.asyncio
+async def test_answer_prewarm_for_a_reanalyzed_post_is_discarded(service, monkeypatch):
+    _use_answer_prewarm(service, monkeypatch, rowcount=0)
+    logged = []
+    monkeypatch.setattr(chat_service.logger, "info", lambda event, **kw: logged.append(event))
+
+    await service._prewarm_answers("p1")
+
+    assert logged == ["Discarded stale prewarmed chat answers"]
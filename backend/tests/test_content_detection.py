@@ -0,0 +1,187 @@
+"""Tests for the multi-modal content detection service."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.config import settings
+from db.models import Post
+from schemas.content_detection import ContentDetectionRequest, ContentDetectionResponse
+from schemas.text_detection import DetectResponse
+from services.content_detection_service import ContentDetectionService
+
+
+def _text_result(post_id: str, ai_probability: float, confidence: float) -> DetectResponse:
+    return DetectResponse(
+        post_id=post_id,
+        verdict="ai_slop",
+        confidence=confidence,
+        explanation="text",
+        timestamp="2026-01-01T00:00:00",
+        text_ai_probability=ai_probability,
+        text_confidence=confidence,
+    )
+
+
+class _PostSession:
+    def __init__(self, post: Post):
+        self.post = post
+
+    async def get(self, model, key):
+        return self.post
+
+    async def commit(self):
+        return None
+
+
+@pytest.fixture
+def media_calls():
+    return []
+
+
+@pytest.fixture
+def service(monkeypatch, media_calls):
+    svc = ContentDetectionService()
+
+    async def load_post(post_id, db):
+        return None
+
+    async def update_post(*args):
+        return None
+
+    async def analyze_media_batch(urls, media_type, post_id, media_info, db):
+        media_calls.append((media_type, urls))
+        return [{"url": url, "status": "success"} for url in urls], 0.3, 0.5
+
+    monkeypatch.setattr(svc, "_load_post", load_post)
+    monkeypatch.setattr(svc, "_update_post_with_results", update_post)
+    monkeypatch.setattr(svc, "media_service", SimpleNamespace(analyze_media_batch=analyze_media_batch))
+    return svc
+
+
+def _use_text(svc, monkeypatch, ai_probability: float, confidence: float):
+    async def detect(request, db, use_cache=True):
+        return _text_result(request.post_id, ai_probability, confidence)
+
+    monkeypatch.setattr(svc, "text_service", SimpleNamespace(detect=detect))
+
+
+@pytest.mark.asyncio
+async def test_confident_ai_text_never_starts_media(service, media_calls, monkeypatch):
+    monkeypatch.setattr(settings, "enable_media_skip_on_confident_text", True)
+    _use_text(service, monkeypatch, ai_probability=0.9, confidence=0.95)
+
+    request = ContentDetectionRequest(post_id="p-skip", content="hi", image_urls=["http://cdn/a.jpg"])
+    response = await service.detect(request, None)
+
+    assert media_calls == []
+    assert response.verdict == "ai_slop"
+    assert response.image_analysis == []
+
+
+@pytest.mark.asyncio
+async def test_unconfident_text_still_analyzes_media(service, media_calls, monkeypatch):
+    monkeypatch.setattr(settings, "enable_media_skip_on_confident_text", True)
+    _use_text(service, monkeypatch, ai_probability=0.9, confidence=0.5)
+
+    request = ContentDetectionRequest(post_id="p-media", content="hi", image_urls=["http://cdn/a.jpg"])
+    response = await service.detect(request, None)
+
+    assert len(media_calls) == 1
+    assert len(response.image_analysis) == 1
+
+
+@pytest.mark.asyncio
+async def test_media_skip_disabled_by_default(service, media_calls, monkeypatch):
+    monkeypatch.setattr(settings, "enable_media_skip_on_confident_text", False)
+    _use_text(service, monkeypatch, ai_probability=0.9, confidence=0.95)
+
+    request = ContentDetectionRequest(post_id="p-default", content="hi", image_urls=["http://cdn/a.jpg"])
+    await service.detect(request, None)
+
+    assert len(media_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_media_over_budget_is_reported_as_timeout(service, monkeypatch):
+    monkeypatch.setattr(settings, "media_analysis_budget_seconds", 0.05)
+    _use_text(service, monkeypatch, ai_probability=0.2, confidence=0.5)
+    cancelled = []
+
+    async def analyze_media_batch(urls, media_type, post_id, media_info, db):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(media_type)
+            raise
+
+    monkeypatch.setattr(service, "media_service", SimpleNamespace(analyze_media_batch=analyze_media_batch))
+
+    # The text service has already stored its verdict when the media budget runs out
+    post = Post(post_id="p-slow", content="hi", verdict="human_content")
+
+    request = ContentDetectionRequest(post_id="p-slow", content="hi", image_urls=["http://cdn/a.jpg"])
+    response = await service.detect(request, _PostSession(post))
+
+    assert [item["status"] for item in response.image_analysis] == ["timeout"]
+    assert response.media_timed_out
+    assert post.verdict == "pending"
+    await asyncio.sleep(0)
+    assert len(cancelled) == 1
+
+
+def _cached_response(post_id: str) -> ContentDetectionResponse:
+    return ContentDetectionResponse(
+        post_id=post_id,
+        verdict="ai_slop",
+        confidence=0.9,
+        explanation="cached",
+        timestamp="2026-01-01T00:00:00.000+00:00",
+    )
+
+
+def test_cached_response_is_restamped_on_each_hit(service):
+    stored = _cached_response("p-cache")
+    service.cache_response(stored)
+
+    served = service.get_cached_response("p-cache")
+
+    assert served is not stored
+    assert served.verdict == "ai_slop"
+    assert served.timestamp != stored.timestamp
+    assert stored.timestamp == "2026-01-01T00:00:00.000+00:00"
+
+
+def test_cached_response_expires_and_invalidates(service, monkeypatch):
+    service.cache_response(_cached_response("p-cache"))
+    service.invalidate_cached_response("p-cache")
+    assert service.get_cached_response("p-cache") is None
+
+    service.cache_response(_cached_response("p-cache"))
+    monkeypatch.setattr(settings, "detection_response_cache_ttl_seconds", -1)
+    assert service.get_cached_response("p-cache") is None
+
+
+def test_response_cache_evicts_least_recently_used(service, monkeypatch):
+    monkeypatch.setattr(settings, "detection_response_cache_size", 2)
+    service.cache_response(_cached_response("a"))
+    service.cache_response(_cached_response("b"))
+    service.get_cached_response("a")
+    service.cache_response(_cached_response("c"))
+
+    assert service.get_cached_response("a") is not None
+    assert service.get_cached_response("b") is None
+
+
+@pytest.mark.asyncio
+async def test_storing_new_results_invalidates_cached_response():
+    svc = ContentDetectionService()
+    svc.cache_response(_cached_response("p-update"))
+    post = Post(post_id="p-update", content="hi")
+
+    await svc._update_post_with_results("p-update", _text_result("p-update", 0.9, 0.9), 0.4, 0.6, None, None, _PostSession(post))
+
+    assert svc.get_cached_response("p-update") is None
+    assert post.image_ai_probability == 0.4
+    assert post.detection_summary_text
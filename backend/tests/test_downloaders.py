@@ -0,0 +1,40 @@
+"""Tests for the shared media download helpers."""
+
+import hashlib
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+
+from services.downloaders.base import stream_response_to_file
+
+
+def _response(chunks, error: Optional[Exception] = None):
+    async def iter_chunked(size):
+        for chunk in chunks:
+            yield chunk
+        if error is not None:
+            raise error
+
+    return SimpleNamespace(content=SimpleNamespace(iter_chunked=iter_chunked))
+
+
+@pytest.mark.asyncio
+async def test_completed_download_is_moved_into_place(tmp_path):
+    local_path = tmp_path / "video.mp4"
+
+    size, content_hash = await stream_response_to_file(_response([b"ab", b"cd"]), local_path)
+
+    assert local_path.read_bytes() == b"abcd"
+    assert (size, content_hash) == (4, hashlib.sha256(b"abcd").hexdigest())
+    assert [path.name for path in tmp_path.iterdir()] == ["video.mp4"]
+
+
+@pytest.mark.asyncio
+async def test_failed_download_leaves_no_partial_file(tmp_path):
+    local_path = tmp_path / "video.mp4"
+
+    with pytest.raises(ConnectionResetError):
+        await stream_response_to_file(_response([b"ab"], ConnectionResetError("peer reset")), local_path)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,34 @@
+"""Tests for identifier helpers."""
+
+import time
+
+from utils.ids import uuid7
+
+
+def test_uuid7_sets_version_and_variant():
+    value = uuid7()
+
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+
+
+def test_uuid7_embeds_the_current_unix_time_in_milliseconds():
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+
+    assert before <= value.int >> 80 <= after
+
+
+def test_uuid7_sorts_by_creation_time():
+    earlier = uuid7()
+    time.sleep(0.002)
+    later = uuid7()
+
+    assert earlier < later
+    assert str(earlier) < str(later)
+
+
+def test_uuid7_values_are_unique():
+    values = {uuid7() for _ in range(10_000)}
+    assert len(values) == 10_000
@@ -0,0 +1,134 @@
+"""Tests for batching in the media analyzers."""
+
+import asyncio
+
+import pytest
+
+from core.config import settings
+from services.media_analyzer import ImageAnalyzer, ImageBatcher, MediaFile, VideoAnalyzer
+
+
+class _FakeDetector:
+    def __init__(self, fail_batch: bool = False):
+        self.fail_batch = fail_batch
+        self.batches = []
+        self.singles = []
+
+    def detect_batch(self, image_paths):
+        self.batches.append(list(image_paths))
+        if self.fail_batch:
+            raise RuntimeError("unreadable image")
+        return [{"probability": 0.9, "confidence": 0.8, "path": path} for path in image_paths]
+
+    def detect_image(self, image_path):
+        self.singles.append(image_path)
+        if image_path.endswith("bad.jpg"):
+            raise RuntimeError("unreadable image")
+        return {"probability": 0.2, "confidence": 0.6}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch(monkeypatch):
+    monkeypatch.setattr(settings, "image_batch_max_size", 8)
+    monkeypatch.setattr(settings, "image_batch_wait_ms", 20)
+    detector = _FakeDetector()
+    batcher = ImageBatcher(detector.detect_batch)
+
+    try:
+        first, second = await asyncio.gather(batcher.detect(["a.jpg", "b.jpg"]), batcher.detect(["c.jpg"]))
+    finally:
+        batcher.stop()
+
+    assert detector.batches == [["a.jpg", "b.jpg", "c.jpg"]]
+    assert [result["path"] for result in first] == ["a.jpg", "b.jpg"]
+    assert [result["path"] for result in second] == ["c.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_size(monkeypatch):
+    monkeypatch.setattr(settings, "image_batch_max_size", 2)
+    monkeypatch.setattr(settings, "image_batch_wait_ms", 0)
+    detector = _FakeDetector()
+    batcher = ImageBatcher(detector.detect_batch)
+
+    try:
+        results = await batcher.detect(["a.jpg", "b.jpg", "c.jpg"])
+    finally:
+        batcher.stop()
+
+    assert [len(batch) for batch in detector.batches] == [2, 1]
+    assert [result["path"] for result in results] == ["a.jpg", "b.jpg", "c.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_resolves_every_caller_with_an_error(monkeypatch):
+    monkeypatch.setattr(settings, "image_batch_wait_ms", 0)
+    batcher = ImageBatcher(_FakeDetector(fail_batch=True).detect_batch)
+
+    try:
+        results = await batcher.detect(["a.jpg", "b.jpg"])
+    finally:
+        batcher.stop()
+
+    assert results == [{"error": "unreadable image"}, {"error": "unreadable image"}]
+
+
+@pytest.mark.asyncio
+async def test_stopping_the_worker_cancels_waiting_callers(monkeypatch):
+    monkeypatch.setattr(settings, "image_batch_max_size", 8)
+    monkeypatch.setattr(settings, "image_batch_wait_ms", 1000)
+    batcher = ImageBatcher(_FakeDetector().detect_batch)
+
+    pending = asyncio.ensure_future(batcher.detect(["a.jpg"]))
+    await asyncio.sleep(0.01)
+    batcher.stop()
+
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+
+
+@pytest.mark.asyncio
+async def test_analyzer_falls_back_to_single_images_when_batch_fails(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "image_batch_wait_ms", 0)
+    detector = _FakeDetector(fail_batch=True)
+    analyzer = ImageAnalyzer.__new__(ImageAnalyzer)
+    analyzer.device = "cpu"
+    analyzer.model_name = "clipbased"
+    analyzer._detector = detector
+    analyzer._batcher = ImageBatcher(detector.detect_batch)
+
+    good, bad = tmp_path / "good.jpg", tmp_path / "bad.jpg"
+    good.write_bytes(b"x")
+    bad.write_bytes(b"x")
+    media_files = [
+        MediaFile(url="http://cdn/good.jpg", local_path=good),
+        MediaFile(url="http://cdn/bad.jpg", local_path=bad),
+        MediaFile(url="http://cdn/missing.jpg", local_path=tmp_path / "missing.jpg"),
+    ]
+
+    try:
+        results = await analyzer.analyze_batch(media_files)
+    finally:
+        analyzer._batcher.stop()
+
+    assert detector.batches == [[str(good), str(bad)]]
+    assert detector.singles == [str(good), str(bad)]
+    assert results[0].error is None and results[0].ai_probability == pytest.approx(0.2)
+    assert results[1].error == "unreadable image"
+    assert results[2].error == "Local file not found"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_video_decode_cancels_the_batch(monkeypatch, tmp_path):
+    analyzer = VideoAnalyzer.__new__(VideoAnalyzer)
+    analyzer.model_name = "slowfast"
+
+    async def decode(video_path):
+        raise asyncio.CancelledError()
+
+    monkeypatch.setattr(analyzer, "_decode", decode)
+    video = tmp_path / "a.mp4"
+    video.write_bytes(b"x")
+
+    with pytest.raises(asyncio.CancelledError):
+        await analyzer.analyze_batch([MediaFile(url="http://cdn/a.mp4", local_path=video)])
@@ -0,0 +1,82 @@
+"""Tests for the Alembic migrations, rendered as PostgreSQL SQL in offline mode."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("alembic")
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "db" / "migrations"
+
+REVISIONS = [
+    "001_init_db",
+    "002_chat_history_index",
+    "003_post_prewarmed_answers",
+    "004_chat_uuid_pk",
+    "005_post_detection_summary_text",
+]
+
+
+def _config(monkeypatch) -> Config:
+    # Offline mode renders SQL from the URL's dialect without connecting
+    monkeypatch.setenv("DATABASE_URL", "postgresql://user@localhost/db")
+    config = Config(output_buffer=io.StringIO())
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    return config
+
+
+def _upgrade_sql(monkeypatch, base: str, revision: str) -> str:
+    config = _config(monkeypatch)
+    command.upgrade(config, f"{base}:{revision}", sql=True)
+    return config.output_buffer.getvalue()
+
+
+def _downgrade_sql(monkeypatch, revision: str, base: str) -> str:
+    config = _config(monkeypatch)
+    command.downgrade(config, f"{revision}:{base}", sql=True)
+    return config.output_buffer.getvalue()
+
+
+def test_revisions_form_a_single_chain(monkeypatch):
+    script = ScriptDirectory.from_config(_config(monkeypatch))
+
+    assert script.get_heads() == [REVISIONS[-1]]
+    chain = [revision.revision for revision in script.walk_revisions()]
+    assert chain == list(reversed(REVISIONS))
+
+
+def test_chat_history_index_migration(monkeypatch):
+    upgrade = _upgrade_sql(monkeypatch, "001_init_db", "002_chat_history_index")
+    downgrade = _downgrade_sql(monkeypatch, "002_chat_history_index", "001_init_db")
+
+    assert "CREATE INDEX ix_chat_post_user_created ON chat (post_id, user_id, created_at)" in upgrade
+    assert "DROP INDEX ix_chat_post_user_created" in downgrade
+
+
+def test_post_prewarmed_answers_migration(monkeypatch):
+    upgrade = _upgrade_sql(monkeypatch, "002_chat_history_index", "003_post_prewarmed_answers")
+    downgrade = _downgrade_sql(monkeypatch, "003_post_prewarmed_answers", "002_chat_history_index")
+
+    assert "ALTER TABLE post ADD COLUMN prewarmed_answers JSON" in upgrade
+    assert "ALTER TABLE post DROP COLUMN prewarmed_answers" in downgrade
+
+
+def test_chat_uuid_pk_migration(monkeypatch):
+    upgrade = _upgrade_sql(monkeypatch, "003_post_prewarmed_answers", "004_chat_uuid_pk")
+    downgrade = _downgrade_sql(monkeypatch, "004_chat_uuid_pk", "003_post_prewarmed_answers")
+
+    assert "ALTER TABLE chat ALTER COLUMN id TYPE UUID USING id::uuid" in upgrade
+    assert "ALTER TABLE chat ALTER COLUMN id TYPE VARCHAR(36) USING id::text" in downgrade
+
+
+def test_post_detection_summary_text_migration(monkeypatch):
+    upgrade = _upgrade_sql(monkeypatch, "004_chat_uuid_pk", "005_post_detection_summary_text")
+    downgrade = _downgrade_sql(monkeypatch, "005_post_detection_summary_text", "004_chat_uuid_pk")
+
+    assert "ALTER TABLE post ADD COLUMN detection_summary_text TEXT" in upgrade
+    assert "ALTER TABLE post DROP COLUMN detection_summary_text" in downgrade
@@ -0,0 +1,146 @@
+"""Tests for the posts endpoints' in-memory detection response cache."""
+
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.v1.endpoints.posts as posts_endpoints
+from db.models import Post
+from main import app
+from schemas.content_detection import ContentDetectionResponse
+
+
+class _Result:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one_or_none(self):
+        return self._value
+
+
+class _FakeSession:
+    def __init__(self, post):
+        self.post = post
+        self.deleted = []
+
+    async def execute(self, stmt):
+        return _Result(self.post)
+
+    async def delete(self, obj):
+        self.deleted.append(obj)
+
+    async def commit(self):
+        return None
+
+    async def refresh(self, obj):
+        return None
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = _FakeSession(
+        Post(
+            post_id="p1",
+            content="hi",
+            verdict="ai_slop",
+            confidence=0.9,
+            explanation="cached",
+            created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+            updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        )
+    )
+
+    @asynccontextmanager
+    async def get_session():
+        yield fake
+
+    monkeypatch.setattr(posts_endpoints, "get_async_session", get_session)
+    monkeypatch.setattr(posts_endpoints.detection_service, "_response_cache", OrderedDict())
+    return fake
+
+
+def _cache(post_id: str) -> None:
+    posts_endpoints.detection_service.cache_response(
+        ContentDetectionResponse(
+            post_id=post_id, verdict="ai_slop", confidence=0.9, explanation="cached", timestamp="2026-01-01T00:00:00.000+00:00"
+        )
+    )
+
+
+def test_repeated_poll_is_served_from_memory(client: TestClient, monkeypatch, session):
+    _cache("p1")
+
+    @asynccontextmanager
+    async def no_database():
+        raise AssertionError("cached poll opened a database session")
+        yield
+
+    monkeypatch.setattr(posts_endpoints, "get_async_session", no_database)
+    res = client.post("/api/v1/posts/process", json={"post_id": "p1", "content": "hi"})
+
+    assert res.status_code == 200
+    assert res.json()["verdict"] == "ai_slop"
+    assert res.json()["timestamp"] != "2026-01-01T00:00:00.000+00:00"
+
+
+def test_deleting_a_post_invalidates_its_cached_response(client: TestClient, session):
+    _cache("p1")
+
+    res = client.delete("/api/v1/posts/p1")
+
+    assert res.status_code == 200
+    assert session.deleted == [session.post]
+    assert posts_endpoints.detection_service.get_cached_response("p1") is None
+
+
+def test_updating_a_post_invalidates_its_cached_response(client: TestClient, session):
+    _cache("p1")
+
+    res = client.put("/api/v1/posts/p1", json={"verdict": "human_content"})
+
+    assert res.status_code == 200
+    assert res.json()["verdict"] == "human_content"
+    assert session.post.verdict == "human_content"
+    assert posts_endpoints.detection_service.get_cached_response("p1") is None
+
+
+def test_provisional_result_after_media_timeout_is_not_stored(client: TestClient, monkeypatch, session):
+    session.post.verdict = "pending"
+    calls = []
+
+    async def save_post_before_detection(request, db):
+        return session.post
+
+    async def detect(request, db):
+        return ContentDetectionResponse(
+            post_id=request.post_id,
+            verdict="human_content",
+            confidence=0.6,
+            explanation="text",
+            timestamp="2026-01-01T00:00:00.000+00:00",
+            media_timed_out=True,
+        )
+
+    async def update_post_with_results(post_id, result, db):
+        calls.append("stored")
+
+    monkeypatch.setattr(posts_endpoints.post_media_service, "save_post_before_detection", save_post_before_detection)
+    monkeypatch.setattr(posts_endpoints.post_media_service, "update_post_with_results", update_post_with_results)
+    monkeypatch.setattr(posts_endpoints.detection_service, "detect", detect)
+    monkeypatch.setattr(posts_endpoints.chat_service, "prewarm_answers", lambda post_id: calls.append("prewarmed"))
+
+    res = client.post("/api/v1/posts/process", json={"post_id": "p1", "content": "hi"})
+
+    assert res.status_code == 200
+    assert res.json()["media_timed_out"] is True
+    assert calls == []
+    assert posts_endpoints.detection_service.get_cached_response("p1") is None
@@ -0,0 +1,80 @@
+"""Tests for the text detection service's content analysis cache."""
+
+import pytest
+
+from core.config import settings
+from schemas.text_detection import DetectRequest
+from services.text_detection_service import TextDetectionService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("DETECTION_MODE", "real")
+    return TextDetectionService()
+
+
+def _count_analyses(service, monkeypatch):
+    analyzed = []
+    analyze_content = service._analyze_content
+
+    def counting_analyze(content):
+        analyzed.append(content)
+        return analyze_content(content)
+
+    monkeypatch.setattr(service, "_analyze_content", counting_analyze)
+    return analyzed
+
+
+def test_content_key_ignores_case_and_surrounding_whitespace():
+    key = TextDetectionService._content_key
+    assert key("  Hello World \n") == key("hello world")
+    assert key("hello world") != key("hello  world")
+
+
+def test_cached_analysis_is_reused_until_it_expires(service, monkeypatch):
+    key = service._content_key("same text")
+    service._cache_analysis(key, ("human_content", 0.7, "cached", 0.2, 0.7))
+
+    assert service._get_cached_analysis(key) == ("human_content", 0.7, "cached", 0.2, 0.7)
+
+    monkeypatch.setattr(settings, "text_analysis_cache_ttl_seconds", -1)
+    assert service._get_cached_analysis(key) is None
+    assert key not in service._analysis_cache
+
+
+def test_analysis_cache_evicts_least_recently_used(service, monkeypatch):
+    monkeypatch.setattr(settings, "text_analysis_cache_size", 2)
+    analysis = ("human_content", 0.7, "cached", 0.2, 0.7)
+    service._cache_analysis("a", analysis)
+    service._cache_analysis("b", analysis)
+    service._get_cached_analysis("a")
+    service._cache_analysis("c", analysis)
+
+    assert list(service._analysis_cache) == ["a", "c"]
+
+
+def test_testing_mode_bypasses_the_cache(service, monkeypatch):
+    monkeypatch.setenv("DETECTION_MODE", "testing")
+    service._cache_analysis("a", ("human_content", 0.7, "cached", 0.2, 0.7))
+
+    assert service._get_cached_analysis("a") is None
+    assert len(service._analysis_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_reposted_content_skips_analysis(service, monkeypatch):
+    analyzed = _count_analyses(service, monkeypatch)
+    saved = []
+
+    async def save_to_database(request, verdict, confidence, explanation, ai_probability, analysis_confidence, db):
+        saved.append((request.post_id, verdict, ai_probability))
+        return request
+
+    monkeypatch.setattr(service, "_save_to_database", save_to_database)
+    monkeypatch.setattr(service, "_create_response_from_post", lambda post, from_cache=False: post)
+
+    await service.detect(DetectRequest(post_id="p1", content="Delve into this tapestry"), None, use_cache=False)
+    await service.detect(DetectRequest(post_id="p2", content="  delve into this TAPESTRY "), None, use_cache=False)
+
+    assert analyzed == ["Delve into this tapestry"]
+    assert saved[0][1:] == saved[1][1:]
@@ -0,0 +1,82 @@
+"""Tests for the unified media service's verdict cache."""
+
+from pathlib import Path
+
+import pytest
+
+import services.unified_media_service as unified_media_service
+from services.media_analyzer import AnalysisResult, MediaFile, MediaType
+from services.unified_media_service import UnifiedMediaService
+
+
+def _result(ai_probability: float = 0.8) -> AnalysisResult:
+    return AnalysisResult(is_ai_generated=True, ai_probability=ai_probability, confidence=0.9, model_used="test")
+
+
+class _FakeMedia:
+    """Stands in for file preparation and the analyzer, recording the URLs each one sees."""
+
+    def __init__(self, tmp_path: Path):
+        self.tmp_path = tmp_path
+        self.prepared = []
+        self.analyzed = []
+
+    async def prepare_media_files(self, urls, media_type, post_id, media_info, db):
+        self.prepared.extend(urls)
+        files = []
+        for url in urls:
+            local_path = self.tmp_path / f"{len(self.prepared)}-{len(files)}.jpg"
+            local_path.write_bytes(b"x")
+            content_hash = media_info.get(url, {}).get("content_hash")
+            files.append(MediaFile(url=url, local_path=local_path, media_type=media_type, post_id=post_id, content_hash=content_hash))
+        return files
+
+    async def analyze_batch(self, media_files):
+        self.analyzed.extend(media_file.url for media_file in media_files)
+        return [_result() for _ in media_files]
+
+
+@pytest.fixture
+def media(tmp_path):
+    return _FakeMedia(tmp_path)
+
+
+@pytest.fixture
+def service(monkeypatch, media):
+    svc = UnifiedMediaService(max_workers=1)
+    monkeypatch.setattr(svc, "_prepare_media_files", media.prepare_media_files)
+    monkeypatch.setattr(unified_media_service.MediaAnalyzerFactory, "create_analyzer", lambda media_type: media)
+    monkeypatch.setattr(unified_media_service.media_registry, "update_processing_stages", lambda updates: None)
+    yield svc
+    svc.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_cached_url_skips_file_preparation(service, media):
+    await service.analyze_media_batch(["http://cdn/a.jpg"], MediaType.IMAGE, "p1", {}, None)
+    results, ai_probability, _ = await service.analyze_media_batch(["http://cdn/a.jpg"], MediaType.IMAGE, "p1", {}, None)
+
+    assert media.prepared == ["http://cdn/a.jpg"]
+    assert media.analyzed == ["http://cdn/a.jpg"]
+    assert results[0]["status"] == "success"
+    assert ai_probability == pytest.approx(0.8)
+
+
+@pytest.mark.asyncio
+async def test_same_content_under_new_url_reuses_verdict(service, media):
+    await service.analyze_media_batch(["http://cdn/a.jpg"], MediaType.IMAGE, "p1", {"http://cdn/a.jpg": {"content_hash": "h1"}}, None)
+    results, _, _ = await service.analyze_media_batch(
+        ["http://cdn/b.jpg"], MediaType.IMAGE, "p2", {"http://cdn/b.jpg": {"content_hash": "h1"}}, None
+    )
+
+    assert media.prepared == ["http://cdn/a.jpg"]
+    assert results[0]["status"] == "success"
+
+
+@pytest.mark.asyncio
+async def test_expired_verdict_is_analyzed_again(service, media, monkeypatch):
+    monkeypatch.setattr(unified_media_service.settings, "media_verdict_cache_ttl_seconds", -1)
+    await service.analyze_media_batch(["http://cdn/a.jpg"], MediaType.IMAGE, "p1", {}, None)
+    await service.analyze_media_batch(["http://cdn/a.jpg"], MediaType.IMAGE, "p1", {}, None)
+
+    assert media.analyzed == ["http://cdn/a.jpg", "http://cdn/a.jpg"]
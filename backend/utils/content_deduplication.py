@@ -1,5 +1,7 @@
+import asyncio
 import hashlib
 import aiohttp
+from pathlib import Path
 from typing import Optional, Dict, List, Tuple
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,6 +23,18 @@ class ContentDeduplicationService:
         """Calculate SHA-256 hash of media content."""
         return hashlib.sha256(data).hexdigest()
 
+    async def calculate_file_hash(self, path: Path) -> str:
+        """Calculate SHA-256 hash of a media file without loading it into memory."""
+        return await asyncio.to_thread(self._hash_file, path)
+
+    @staticmethod
+    def _hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
     async def get_url_content_hash(self, url: str, data: Optional[bytes] = None) -> Optional[str]:
         """Get content hash for a URL (with caching)."""
 